@@ -0,0 +1,126 @@
+"""Benchmark atomic_write_json against the previous unlink-and-rename writer.
+
+Usage:
+    python benchmarks/bench_atomic_write.py [--iterations N] [--tasks N]
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from markov_dayflow.infrastructure.utils import Durability, atomic_write_json
+
+
+def legacy_atomic_write_json(path: str | Path, data: Any, indent: int = 2) -> None:
+    """Previous implementation: pretty-printed, no fsync, unlink before rename."""
+    path_obj = Path(path)
+    temp_path = path_obj.with_suffix(path_obj.suffix + ".tmp")
+
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+
+    if path_obj.exists():
+        path_obj.unlink()
+
+    temp_path.rename(path_obj)
+
+
+def make_state() -> dict[str, Any]:
+    """State-like payload: 8x8 transition matrix plus weekly counts."""
+    buckets = ["Feature", "Bug", "R&D", "Docs", "Review", "Support", "Urgent"]
+    buckets.append("Chaos")
+    return {
+        "current_bucket": "Feature",
+        "weekly_blocks": {b: 3 for b in buckets},
+        "transitions": {b: {b2: 1.25 for b2 in buckets} for b in buckets},
+        "week_start": "2026-10-12",
+    }
+
+
+def make_tasks(count: int) -> list[dict[str, Any]]:
+    """Tasks-like payload with count entries."""
+    return [
+        {
+            "id": i,
+            "title": f"Task number {i}",
+            "bucket": "Feature",
+            "urgency": 3,
+            "impact": 4,
+            "size": 2.0,
+            "difficulty": 2,
+            "status": "todo",
+            "sla_penalty": 0.0,
+            "age_days": i % 30,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(write: Callable[[Path], None], path: Path, iterations: int) -> dict:
+    """Time iterations writes and summarize latency in milliseconds."""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        write(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    total_seconds = sum(latencies) / 1000
+    return {
+        "ops_per_sec": iterations / total_seconds if total_seconds else 0.0,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "bytes": path.stat().st_size,
+    }
+
+
+def main() -> None:
+    """Run all writer variants over state- and tasks-sized payloads."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    args = parser.parse_args()
+
+    payloads = {"state.json": make_state(), "tasks.json": make_tasks(args.tasks)}
+
+    variants: dict[str, Callable[[Path, Any], None]] = {
+        "legacy (indent=2, unlink+rename)": legacy_atomic_write_json,
+        "new compact, durability=none": lambda p, d: atomic_write_json(
+            p, d, durability=Durability.NONE
+        ),
+        "new compact, durability=file": lambda p, d: atomic_write_json(
+            p, d, durability=Durability.FILE
+        ),
+        "new compact, durability=directory": lambda p, d: atomic_write_json(
+            p, d, durability=Durability.DIRECTORY
+        ),
+        "new indent=2, durability=file": lambda p, d: atomic_write_json(
+            p, d, indent=2, durability=Durability.FILE
+        ),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, data in payloads.items():
+            print(f"\n{name} ({args.iterations} writes)")
+            print(
+                f"{'variant':<36} {'ops/s':>10} {'p50 ms':>9} "
+                f"{'p99 ms':>9} {'bytes':>10}"
+            )
+            print("-" * 78)
+            for label, writer in variants.items():
+                path = Path(tmp) / name
+                result = measure(lambda p: writer(p, data), path, args.iterations)
+                print(
+                    f"{label:<36} {result['ops_per_sec']:>10.0f} "
+                    f"{result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+                    f"{result['bytes']:>10}"
+                )
+                path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,19 @@
 from markov_dayflow.adapters.repositories import (
     ConfigRepository,
     PlanRepository,
+    SqliteTaskRepository,
     StateRepository,
     TaskRepository,
+    create_task_repository,
+    migrate_tasks,
 )
 
 __all__ = [
     "TaskRepository",
+    "SqliteTaskRepository",
     "StateRepository",
     "PlanRepository",
     "ConfigRepository",
+    "create_task_repository",
+    "migrate_tasks",
 ]
@@ -0,0 +1,86 @@
+"""Batch commands for planning many data directories at once."""
+
+import json
+
+import click
+
+from markov_dayflow.application.usecases.batch_planning import (
+    BatchPlanningUseCase,
+    read_manifest,
+)
+from markov_dayflow.infrastructure.utils import PathResolver, parse_date
+
+
+@click.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option("--date", help="Date in ISO format (YYYY-MM-DD, default: today)")
+@click.option(
+    "--config",
+    type=click.Path(exists=True),
+    help="Path to blocks_config.yaml shared by every tenant",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Worker processes (default: CPU count)",
+)
+@click.option(
+    "--seed",
+    type=int,
+    help="Base seed for reproducible plans (each tenant/date gets its own stream)",
+)
+@click.option(
+    "--summary",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Also write the summary as JSON to this path",
+)
+def batch_plan(
+    manifest: str,
+    date: str | None,
+    config: str | None,
+    workers: int | None,
+    seed: int | None,
+    summary: str | None,
+) -> None:
+    """Generate plans for every data directory listed in MANIFEST.
+
+    MANIFEST lists one data directory per line ('#' starts a comment).
+    """
+    plan_date = parse_date(date)
+    config_path = PathResolver().resolve(config, PathResolver.get_config_path())
+
+    data_dirs = read_manifest(manifest)
+    if not data_dirs:
+        click.echo(f"[Info] No data directories listed in {manifest}")
+        return
+
+    use_case = BatchPlanningUseCase(workers=workers, seed=seed)
+    result = use_case.execute(data_dirs, config_path, plan_date)
+
+    click.echo(f"\n[Calendar] Batch plan for {plan_date}")
+    click.echo("=" * 72)
+    click.echo(f"{'Tenant':<52} {'Status':<8} {'Seconds':>10}")
+    click.echo("-" * 72)
+    for tenant in result["tenants"]:
+        click.echo(
+            f"{tenant['tenant'][-52:]:<52} {tenant['status']:<8} "
+            f"{tenant['seconds']:>10.3f}"
+        )
+    click.echo("=" * 72)
+
+    for tenant in result["tenants"]:
+        if tenant["error"]:
+            click.echo(f"[ERROR] {tenant['tenant']}: {tenant['error']}")
+
+    click.echo(
+        f"[OK] Planned {result['planned']}/{len(result['tenants'])} tenants "
+        f"in {result['seconds']:.2f}s with {result['workers']} worker(s)"
+    )
+
+    if summary:
+        with open(summary, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        click.echo(f"[OK] Summary written to {summary}")
+
+    if result["failed"]:
+        raise click.exceptions.Exit(1)
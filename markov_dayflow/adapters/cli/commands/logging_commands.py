@@ -2,9 +2,19 @@
 
 import click
 
+from markov_dayflow.adapters.cli.commands.plan_commands import replan_pending_blocks
+from markov_dayflow.adapters.repositories import (
+    ConfigRepository,
+    create_task_repository,
+)
 from markov_dayflow.application.usecases.log_actual import LogActualUseCase
+from markov_dayflow.application.usecases.plan_generation import PlanGenerationUseCase
 from markov_dayflow.domain.entities.task import map_to_planning_bucket
-from markov_dayflow.domain.exceptions import BlockAlreadyCompletedException
+from markov_dayflow.domain.exceptions import (
+    BlockAlreadyCompletedException,
+    VersionConflictException,
+)
+from markov_dayflow.domain.services.planning_config import get_planning_buckets
 from markov_dayflow.infrastructure.utils import PathResolver, parse_date
 
 
@@ -16,11 +26,17 @@ from markov_dayflow.infrastructure.utils import PathResolver, parse_date
 @click.option("--plan", type=click.Path(), help="Path to plan file")
 @click.option("--state", type=click.Path(), help="Path to state file")
 @click.option("--tasks", type=click.Path(), help="Path to tasks file")
+@click.option("--config", type=click.Path(exists=True), help="Path to config.yaml")
 @click.option("--notes", help="Optional notes")
 @click.option(
     "--date",
     help="Date for plan file (YYYY-MM-DD, defaults to today, block logging only)",
 )
+@click.option(
+    "--replan",
+    is_flag=True,
+    help="Replan the remaining blocks after logging",
+)
 def log(
     block: int | None,
     task_id: int | None,
@@ -29,8 +45,10 @@ def log(
     plan: str | None,
     state: str | None,
     tasks: str | None,
+    config: str | None,
     notes: str | None,
     date: str | None,
+    replan: bool,
 ) -> None:
     """Log actual work done."""
     if block is None and task_id is None:
@@ -47,7 +65,16 @@ def log(
     tasks_path = path_resolver.resolve(tasks, path_resolver.tasks_path)
     log_path = path_resolver.get_log_path(log_date)
 
-    use_case = LogActualUseCase()
+    config_path = path_resolver.resolve(config, PathResolver.get_config_path())
+    config_data = ConfigRepository().load_config(config_path)
+
+    task_repo = create_task_repository(tasks_path)
+    use_case = LogActualUseCase(
+        task_repo=task_repo,
+        half_life_days=config_data.get("decay_half_life_days"),
+        markov_order=config_data.get("markov_order", 1),
+        planning_buckets=get_planning_buckets(config_data),
+    )
 
     try:
         if task_id is not None and block is not None:
@@ -59,6 +86,7 @@ def log(
                 task_id=task_id,
                 tasks_path=str(tasks_path),
                 notes=notes,
+                date=log_date,
             )
             actual_bucket = result["bucket"]
             actual_title = result["title"]
@@ -73,6 +101,7 @@ def log(
                 task_id=task_id,
                 tasks_path=str(tasks_path),
                 notes=notes,
+                date=log_date,
             )
             click.echo(f"[OK] Logged completed task {task_id}")
         else:
@@ -84,10 +113,13 @@ def log(
                 actual_bucket=bucket,
                 actual_title=title,
                 notes=notes,
+                date=log_date,
             )
 
             actual_bucket = result["bucket"]
-            planning_bucket = map_to_planning_bucket(actual_bucket)
+            planning_bucket = map_to_planning_bucket(
+                actual_bucket, use_case.planning_buckets
+            )
 
             if planning_bucket != actual_bucket:
                 click.echo(
@@ -97,6 +129,17 @@ def log(
                 click.echo(
                     f"[OK] Logged block {block}: {actual_bucket} - {result['title']}"
                 )
-    except BlockAlreadyCompletedException as e:
+    except (BlockAlreadyCompletedException, VersionConflictException) as e:
         click.echo(f"[ERROR] {e.message}")
         raise click.Abort()
+
+    if replan and plan_path.exists():
+        replan_pending_blocks(
+            PlanGenerationUseCase(task_repo=task_repo),
+            tasks_path,
+            state_path,
+            config_path,
+            plan_path,
+            log_date,
+            seed=None,
+        )
@@ -1,15 +1,24 @@
 """Plan generation and display commands."""
 
+from pathlib import Path
+
 import click
 
 from markov_dayflow.adapters.cli.formatters import PlanFormatter, TaskFormatter
 from markov_dayflow.adapters.repositories import (
     ConfigRepository,
     PlanRepository,
-    TaskRepository,
+    create_task_repository,
 )
 from markov_dayflow.application.usecases.plan_generation import PlanGenerationUseCase
-from markov_dayflow.infrastructure.utils import PathResolver, parse_date, read_jsonl
+from markov_dayflow.domain.exceptions import VersionConflictException
+from markov_dayflow.domain.services.rng import derive_seed
+from markov_dayflow.infrastructure.utils import (
+    LogStore,
+    PathResolver,
+    parse_date,
+    parse_date_range,
+)
 
 
 @click.command()
@@ -37,12 +46,24 @@ from markov_dayflow.infrastructure.utils import PathResolver, parse_date, read_j
     "--date",
     help="Date in ISO format (YYYY-MM-DD, default: today)",
 )
+@click.option(
+    "--range",
+    "date_range",
+    help="Plan several days in one pass (START..END, e.g. 2026-10-19..2026-10-23)",
+)
+@click.option(
+    "--seed",
+    type=int,
+    help="Seed for a reproducible plan (each date gets its own stream)",
+)
 def plan(
     tasks: str | None,
     state: str | None,
     config: str | None,
     out: str | None,
     date: str | None,
+    date_range: str | None,
+    seed: int | None,
 ) -> None:
     """Generate today's focus block plan."""
     path_resolver = PathResolver()
@@ -52,6 +73,15 @@ def plan(
     state_path = path_resolver.resolve(state, path_resolver.state_path)
     config_path = path_resolver.resolve(config, PathResolver.get_config_path())
 
+    if date_range:
+        if date or out:
+            click.echo("[ERROR] --range cannot be combined with --date or --out")
+            return
+        _plan_range(
+            path_resolver, tasks_path, state_path, config_path, date_range, seed
+        )
+        return
+
     plan_date = parse_date(date)
 
     if out:
@@ -59,7 +89,8 @@ def plan(
     else:
         output_path = path_resolver.get_plan_path(plan_date)
 
-    use_case = PlanGenerationUseCase()
+    task_repo = create_task_repository(tasks_path)
+    use_case = PlanGenerationUseCase(task_repo=task_repo)
 
     result_path = use_case.execute(
         tasks_path=str(tasks_path),
@@ -67,11 +98,11 @@ def plan(
         config_path=str(config_path),
         output_path=str(output_path),
         date=plan_date,
+        seed=None if seed is None else derive_seed(seed, plan_date),
     )
 
     plan_repo = PlanRepository()
     config_repo = ConfigRepository()
-    task_repo = TaskRepository()
 
     plan_obj = plan_repo.load_plan(result_path)
     config_data = config_repo.load_config(config_path)
@@ -86,6 +117,135 @@ def plan(
     )
 
 
+def _plan_range(
+    path_resolver: PathResolver,
+    tasks_path: Path,
+    state_path: Path,
+    config_path: Path,
+    date_range: str,
+    seed: int | None,
+) -> None:
+    """Generate and print plans for every date in date_range."""
+    try:
+        dates = parse_date_range(date_range)
+    except ValueError as e:
+        click.echo(f"[ERROR] {e}")
+        return
+
+    task_repo = create_task_repository(tasks_path)
+    use_case = PlanGenerationUseCase(task_repo=task_repo)
+
+    result_paths = use_case.execute_range(
+        tasks_path=str(tasks_path),
+        state_path=str(state_path),
+        config_path=str(config_path),
+        output_paths={d: path_resolver.get_plan_path(d) for d in dates},
+        seed=seed,
+    )
+
+    plan_repo = PlanRepository()
+    config_data = ConfigRepository().load_config(config_path)
+    tasks_data = task_repo.load_tasks(tasks_path)
+
+    click.echo(f"[OK] {len(result_paths)} Focus Block Plans generated")
+    for result_path in result_paths:
+        plan_obj = plan_repo.load_plan(result_path)
+        click.echo(f"\n{result_path}")
+        click.echo(PlanFormatter.format_daily_plan(plan_obj, config_data, tasks_data))
+
+
+@click.command()
+@click.option(
+    "--tasks",
+    type=click.Path(exists=True),
+    help="Path to tasks.json (default: data/tasks.json)",
+)
+@click.option(
+    "--state",
+    type=click.Path(),
+    help="Path to state.json (default: data/state.json)",
+)
+@click.option(
+    "--config",
+    type=click.Path(exists=True),
+    help="Path to blocks_config.yaml",
+)
+@click.option("--date", help="Date of the plan (YYYY-MM-DD, default: today)")
+@click.option(
+    "--seed",
+    type=int,
+    help="Seed for reproducible replanned blocks",
+)
+def replan(
+    tasks: str | None,
+    state: str | None,
+    config: str | None,
+    date: str | None,
+    seed: int | None,
+) -> None:
+    """Replan the day's pending blocks, keeping the done ones."""
+    path_resolver = PathResolver()
+
+    tasks_path = path_resolver.resolve(tasks, path_resolver.tasks_path)
+    state_path = path_resolver.resolve(state, path_resolver.state_path)
+    config_path = path_resolver.resolve(config, PathResolver.get_config_path())
+    plan_date = parse_date(date)
+    plan_path = path_resolver.get_plan_path(plan_date)
+
+    if not plan_path.exists():
+        click.echo(f"[Calendar] No plan for {plan_date}")
+        click.echo("[Tip] Generate one with: markov-dayflow plan generate")
+        return
+
+    task_repo = create_task_repository(tasks_path)
+    changed = replan_pending_blocks(
+        PlanGenerationUseCase(task_repo=task_repo),
+        tasks_path,
+        state_path,
+        config_path,
+        plan_path,
+        plan_date,
+        seed,
+    )
+    if changed is None:
+        return
+
+    plan_obj = PlanRepository().load_plan(plan_path)
+    config_data = ConfigRepository().load_config(config_path)
+    tasks_data = task_repo.load_tasks(tasks_path)
+    click.echo(PlanFormatter.format_daily_plan(plan_obj, config_data, tasks_data))
+
+
+def replan_pending_blocks(
+    use_case: PlanGenerationUseCase,
+    tasks_path: Path,
+    state_path: Path,
+    config_path: Path,
+    plan_path: Path,
+    plan_date: str,
+    seed: int | None,
+) -> list[int] | None:
+    """Run a replan and report which blocks changed (None if it failed)."""
+    try:
+        changed = use_case.replan(
+            tasks_path=str(tasks_path),
+            state_path=str(state_path),
+            config_path=str(config_path),
+            plan_path=str(plan_path),
+            seed=None if seed is None else derive_seed(seed, plan_date, "replan"),
+        )
+    except VersionConflictException as e:
+        click.echo(f"[ERROR] {e.message}")
+        return None
+
+    if changed:
+        numbers = ", ".join(str(number) for number in changed)
+        click.echo(f"[OK] Replanned block(s) {numbers} for {plan_date}")
+    else:
+        click.echo(f"[Info] Plan for {plan_date} unchanged")
+    return changed
+
+
 @click.command()
 @click.option("--date", help="Date to show (YYYY-MM-DD, defaults to today)")
 def show(date: str | None) -> None:
@@ -94,20 +254,17 @@ def show(date: str | None) -> None:
 
     status_date = parse_date(date)
     plan_path = path_resolver.get_plan_path(status_date)
-    log_path = path_resolver.get_log_path(status_date)
     tasks_path = path_resolver.tasks_path
 
     if plan_path.exists():
         plan_repo = PlanRepository()
         plan = plan_repo.load_plan(plan_path)
 
-        task_repo = TaskRepository()
+        task_repo = create_task_repository(tasks_path)
         tasks = task_repo.load_tasks(tasks_path) if tasks_path.exists() else []
         task_lookup = {task.title: task for task in tasks}
 
-        actual_logs = []
-        if log_path.exists():
-            actual_logs = read_jsonl(log_path)
+        actual_logs = LogStore(path_resolver.logs_dir).read_day(status_date)
 
         block_to_log = {}
         for log in actual_logs:
@@ -179,7 +336,7 @@ def show(date: str | None) -> None:
 
     tasks_path = path_resolver.tasks_path
     if tasks_path.exists():
-        task_repo = TaskRepository()
+        task_repo = create_task_repository(tasks_path)
         tasks = task_repo.load_tasks(tasks_path)
 
         click.echo("\n" + TaskFormatter.format_task_summary(tasks))
@@ -8,9 +8,12 @@ from markov_dayflow.adapters.repositories import (
     ConfigRepository,
 )
 from markov_dayflow.adapters.visualization import GanttGenerator, PieChartGenerator
+from markov_dayflow.application.usecases.markov_analysis import MarkovAnalysisUseCase
 from markov_dayflow.application.usecases.reporting import ReportingUseCase
+from markov_dayflow.application.usecases.simulation import SimulationUseCase
+from markov_dayflow.application.usecases.state_history import StateHistoryUseCase
 from markov_dayflow.application.usecases.weekly_reset import WeeklyResetUseCase
-from markov_dayflow.infrastructure.utils import PathResolver, parse_date, read_jsonl
+from markov_dayflow.infrastructure.utils import LogStore, PathResolver, parse_date
 
 
 @click.command()
@@ -145,11 +148,7 @@ def report(
             click.echo(global_gantt)
             click.echo("```")
 
-        all_logs = []
-        if path_resolver.logs_dir.exists():
-            for file in path_resolver.logs_dir.iterdir():
-                if file.name.startswith("actual_") and file.name.endswith(".jsonl"):
-                    all_logs.extend(read_jsonl(file))
+        all_logs = list(LogStore(path_resolver.logs_dir).iter_entries())
 
         if all_logs:
             global_pie = PieChartGenerator.generate_bucket_distribution(
@@ -183,3 +182,243 @@ def weekly_reset(
     use_case.execute(str(state_path), str(config_path), week_start_date)
 
     click.echo(f"[OK] Weekly reset complete (week: {week_start_date})")
+
+
+@click.command(name="compact-logs")
+@click.option(
+    "--before",
+    help="Compact days before this date (YYYY-MM-DD, defaults to today)",
+)
+def compact_logs(before: str | None) -> None:
+    """Roll daily log files into indexed monthly segments."""
+    path_resolver = PathResolver()
+
+    before_date = parse_date(before)
+    stats = LogStore(path_resolver.logs_dir).compact(before_date)
+
+    if stats["days"] == 0:
+        click.echo(f"[Info] No daily logs before {before_date} to compact")
+        return
+
+    click.echo(
+        f"[OK] Compacted {stats['days']} day(s), {stats['entries']} entries "
+        f"into {stats['segments']} monthly segment(s)"
+    )
+
+
+@click.command(name="simulate")
+@click.option("--state", type=click.Path(), help="Path to state.json")
+@click.option("--config", type=click.Path(exists=True), help="Path to config.yaml")
+@click.option(
+    "--simulations",
+    type=click.IntRange(min=1),
+    default=10_000,
+    show_default=True,
+    help="Number of simulated weeks",
+)
+@click.option("--days", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.05,
+    show_default=True,
+    help="Largest per-bucket share error counted as converged",
+)
+@click.option("--laplace", type=float, help="Override the configured laplace")
+@click.option("--alpha", type=float, help="Override the configured ratio_bias_alpha")
+@click.option("--seed", type=int, help="Seed for reproducible results")
+@click.option("--fresh", is_flag=True, help="Start from an empty state")
+def simulate(
+    state: str | None,
+    config: str | None,
+    simulations: int,
+    days: int,
+    tolerance: float,
+    laplace: float | None,
+    alpha: float | None,
+    seed: int | None,
+    fresh: bool,
+) -> None:
+    """Simulate weeks to check whether targets, laplace and alpha converge."""
+    path_resolver = PathResolver()
+
+    state_path = path_resolver.resolve(state, path_resolver.state_path)
+    config_path = path_resolver.resolve(config, PathResolver.get_config_path())
+
+    try:
+        result = SimulationUseCase().execute(
+            str(state_path),
+            str(config_path),
+            simulations=simulations,
+            days=days,
+            tolerance=tolerance,
+            seed=seed,
+            fresh=fresh,
+            laplace=laplace,
+            alpha=alpha,
+        )
+    except RuntimeError as e:
+        click.echo(f"[ERROR] {e}")
+        return
+
+    click.echo(
+        f"\n[Chart] Simulated {result['simulations']} weeks of {result['days']} days "
+        f"x {result['blocks_per_day']} blocks "
+        f"(laplace={result['laplace']}, alpha={result['alpha']})"
+    )
+    click.echo("=" * 60)
+    click.echo(
+        f"{'Bucket':<12} {'Target':>8} {'Mean':>8} {'P5':>8} {'P50':>8} {'P95':>8}"
+    )
+    click.echo("-" * 60)
+    for bucket in result["buckets"]:
+        stats = result["realized"][bucket]
+        click.echo(
+            f"{bucket:<12} {result['targets'][bucket]:>8.1%} {stats['mean']:>8.1%} "
+            f"{stats['p05']:>8.1%} {stats['p50']:>8.1%} {stats['p95']:>8.1%}"
+        )
+    click.echo("=" * 60)
+
+    error = result["final_error"]
+    convergence = result["convergence"]
+    click.echo(
+        f"Largest bucket error at week end: mean {error['mean']:.1%}, "
+        f"p95 {error['p95']:.1%}"
+    )
+    click.echo(
+        f"Weeks ending within {result['tolerance']:.0%} of every target: "
+        f"{convergence['rate']:.1%}"
+    )
+    if convergence["rate"] > 0:
+        click.echo(
+            f"Blocks until staying within tolerance: "
+            f"median {convergence['blocks']['p50']:.0f}, "
+            f"p90 {convergence['blocks']['p90']:.0f} "
+            f"(day {convergence['days']['p50']:.0f} / {convergence['days']['p90']:.0f})"
+        )
+
+
+@click.command(name="markov")
+@click.option("--state", type=click.Path(), help="Path to state.json")
+@click.option("--config", type=click.Path(exists=True), help="Path to config.yaml")
+@click.option("--laplace", type=float, help="Override the configured laplace")
+@click.option("--alpha", type=float, help="Override the configured ratio_bias_alpha")
+@click.option(
+    "--epsilon",
+    type=click.FloatRange(min=0.0, max=1.0, min_open=True),
+    default=0.25,
+    show_default=True,
+    help="Total variation distance counted as mixed",
+)
+def markov(
+    state: str | None,
+    config: str | None,
+    laplace: float | None,
+    alpha: float | None,
+    epsilon: float,
+) -> None:
+    """Show the long-run bucket shares the transition matrix leads to."""
+    path_resolver = PathResolver()
+
+    state_path = path_resolver.resolve(state, path_resolver.state_path)
+    config_path = path_resolver.resolve(config, PathResolver.get_config_path())
+
+    try:
+        result = MarkovAnalysisUseCase().execute(
+            str(state_path),
+            str(config_path),
+            laplace=laplace,
+            alpha=alpha,
+            epsilon=epsilon,
+        )
+    except RuntimeError as e:
+        click.echo(f"[ERROR] {e}")
+        return
+
+    click.echo(
+        f"\n[Chart] Markov chain analysis "
+        f"(laplace={result['laplace']}, alpha={result['alpha']})"
+    )
+    click.echo("=" * 60)
+    click.echo(
+        f"{'Bucket':<12} {'Target':>8} {'Week':>8} {'Habit':>8} "
+        f"{'Steer':>8} {'Equil.':>8}"
+    )
+    click.echo("-" * 60)
+    for bucket in result["buckets"]:
+        click.echo(
+            f"{bucket:<12} {result['targets'][bucket]:>8.1%} "
+            f"{result['realized'][bucket]:>8.1%} {result['habit'][bucket]:>8.1%} "
+            f"{result['steering'][bucket]:>8.1%} "
+            f"{result['equilibrium'][bucket]:>8.1%}"
+        )
+    click.echo("=" * 60)
+
+    click.echo(
+        "Habit: transitions alone | Steer: biased by this week's share | "
+        "Equil.: long run"
+    )
+    click.echo(
+        f"Largest gap between long run and targets: "
+        f"{result['equilibrium_error']:.1%}"
+    )
+    if result["likely_next"]:
+        counts = ", ".join(
+            f"{bucket} ({count:g})" for bucket, count in result["likely_next"]
+        )
+        click.echo(f"Most observed after {result['current_bucket']}: {counts}")
+    if result["mixing_blocks"] is None:
+        click.echo("[!] The chain does not mix: where you start keeps mattering")
+    else:
+        click.echo(
+            f"Mixing time: {result['mixing_blocks']} block(s) "
+            f"(~{result['mixing_days']} day(s)) to get within "
+            f"{result['epsilon']:.0%} of the long run, |lambda2| = "
+            f"{result['second_eigenvalue']:.3f}"
+        )
+
+
+@click.command(name="history")
+@click.option("--state", type=click.Path(), help="Path to state.json")
+@click.option("--config", type=click.Path(exists=True), help="Path to config.yaml")
+@click.option("--start", help="First week to show (YYYY-MM-DD)")
+@click.option("--end", help="Last week to show (YYYY-MM-DD)")
+def history(
+    state: str | None,
+    config: str | None,
+    start: str | None,
+    end: str | None,
+) -> None:
+    """Show bucket shares of past weeks from the state archive."""
+    path_resolver = PathResolver()
+
+    state_path = path_resolver.resolve(state, path_resolver.state_path)
+    config_path = path_resolver.resolve(config, PathResolver.get_config_path())
+    targets = ConfigRepository().load_config(config_path).get("targets", {})
+
+    weeks = StateHistoryUseCase().execute(str(state_path), start, end)
+    if not weeks:
+        click.echo("[Info] No archived weeks yet (weeks are archived by report reset)")
+        return
+
+    buckets = list(targets)
+    for week in weeks:
+        buckets.extend(b for b in week["shares"] if b not in buckets)
+
+    width = 18 + 8 * len(buckets)
+    click.echo(f"\n[Chart] Weekly bucket shares ({len(weeks)} week(s))")
+    click.echo("=" * width)
+    click.echo(
+        f"{'Week':<11} {'Blocks':>6}" + "".join(f"{b[:7]:>8}" for b in buckets)
+    )
+    click.echo("-" * width)
+    click.echo(
+        f"{'Target':<11} {'':>6}"
+        + "".join(f"{targets.get(b, 0.0):>8.0%}" for b in buckets)
+    )
+    for week in weeks:
+        click.echo(
+            f"{week['week']:<11} {week['blocks']:>6}"
+            + "".join(f"{week['shares'].get(b, 0.0):>8.0%}" for b in buckets)
+        )
+    click.echo("=" * width)
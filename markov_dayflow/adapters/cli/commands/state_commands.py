@@ -0,0 +1,62 @@
+"""State maintenance commands."""
+
+import click
+
+from markov_dayflow.application.usecases.state_rebuild import StateRebuildUseCase
+from markov_dayflow.domain.exceptions import VersionConflictException
+from markov_dayflow.infrastructure.utils import PathResolver, parse_date
+
+
+@click.command(name="rebuild")
+@click.option("--state", type=click.Path(), help="Path to state.json")
+@click.option("--config", type=click.Path(exists=True), help="Path to config.yaml")
+@click.option(
+    "--week-start",
+    help="Any week start date (YYYY-MM-DD); default: the stored state's, else Monday",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Worker processes reading the logs (default: CPU count)",
+)
+def rebuild(
+    state: str | None,
+    config: str | None,
+    week_start: str | None,
+    workers: int | None,
+) -> None:
+    """Rebuild state.json by replaying every logged day.
+
+    Transitions and this week's block counts are recomputed from the logs
+    (day files and compacted segments), with the configured decay applied as
+    if the week had been reset every 7 days.
+    """
+    path_resolver = PathResolver()
+
+    state_path = path_resolver.resolve(state, path_resolver.state_path)
+    config_path = path_resolver.resolve(config, PathResolver.get_config_path())
+    week_start_date = parse_date(week_start) if week_start else None
+
+    use_case = StateRebuildUseCase(workers=workers)
+    try:
+        result = use_case.execute(
+            str(state_path),
+            str(config_path),
+            path_resolver.logs_dir,
+            week_start=week_start_date,
+        )
+    except VersionConflictException as e:
+        click.echo(f"[ERROR] {e.message}")
+        return
+
+    if result["corrupt_path"]:
+        click.echo(f"[Info] Unreadable state moved to {result['corrupt_path']}")
+    if result["days"] == 0:
+        click.echo("[Info] No logged days found; state starts empty")
+
+    click.echo(
+        f"[OK] Rebuilt {state_path} from {result['blocks']} block(s) over "
+        f"{result['days']} day(s) and {result['resets']} weekly reset(s) "
+        f"in {result['seconds']:.2f}s with {result['workers']} worker(s)"
+    )
+    click.echo(f"[Info] Current week starts {result['week_start']}")
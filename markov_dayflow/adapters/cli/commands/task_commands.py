@@ -1,12 +1,48 @@
 """Task management commands."""
 
+from pathlib import Path
+from typing import IO
+
 import click
 
 from markov_dayflow.adapters.cli.formatters import TaskFormatter
-from markov_dayflow.adapters.repositories import TaskRepository
+from markov_dayflow.adapters.repositories import (
+    SqliteTaskRepository,
+    TaskRepository,
+    create_task_repository,
+    migrate_tasks,
+)
+from markov_dayflow.application.usecases.task_transfer import (
+    TRANSFER_FORMATS,
+    TaskExportUseCase,
+    TaskImportUseCase,
+    detect_format,
+)
 from markov_dayflow.domain.entities import Task
 from markov_dayflow.domain.value_objects.task_size import TASK_SIZE_HOURS
-from markov_dayflow.infrastructure.utils import PathResolver, parse_date
+from markov_dayflow.infrastructure.utils import (
+    TASK_STORAGE_BACKENDS,
+    PathResolver,
+    parse_date,
+)
+
+
+def _check_task_storage(path_resolver: PathResolver) -> None:
+    """Reject an unknown storage backend (e.g. a typo in the environment)."""
+    if path_resolver.task_storage not in TASK_STORAGE_BACKENDS:
+        raise click.UsageError(
+            f"Unknown task storage: {path_resolver.task_storage}. Expected one "
+            f"of {', '.join(TASK_STORAGE_BACKENDS)} "
+            "(check $MARKOV_DAYFLOW_TASK_STORAGE)"
+        )
+
+
+def _task_repository(
+    path_resolver: PathResolver, tasks_path: Path
+) -> TaskRepository | SqliteTaskRepository:
+    """Create the task repository for the resolved storage backend."""
+    _check_task_storage(path_resolver)
+    return create_task_repository(tasks_path, path_resolver.task_storage)
 
 
 @click.command(name="add-task")
@@ -48,13 +84,8 @@ def add_task(
     path_resolver = PathResolver()
     path_resolver.ensure_directories()
 
-    task_repo = TaskRepository()
     tasks_path = path_resolver.tasks_path
-
-    if tasks_path.exists():
-        tasks = task_repo.load_tasks(tasks_path)
-    else:
-        tasks = []
+    task_repo = _task_repository(path_resolver, tasks_path)
 
     planned_date = parse_date(planned) if planned else None
 
@@ -73,8 +104,7 @@ def add_task(
         deadline_days=deadline,
     )
 
-    tasks.append(new_task)
-    task_repo.save_tasks(tasks_path, tasks)
+    task_repo.add_task(tasks_path, new_task)
 
     click.echo(f"[OK] Added task #{new_task.id}: {title} ({bucket}, {status})")
 
@@ -89,27 +119,22 @@ def add_task(
 def mark(identifier: str, status: str, date: str | None) -> None:
     """Mark task with new status."""
     path_resolver = PathResolver()
-    task_repo = TaskRepository()
     tasks_path = path_resolver.tasks_path
+    task_repo = _task_repository(path_resolver, tasks_path)
 
     if not tasks_path.exists():
         click.echo("[ERROR] No tasks file found. Add tasks first with 'add-task'")
         return
 
-    tasks = task_repo.load_tasks(tasks_path)
-
     task = None
     if identifier.isdigit():
         task_id = int(identifier)
-        for t in tasks:
-            if t.id == task_id:
-                task = t
-                break
+        task = task_repo.find_by_id(tasks_path, task_id)
         if not task:
             click.echo(f"[ERROR] No task found with ID: {task_id}")
             return
     else:
-        matching_tasks = [t for t in tasks if identifier.lower() in t.title.lower()]
+        matching_tasks = task_repo.find_by_title(tasks_path, identifier)
 
         if not matching_tasks:
             click.echo(f"[ERROR] No tasks found matching: {identifier}")
@@ -129,7 +154,7 @@ def mark(identifier: str, status: str, date: str | None) -> None:
     if status == "planned":
         task.planned_date = parse_date(date)
 
-    task_repo.save_tasks(tasks_path, tasks)
+    task_repo.update_task(tasks_path, task)
     click.echo(f"[OK] Marked #{task.id} '{task.title}': {old_status} -> {status}")
 
 
@@ -138,15 +163,13 @@ def mark(identifier: str, status: str, date: str | None) -> None:
 def remove(identifier: str) -> None:
     """Remove a task."""
     path_resolver = PathResolver()
-    task_repo = TaskRepository()
     tasks_path = path_resolver.tasks_path
+    task_repo = _task_repository(path_resolver, tasks_path)
 
     if not tasks_path.exists():
         click.echo("[ERROR] No tasks file found. Add tasks first with 'add-task'")
         return
 
-    tasks = task_repo.load_tasks(tasks_path)
-
     task_to_remove = None
     if identifier.isdigit():
         task_id = int(identifier)
@@ -155,7 +178,7 @@ def remove(identifier: str) -> None:
             click.echo(f"[ERROR] No task found with ID: {task_id}")
             return
     else:
-        matching_tasks = [t for t in tasks if identifier.lower() in t.title.lower()]
+        matching_tasks = task_repo.find_by_title(tasks_path, identifier)
 
         if not matching_tasks:
             click.echo(f"[ERROR] No tasks found matching: {identifier}")
@@ -169,8 +192,7 @@ def remove(identifier: str) -> None:
 
         task_to_remove = matching_tasks[0]
 
-    tasks.remove(task_to_remove)
-    task_repo.save_tasks(tasks_path, tasks)
+    task_repo.delete_task(tasks_path, task_to_remove.id)
     click.echo(f"[OK] Removed #{task_to_remove.id} '{task_to_remove.title}'")
 
 
@@ -201,27 +223,22 @@ def edit_task(
 ) -> None:
     """Edit task properties."""
     path_resolver = PathResolver()
-    task_repo = TaskRepository()
     tasks_path = path_resolver.tasks_path
+    task_repo = _task_repository(path_resolver, tasks_path)
 
     if not tasks_path.exists():
         click.echo("[ERROR] No tasks file found. Add tasks first with 'add-task'")
         return
 
-    tasks = task_repo.load_tasks(tasks_path)
-
     task = None
     if identifier.isdigit():
         task_id = int(identifier)
-        for t in tasks:
-            if t.id == task_id:
-                task = t
-                break
+        task = task_repo.find_by_id(tasks_path, task_id)
         if not task:
             click.echo(f"[ERROR] No task found with ID: {task_id}")
             return
     else:
-        matching_tasks = [t for t in tasks if identifier.lower() in t.title.lower()]
+        matching_tasks = task_repo.find_by_title(tasks_path, identifier)
 
         if not matching_tasks:
             click.echo(f"[ERROR] No tasks found matching: {identifier}")
@@ -283,7 +300,7 @@ def edit_task(
         click.echo(f"[INFO] No changes made to task #{task.id} '{task.title}'")
         return
 
-    task_repo.save_tasks(tasks_path, tasks)
+    task_repo.update_task(tasks_path, task)
 
     click.echo(f"[OK] Updated task #{task.id} '{task.title}':")
     for change in changes:
@@ -304,21 +321,159 @@ def edit_task(
 def tasks(status: str | None, exclude_status: str | None) -> None:
     """List tasks."""
     path_resolver = PathResolver()
-    task_repo = TaskRepository()
     tasks_path = path_resolver.tasks_path
+    task_repo = _task_repository(path_resolver, tasks_path)
 
     if not tasks_path.exists():
         click.echo("[ERROR] No tasks file found. Add tasks first with 'add-task'")
         return
 
-    task_list = task_repo.load_tasks(tasks_path)
-
     if status:
-        task_list = [t for t in task_list if t.status == status]
-    elif exclude_status:
-        task_list = [t for t in task_list if t.status != exclude_status]
+        task_list = task_repo.find_by_status(tasks_path, status)
+    else:
+        task_list = task_repo.load_tasks(tasks_path)
+        if exclude_status:
+            task_list = [t for t in task_list if t.status != exclude_status]
 
     click.echo(TaskFormatter.format_task_list(task_list))
 
     if task_list:
         click.echo("\n[Tip] Tip: Use task IDs for quick commands (e.g., 'mark 3 done')")
+
+
+@click.command()
+@click.option(
+    "--to",
+    "target",
+    type=click.Choice(TASK_STORAGE_BACKENDS, case_sensitive=False),
+    default="sqlite",
+    help="Target storage backend: json, journal or sqlite (default: sqlite)",
+)
+def migrate(target: str) -> None:
+    """Migrate tasks between JSON, journaled JSON and SQLite storage."""
+    source_resolver = PathResolver()
+    _check_task_storage(source_resolver)
+    target_resolver = PathResolver(
+        base_dir=source_resolver.base_dir, task_storage=target
+    )
+    source_path = source_resolver.tasks_path
+    target_path = target_resolver.tasks_path
+
+    if source_resolver.task_storage == target:
+        click.echo(f"[INFO] Tasks already use {target} storage ({source_path})")
+        return
+
+    if not source_path.exists():
+        click.echo(f"[ERROR] No tasks file found at {source_path}")
+        return
+
+    count = migrate_tasks(source_path, target_path)
+    click.echo(f"[OK] Migrated {count} tasks: {source_path} -> {target_path}")
+
+    journal_path = target_resolver.tasks_journal_path
+    if target == "journal":
+        journal_path.touch()
+    elif target == "json" and journal_path.exists():
+        journal_path.unlink()
+
+    if source_resolver.task_storage == "sqlite":
+        backup_path = source_path.with_suffix(source_path.suffix + ".bak")
+        source_path.rename(backup_path)
+        click.echo(f"[Info] Moved {source_path} to {backup_path}")
+    elif target == "sqlite":
+        click.echo(f"[Tip] {source_path} is kept as a backup and no longer read")
+
+
+def _open_transfer_file(path: str, mode: str) -> IO[str]:
+    """Open an import/export file, with '-' meaning stdin/stdout."""
+    if path == "-":
+        return click.open_file(path, mode, encoding="utf-8")
+    # newline="" lets the csv module handle quoted line breaks itself.
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+@click.command(name="import")
+@click.argument("source", type=click.Path(allow_dash=True))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(TRANSFER_FORMATS, case_sensitive=False),
+    help="Input format (default: from file extension)",
+)
+@click.option("--dry-run", is_flag=True, help="Validate records without importing")
+def import_tasks(source: str, fmt: str | None, dry_run: bool) -> None:
+    """Import tasks from a CSV or JSONL file ('-' for stdin)."""
+    path_resolver = PathResolver()
+    path_resolver.ensure_directories()
+    tasks_path = path_resolver.tasks_path
+
+    try:
+        fmt = detect_format(source, fmt)
+    except ValueError as e:
+        click.echo(f"[ERROR] {e}")
+        return
+
+    use_case = TaskImportUseCase(
+        task_repo=_task_repository(path_resolver, tasks_path)
+    )
+    with _open_transfer_file(source, "r") as f:
+        result = use_case.execute(f, tasks_path, fmt, dry_run=dry_run)
+
+    if result["error_count"]:
+        click.echo(
+            f"[ERROR] {result['error_count']} invalid record(s), nothing imported:"
+        )
+        for error in result["errors"]:
+            click.echo(f"  {error}")
+        hidden = result["error_count"] - len(result["errors"])
+        if hidden:
+            click.echo(f"  ... and {hidden} more")
+        return
+
+    if dry_run:
+        click.echo(f"[OK] {result['validated']} record(s) valid (dry run)")
+    elif result["imported"] == 0:
+        click.echo("[INFO] No records to import")
+    else:
+        click.echo(
+            f"[OK] Imported {result['imported']} tasks "
+            f"(#{result['first_id']}-#{result['last_id']})"
+        )
+
+
+@click.command(name="export")
+@click.argument("target", type=click.Path(allow_dash=True))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(TRANSFER_FORMATS, case_sensitive=False),
+    help="Output format (default: from file extension)",
+)
+@click.option(
+    "--status",
+    type=click.Choice(["todo", "planned", "wip", "done"], case_sensitive=False),
+    help="Only export tasks with this status",
+)
+def export_tasks(target: str, fmt: str | None, status: str | None) -> None:
+    """Export tasks to a CSV or JSONL file ('-' for stdout)."""
+    path_resolver = PathResolver()
+    tasks_path = path_resolver.tasks_path
+
+    if not tasks_path.exists():
+        click.echo("[ERROR] No tasks file found. Add tasks first with 'add-task'")
+        return
+
+    try:
+        fmt = detect_format(target, fmt)
+    except ValueError as e:
+        click.echo(f"[ERROR] {e}")
+        return
+
+    use_case = TaskExportUseCase(
+        task_repo=_task_repository(path_resolver, tasks_path)
+    )
+    with _open_transfer_file(target, "w") as f:
+        count = use_case.execute(f, tasks_path, fmt, status=status)
+
+    if target != "-":
+        click.echo(f"[OK] Exported {count} tasks to {target}")
@@ -3,14 +3,20 @@
 import click
 
 from markov_dayflow.adapters.cli.commands import (
+    batch_commands,
     config_commands,
     logging_commands,
     plan_commands,
     reporting_commands,
+    state_commands,
     task_commands,
 )
 from markov_dayflow.application.usecases.plan_generation import PlanGenerationUseCase
-from markov_dayflow.infrastructure.utils import PathResolver, parse_date
+from markov_dayflow.infrastructure.utils import (
+    PathResolver,
+    parse_date,
+    recover_transactions,
+)
 
 
 def show_default_status() -> None:
@@ -71,13 +77,15 @@ def cli(ctx: click.Context) -> None:
 
     Run without arguments to show today's plan.
     """
+    recover_transactions(PathResolver().transactions_dir)
+
     if ctx.invoked_subcommand is None:
         show_default_status()
 
 
 @click.group()
 def task():
-    """Manage tasks (add, list, edit, update, delete)."""
+    """Manage tasks (add, list, edit, update, delete, migrate, import, export)."""
     pass
 
 
@@ -86,25 +94,32 @@ task.add_command(task_commands.tasks, name="list")
 task.add_command(task_commands.edit_task, name="edit")
 task.add_command(task_commands.mark, name="update")
 task.add_command(task_commands.remove, name="delete")
+task.add_command(task_commands.migrate, name="migrate")
+task.add_command(task_commands.import_tasks, name="import")
+task.add_command(task_commands.export_tasks, name="export")
 
 
 @click.group(invoke_without_command=True)
 @click.pass_context
 def plan(ctx: click.Context):
-    """Manage daily plans (show, generate, log work)."""
+    """Manage daily plans (show, generate, replan, log work)."""
     if ctx.invoked_subcommand is None:
         ctx.invoke(plan_commands.show, date=None)
 
 
 plan.add_command(plan_commands.show, name="show")
 plan.add_command(plan_commands.plan, name="generate")
+plan.add_command(plan_commands.replan, name="replan")
 plan.add_command(logging_commands.log, name="log")
 
 
 @click.group(invoke_without_command=True)
 @click.pass_context
 def report(ctx: click.Context):
-    """View reports and manage state (weekly report, reset)."""
+    """View reports and manage state.
+
+    Commands: weekly, reset, history, compact-logs, simulate, markov.
+    """
     if ctx.invoked_subcommand is None:
         ctx.invoke(
             reporting_commands.report,
@@ -117,11 +132,35 @@ def report(ctx: click.Context):
 
 report.add_command(reporting_commands.report, name="weekly")
 report.add_command(reporting_commands.weekly_reset, name="reset")
+report.add_command(reporting_commands.history, name="history")
+report.add_command(reporting_commands.compact_logs, name="compact-logs")
+report.add_command(reporting_commands.simulate, name="simulate")
+report.add_command(reporting_commands.markov, name="markov")
+
+
+@click.group()
+def state():
+    """Maintain the learned Markov state (rebuild)."""
+    pass
+
+
+state.add_command(state_commands.rebuild, name="rebuild")
+
+
+@click.group()
+def batch():
+    """Run commands across many data directories (plan)."""
+    pass
+
+
+batch.add_command(batch_commands.batch_plan, name="plan")
 
 
 cli.add_command(task)
 cli.add_command(plan)
 cli.add_command(report)
+cli.add_command(state)
+cli.add_command(batch)
 cli.add_command(config_commands.config)
 
 
@@ -1,71 +1,345 @@
 """Simplified repository implementations without port abstraction layer."""
 
+import copy
+import sqlite3
+from contextlib import closing
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import yaml
 
 from markov_dayflow.domain.entities import Block, Plan, Task, WeeklyState
-from markov_dayflow.infrastructure.utils import atomic_write_json, read_json
+from markov_dayflow.domain.exceptions import VersionConflictException
+from markov_dayflow.infrastructure.utils import (
+    TASK_STORAGE_BACKENDS,
+    DocumentCache,
+    Serializer,
+    StateArchive,
+    Transaction,
+    append_jsonl,
+    atomic_write_bytes,
+    document_cache,
+    ensure_directory,
+    file_lock,
+    get_journal_path,
+    get_serializer,
+    read_json,
+    read_jsonl,
+)
+
+
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+
+def _task_from_dict(item: dict[str, Any]) -> Task:
+    """Build a Task entity from its serialized form."""
+    return Task(
+        title=item["title"],
+        bucket=item["bucket"],
+        urgency=item["urgency"],
+        impact=item["impact"],
+        size=item["size"],
+        difficulty=item["difficulty"],
+        id=item.get("id", 0),
+        status=item.get("status", "todo"),
+        planned_date=item.get("planned_date"),
+        sla_penalty=item.get("sla_penalty", 0.0),
+        age_days=item.get("age_days", 0),
+        deadline_days=item.get("deadline_days"),
+    )
+
+
+def _task_to_dict(task: Task) -> dict[str, Any]:
+    """Serialize a Task entity, omitting unset optional fields."""
+    item = {
+        "id": task.id,
+        "title": task.title,
+        "bucket": task.bucket,
+        "urgency": task.urgency,
+        "impact": task.impact,
+        "size": task.size,
+        "difficulty": task.difficulty,
+        "status": task.status,
+        "sla_penalty": task.sla_penalty,
+        "age_days": task.age_days,
+    }
+    if task.planned_date is not None:
+        item["planned_date"] = task.planned_date
+    if task.deadline_days is not None:
+        item["deadline_days"] = task.deadline_days
+
+    return item
+
+
+def _state_from_dict(
+    data: dict[str, Any], planning_buckets: tuple[str, ...] = ()
+) -> WeeklyState:
+    """Build a WeeklyState entity from its serialized form."""
+    return WeeklyState(
+        current_bucket=data.get("current_bucket", "Feature"),
+        weekly_blocks=data.get("weekly_blocks", {}),
+        transitions=data.get("transitions", {}),
+        week_start=data.get("week_start", ""),
+        decay_epoch=data.get("decay_epoch", ""),
+        previous_buckets=data.get("previous_buckets", []),
+        contexts=data.get("contexts", {}),
+        version=data.get("version", 0),
+        planning_buckets=planning_buckets,
+    )
+
+
+def _state_to_dict(state: WeeklyState) -> dict[str, Any]:
+    """Serialize a WeeklyState entity (without its version)."""
+    return {
+        "current_bucket": state.current_bucket,
+        "weekly_blocks": state.weekly_blocks,
+        "transitions": state.transitions.to_dict(),
+        "week_start": state.week_start,
+        "decay_epoch": state.decay_epoch,
+        "previous_buckets": state.previous_buckets,
+        "contexts": state.contexts.to_dict(),
+    }
+
+
+def _copy_tasks(tasks: list[Task]) -> list[Task]:
+    """Copy cached tasks so callers can mutate them freely."""
+    return [copy.copy(task) for task in tasks]
+
+
+def _copy_state(state: WeeklyState) -> WeeklyState:
+    """Copy a cached state, including its nested counters."""
+    state_copy = copy.copy(state)
+    state_copy.weekly_blocks = dict(state.weekly_blocks)
+    state_copy.transitions = state.transitions.copy()
+    state_copy.previous_buckets = list(state.previous_buckets)
+    state_copy.contexts = state.contexts.copy()
+    return state_copy
+
+
+def _copy_plan(plan: Plan) -> Plan:
+    """Copy a cached plan, including its blocks."""
+    plan_copy = copy.copy(plan)
+    plan_copy.blocks = [copy.copy(block) for block in plan.blocks]
+    return plan_copy
+
+
+def _read_version(path: str | Path) -> int:
+    """Read a document's stored version (0 if missing or unversioned)."""
+    if not Path(path).exists():
+        return 0
+    return read_json(path).get("version", 0)
+
+
+def _write_versioned(
+    path: str | Path,
+    content: bytes,
+    expected_version: int,
+    transaction: Transaction | None,
+) -> None:
+    """
+    Write a document only if its stored version is still expected_version.
+
+    The check runs under the document's lock, together with the write (or,
+    inside a transaction, together with the whole commit).
+
+    Raises:
+        VersionConflictException: If another writer saved the document since
+            it was loaded
+    """
+
+    def check() -> None:
+        actual = _read_version(path)
+        if actual != expected_version:
+            raise VersionConflictException(str(path), expected_version, actual)
+
+    if transaction is not None:
+        transaction.guard(path, check)
+        transaction.write_bytes(path, content)
+        return
+
+    with file_lock(path):
+        check()
+        atomic_write_bytes(path, content)
+
+
+def _assign_task_ids(tasks: list[Task]) -> None:
+    """Assign sequential IDs to tasks that don't have one yet."""
+    max_id = max((t.id for t in tasks if t.id > 0), default=0)
+    for task in tasks:
+        if task.id == 0:
+            max_id += 1
+            task.id = max_id
 
 
 class TaskRepository:
-    """JSON-based task repository."""
+    """
+    JSON-based task repository.
+
+    In journaled mode, single-task changes are appended to a sibling
+    tasks.journal.jsonl instead of rewriting tasks.json; readers replay the
+    journal on top of the snapshot, and the journal is folded back into the
+    snapshot once it grows past compact_threshold bytes.
+    """
+
+    def __init__(
+        self,
+        journaled: bool = False,
+        compact_threshold: int = 1024 * 1024,
+        serializer: Serializer | None = None,
+        cache: DocumentCache | None = None,
+    ):
+        """
+        Initialize task repository.
+
+        Args:
+            journaled: Append single-task changes to the journal
+            compact_threshold: Journal size in bytes that triggers compaction
+            serializer: Snapshot serializer (defaults to indented JSON, since
+                tasks.json is meant to be readable)
+            cache: Parsed-document cache (defaults to the process-wide one)
+        """
+        self.journaled = journaled
+        self.compact_threshold = compact_threshold
+        self.serializer = serializer or get_serializer(indent=2)
+        self.cache = cache if cache is not None else document_cache
 
     def load_tasks(self, path: str | Path) -> list[Task]:
-        """Load tasks from JSON file."""
-        data = read_json(path)
-        tasks = []
+        """Load tasks from JSON file, replaying any pending journal entries."""
+        return self.cache.load(
+            path,
+            lambda: self._read_tasks(path),
+            _copy_tasks,
+            dependencies=(get_journal_path(path),),
+        )
 
-        for item in data:
-            task = Task(
-                title=item["title"],
-                bucket=item["bucket"],
-                urgency=item["urgency"],
-                impact=item["impact"],
-                size=item["size"],
-                difficulty=item["difficulty"],
-                id=item.get("id", 0),
-                status=item.get("status", "todo"),
-                planned_date=item.get("planned_date"),
-                sla_penalty=item.get("sla_penalty", 0.0),
-                age_days=item.get("age_days", 0),
-                deadline_days=item.get("deadline_days"),
-            )
-            tasks.append(task)
+    def _read_tasks(self, path: str | Path) -> list[Task]:
+        """Parse the snapshot and replay the journal, bypassing the cache."""
+        data = read_json(path) if Path(path).exists() else []
+        tasks = [_task_from_dict(item) for item in data]
+
+        journal_path = get_journal_path(path)
+        if journal_path.exists():
+            tasks = self._replay_journal(tasks, read_jsonl(journal_path))
 
         return tasks
 
     def save_tasks(self, path: str | Path, tasks: list[Task]) -> None:
         """Save tasks to JSON file with auto-assigned IDs."""
-        max_id = max((t.id for t in tasks if t.id > 0), default=0)
-        for task in tasks:
+        _assign_task_ids(tasks)
+        data = [_task_to_dict(task) for task in tasks]
+        atomic_write_bytes(path, self.serializer.dumps(data))
+
+        journal_path = get_journal_path(path)
+        if journal_path.exists():
+            journal_path.write_text("", encoding="utf-8")
+        self.cache.invalidate(path)
+
+    def add_task(self, path: str | Path, task: Task) -> Task:
+        """Append a task and assign its ID."""
+        tasks = self.load_tasks(path)
+
+        if self.journaled:
+            if not Path(path).exists():
+                atomic_write_bytes(path, self.serializer.dumps([]))
             if task.id == 0:
-                max_id += 1
-                task.id = max_id
+                task.id = max((t.id for t in tasks), default=0) + 1
+            self._append_journal(path, {"op": "put", "task": _task_to_dict(task)})
+            return task
 
-        data = []
-        for task in tasks:
-            item = {
-                "id": task.id,
-                "title": task.title,
-                "bucket": task.bucket,
-                "urgency": task.urgency,
-                "impact": task.impact,
-                "size": task.size,
-                "difficulty": task.difficulty,
-                "status": task.status,
-                "sla_penalty": task.sla_penalty,
-                "age_days": task.age_days,
-            }
-            if task.planned_date is not None:
-                item["planned_date"] = task.planned_date
-            if task.deadline_days is not None:
-                item["deadline_days"] = task.deadline_days
+        tasks.append(task)
+        self.save_tasks(path, tasks)
+        return task
 
-            data.append(item)
+    def add_tasks(self, path: str | Path, new_tasks: list[Task]) -> list[Task]:
+        """
+        Append many tasks with one load and one snapshot write.
 
-        atomic_write_json(path, data)
+        IDs continue after the highest stored ID. In journaled mode the
+        batch is written straight into the snapshot (folding in the journal)
+        rather than journaled entry by entry.
+
+        Args:
+            path: Tasks file path
+            new_tasks: Tasks to add (their IDs are assigned here)
+
+        Returns:
+            The added tasks, with IDs
+        """
+        tasks = self.load_tasks(path)
+        next_id = max((t.id for t in tasks), default=0) + 1
+        for offset, task in enumerate(new_tasks):
+            task.id = next_id + offset
+
+        self.save_tasks(path, tasks + new_tasks)
+        return new_tasks
+
+    def update_task(self, path: str | Path, task: Task) -> None:
+        """Replace the stored task that has the same ID."""
+        if self.journaled:
+            if self.find_by_id(path, task.id) is None:
+                raise ValueError(f"Task {task.id} not found")
+            self._append_journal(path, {"op": "put", "task": _task_to_dict(task)})
+            return
+
+        tasks = self.load_tasks(path)
+        for i, existing in enumerate(tasks):
+            if existing.id == task.id:
+                tasks[i] = task
+                break
+        else:
+            raise ValueError(f"Task {task.id} not found")
+        self.save_tasks(path, tasks)
+
+    def delete_task(self, path: str | Path, task_id: int) -> None:
+        """Remove the task with the given ID."""
+        if self.journaled:
+            if self.find_by_id(path, task_id) is None:
+                raise ValueError(f"Task {task_id} not found")
+            self._append_journal(path, {"op": "delete", "id": task_id})
+            return
+
+        tasks = self.load_tasks(path)
+        remaining = [t for t in tasks if t.id != task_id]
+        if len(remaining) == len(tasks):
+            raise ValueError(f"Task {task_id} not found")
+        self.save_tasks(path, remaining)
+
+    def compact(self, path: str | Path) -> None:
+        """Fold the journal into the snapshot and truncate it."""
+        self.save_tasks(path, self.load_tasks(path))
+
+    def _append_journal(self, path: str | Path, entry: dict[str, Any]) -> None:
+        """Append one mutation and compact once the journal is large."""
+        journal_path = get_journal_path(path)
+        append_jsonl(journal_path, entry)
+        self.cache.invalidate(path)
+
+        if journal_path.stat().st_size >= self.compact_threshold:
+            self.compact(path)
+
+    @staticmethod
+    def _replay_journal(
+        tasks: list[Task], entries: list[dict[str, Any]]
+    ) -> list[Task]:
+        """
+        Apply journal entries on top of snapshot tasks.
+
+        Entries are idempotent upserts/deletes keyed by task ID, so replaying a
+        journal over a snapshot that already contains it is harmless.
+        """
+        if not entries:
+            return tasks
+
+        by_id = {task.id: task for task in tasks}
+
+        for entry in entries:
+            if entry["op"] == "put":
+                task = _task_from_dict(entry["task"])
+                by_id[task.id] = task
+            elif entry["op"] == "delete":
+                by_id.pop(entry["id"], None)
+
+        return list(by_id.values())
 
     def find_by_id(self, path: str | Path, task_id: int) -> Task | None:
         """Find task by ID."""
@@ -80,38 +354,400 @@ class TaskRepository:
         tasks = self.load_tasks(path)
         return [t for t in tasks if t.status == status]
 
+    def find_by_bucket(self, path: str | Path, bucket: str) -> list[Task]:
+        """Find tasks by their original bucket name."""
+        tasks = self.load_tasks(path)
+        return [t for t in tasks if t.bucket == bucket]
+
+    def find_by_title(self, path: str | Path, fragment: str) -> list[Task]:
+        """Find tasks whose title contains fragment (case-insensitive)."""
+        tasks = self.load_tasks(path)
+        return [t for t in tasks if fragment.lower() in t.title.lower()]
+
+
+class SqliteTaskRepository:
+    """
+    SQLite-based task repository.
+
+    Drop-in replacement for TaskRepository for large backlogs: lookups by
+    id, status and bucket hit indexes, and single-task changes touch one row
+    instead of rewriting the whole file.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            urgency INTEGER NOT NULL,
+            impact INTEGER NOT NULL,
+            size REAL NOT NULL,
+            difficulty INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'todo',
+            planned_date TEXT,
+            sla_penalty REAL NOT NULL DEFAULT 0.0,
+            age_days INTEGER NOT NULL DEFAULT 0,
+            deadline_days INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_bucket ON tasks (bucket);
+    """
+
+    _COLUMNS = (
+        "id",
+        "title",
+        "bucket",
+        "urgency",
+        "impact",
+        "size",
+        "difficulty",
+        "status",
+        "planned_date",
+        "sla_penalty",
+        "age_days",
+        "deadline_days",
+    )
+
+    def _connect(self, path: str | Path) -> sqlite3.Connection:
+        """Open the database, creating the schema on first use."""
+        ensure_directory(Path(path).parent)
+        conn = sqlite3.connect(str(path))
+        conn.row_factory = sqlite3.Row
+        conn.executescript(self._SCHEMA)
+        return conn
+
+    def _select(
+        self, path: str | Path, where: str = "", params: tuple = ()
+    ) -> list[Task]:
+        """Run a SELECT over the tasks table and build entities."""
+        with closing(self._connect(path)) as conn:
+            rows = conn.execute(
+                f"SELECT * FROM tasks {where} ORDER BY id", params
+            ).fetchall()
+        return [_task_from_dict(dict(row)) for row in rows]
+
+    def _row(self, task: Task) -> tuple:
+        """Convert a task into a row tuple matching _COLUMNS."""
+        return tuple(getattr(task, column) for column in self._COLUMNS)
+
+    def load_tasks(self, path: str | Path) -> list[Task]:
+        """Load all tasks from the database."""
+        return self._select(path)
+
+    def save_tasks(self, path: str | Path, tasks: list[Task]) -> None:
+        """Replace all stored tasks with auto-assigned IDs."""
+        _assign_task_ids(tasks)
+        placeholders = ", ".join("?" for _ in self._COLUMNS)
+
+        with closing(self._connect(path)) as conn, conn:
+            conn.execute("DELETE FROM tasks")
+            conn.executemany(
+                f"INSERT INTO tasks ({', '.join(self._COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                [self._row(task) for task in tasks],
+            )
+
+    def add_task(self, path: str | Path, task: Task) -> Task:
+        """Insert a task and assign its ID."""
+        columns = self._COLUMNS
+        values = self._row(task)
+        if task.id == 0:
+            columns, values = columns[1:], values[1:]
+        placeholders = ", ".join("?" for _ in columns)
+
+        with closing(self._connect(path)) as conn, conn:
+            cursor = conn.execute(
+                f"INSERT INTO tasks ({', '.join(columns)}) VALUES ({placeholders})",
+                values,
+            )
+            task.id = cursor.lastrowid
+
+        return task
+
+    def add_tasks(self, path: str | Path, new_tasks: list[Task]) -> list[Task]:
+        """
+        Insert many tasks in one SQLite transaction.
+
+        Args:
+            path: Database path
+            new_tasks: Tasks to add (their IDs are assigned here)
+
+        Returns:
+            The added tasks, with IDs
+        """
+        placeholders = ", ".join("?" for _ in self._COLUMNS)
+
+        with closing(self._connect(path)) as conn, conn:
+            # Take the write lock before reading MAX(id) so concurrent
+            # writers can't claim the same IDs.
+            conn.execute("BEGIN IMMEDIATE")
+            (max_id,) = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM tasks"
+            ).fetchone()
+            for offset, task in enumerate(new_tasks, start=1):
+                task.id = max_id + offset
+
+            conn.executemany(
+                f"INSERT INTO tasks ({', '.join(self._COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                [self._row(task) for task in new_tasks],
+            )
+
+        return new_tasks
+
+    def update_task(self, path: str | Path, task: Task) -> None:
+        """Update the single row for task.id."""
+        assignments = ", ".join(f"{column} = ?" for column in self._COLUMNS[1:])
+
+        with closing(self._connect(path)) as conn, conn:
+            cursor = conn.execute(
+                f"UPDATE tasks SET {assignments} WHERE id = ?",
+                self._row(task)[1:] + (task.id,),
+            )
+            if cursor.rowcount == 0:
+                raise ValueError(f"Task {task.id} not found")
+
+    def delete_task(self, path: str | Path, task_id: int) -> None:
+        """Delete the single row for task_id."""
+        with closing(self._connect(path)) as conn, conn:
+            cursor = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            if cursor.rowcount == 0:
+                raise ValueError(f"Task {task_id} not found")
+
+    def find_by_id(self, path: str | Path, task_id: int) -> Task | None:
+        """Find task by ID using the primary key."""
+        tasks = self._select(path, "WHERE id = ?", (task_id,))
+        return tasks[0] if tasks else None
+
+    def find_by_status(self, path: str | Path, status: str) -> list[Task]:
+        """Find tasks by status using the status index."""
+        return self._select(path, "WHERE status = ?", (status,))
+
+    def find_by_bucket(self, path: str | Path, bucket: str) -> list[Task]:
+        """Find tasks by original bucket name using the bucket index."""
+        return self._select(path, "WHERE bucket = ?", (bucket,))
+
+    def find_by_title(self, path: str | Path, fragment: str) -> list[Task]:
+        """Find tasks whose title contains fragment (case-insensitive)."""
+        needle = fragment.lower()
+        with closing(self._connect(path)) as conn:
+            conn.create_function(
+                "title_matches",
+                1,
+                lambda title: needle in title.lower(),
+                deterministic=True,
+            )
+            rows = conn.execute(
+                "SELECT * FROM tasks WHERE title_matches(title) ORDER BY id"
+            ).fetchall()
+        return [_task_from_dict(dict(row)) for row in rows]
+
+
+def create_task_repository(
+    path: str | Path, storage: str | None = None
+) -> TaskRepository | SqliteTaskRepository:
+    """
+    Create the task repository matching the storage format of path.
+
+    Args:
+        path: Tasks file path (.db/.sqlite/.sqlite3 selects SQLite, else JSON)
+        storage: Storage backend name from PathResolver.task_storage. When
+            omitted, JSON files with an existing journal are opened journaled.
+
+    Returns:
+        Repository instance for that storage backend
+
+    Raises:
+        ValueError: If storage is not a known backend
+    """
+    if storage is not None and storage not in TASK_STORAGE_BACKENDS:
+        raise ValueError(
+            f"Unknown task storage: {storage}. "
+            f"Expected one of {', '.join(TASK_STORAGE_BACKENDS)}"
+        )
+
+    if Path(path).suffix.lower() in SQLITE_SUFFIXES:
+        return SqliteTaskRepository()
+
+    if storage is None:
+        journaled = get_journal_path(path).exists()
+    else:
+        journaled = storage == "journal"
+    return TaskRepository(journaled=journaled)
+
+
+def migrate_tasks(source_path: str | Path, target_path: str | Path) -> int:
+    """
+    Copy all tasks between storage backends (e.g. tasks.json -> tasks.db).
+
+    Args:
+        source_path: Existing tasks file
+        target_path: Destination tasks file (replaced if it exists)
+
+    Returns:
+        Number of migrated tasks
+    """
+    tasks = create_task_repository(source_path).load_tasks(source_path)
+    create_task_repository(target_path).save_tasks(target_path, tasks)
+    return len(tasks)
+
 
 class StateRepository:
     """JSON-based state repository."""
 
-    def load_state(self, path: str | Path) -> WeeklyState:
-        """Load weekly state from JSON file."""
-        data = read_json(path)
+    def __init__(
+        self,
+        serializer: Serializer | None = None,
+        cache: DocumentCache | None = None,
+    ):
+        """
+        Initialize state repository.
 
-        return WeeklyState(
-            current_bucket=data.get("current_bucket", "Feature"),
-            weekly_blocks=data.get("weekly_blocks", {}),
-            transitions=data.get("transitions", {}),
-            week_start=data.get("week_start", ""),
+        Args:
+            serializer: Document serializer (defaults to get_serializer())
+            cache: Parsed-document cache (defaults to the process-wide one)
+        """
+        self.serializer = serializer or get_serializer()
+        self.cache = cache if cache is not None else document_cache
+
+    def load_state(
+        self, path: str | Path, planning_buckets: tuple[str, ...] = ()
+    ) -> WeeklyState:
+        """
+        Load weekly state from JSON file.
+
+        Args:
+            path: State file path
+            planning_buckets: Configured extra planning buckets (see
+                get_planning_buckets())
+        """
+        planning_buckets = tuple(planning_buckets)
+        state = self.cache.load(
+            path, lambda: self._read_state(path, planning_buckets), _copy_state
         )
+        if state.planning_buckets != planning_buckets:
+            # Cached for another configuration, whose buckets it was built with.
+            self.cache.invalidate(path)
+            state = self.cache.load(
+                path, lambda: self._read_state(path, planning_buckets), _copy_state
+            )
+        return state
+
+    @staticmethod
+    def _read_state(
+        path: str | Path, planning_buckets: tuple[str, ...] = ()
+    ) -> WeeklyState:
+        """Parse weekly state, bypassing the cache."""
+        return _state_from_dict(read_json(path), planning_buckets)
+
+    def save_state(
+        self,
+        path: str | Path,
+        state: WeeklyState,
+        transaction: Transaction | None = None,
+    ) -> None:
+        """
+        Save weekly state to JSON file, or stage it in transaction.
+
+        The save is optimistic: it fails if the stored version moved past
+        state.version since the state was loaded. A state that was never
+        loaded (version None) overwrites the stored one.
+
+        Raises:
+            VersionConflictException: If the state was saved concurrently
+        """
+        expected_version = (
+            state.version if state.version is not None else _read_version(path)
+        )
+        data = {**_state_to_dict(state), "version": expected_version + 1}
+
+        content = self.serializer.dumps(data)
+        _write_versioned(path, content, expected_version, transaction)
+        state.version = expected_version + 1
+        self.cache.invalidate(path)
 
-    def save_state(self, path: str | Path, state: WeeklyState) -> None:
-        """Save weekly state to JSON file."""
-        data = {
-            "current_bucket": state.current_bucket,
-            "weekly_blocks": state.weekly_blocks,
-            "transitions": state.transitions,
-            "week_start": state.week_start,
-        }
 
-        atomic_write_json(path, data)
+class StateArchiveRepository:
+    """Weekly state snapshots kept in a delta-encoded StateArchive."""
+
+    def append_week(
+        self, archive_dir: str | Path, week: str, state: WeeklyState
+    ) -> bool:
+        """
+        Archive the state a week ended with.
+
+        Args:
+            archive_dir: Archive directory
+            week: ISO date the week started
+            state: State at the end of the week
+
+        Returns:
+            True if archived, False if the week (or a later one) already was
+        """
+        return StateArchive(archive_dir).append(week, _state_to_dict(state))
+
+    def load_week(
+        self,
+        archive_dir: str | Path,
+        week: str,
+        planning_buckets: tuple[str, ...] = (),
+    ) -> WeeklyState | None:
+        """
+        Load the state a week ended with, or None if it isn't archived.
+
+        The state is unversioned, as if new: saving it overwrites state.json.
+        """
+        data = StateArchive(archive_dir).load(week)
+        if data is None:
+            return None
+        state = _state_from_dict(data, tuple(planning_buckets))
+        state.version = None
+        return state
+
+    def list_weeks(self, archive_dir: str | Path) -> list[str]:
+        """List archived weeks, oldest first."""
+        return StateArchive(archive_dir).weeks()
+
+    def scan_weeks(
+        self,
+        archive_dir: str | Path,
+        start: str | None = None,
+        end: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """
+        Iterate archived (week, serialized state) pairs for trend queries.
+
+        See StateArchive.scan(); fields limits what is rebuilt per week.
+        """
+        return StateArchive(archive_dir).scan(start, end, fields)
 
 
 class PlanRepository:
     """JSON-based plan repository."""
 
+    def __init__(
+        self,
+        serializer: Serializer | None = None,
+        cache: DocumentCache | None = None,
+    ):
+        """
+        Initialize plan repository.
+
+        Args:
+            serializer: Document serializer (defaults to get_serializer())
+            cache: Parsed-document cache (defaults to the process-wide one)
+        """
+        self.serializer = serializer or get_serializer()
+        self.cache = cache if cache is not None else document_cache
+
     def load_plan(self, path: str | Path) -> Plan:
         """Load plan from JSON file."""
+        return self.cache.load(path, lambda: self._read_plan(path), _copy_plan)
+
+    @staticmethod
+    def _read_plan(path: str | Path) -> Plan:
+        """Parse a plan, bypassing the cache."""
         data = read_json(path)
 
         blocks = []
@@ -125,11 +761,26 @@ class PlanRepository:
             )
             blocks.append(block)
 
-        return Plan(date=data["date"], blocks=blocks)
+        return Plan(date=data["date"], blocks=blocks, version=data.get("version", 0))
+
+    def save_plan(
+        self,
+        path: str | Path,
+        plan: Plan,
+        transaction: Transaction | None = None,
+    ) -> None:
+        """
+        Save plan to JSON file, or stage it in transaction.
+
+        Versioned like StateRepository.save_state.
 
-    def save_plan(self, path: str | Path, plan: Plan) -> None:
-        """Save plan to JSON file."""
-        data = {"date": plan.date, "blocks": []}
+        Raises:
+            VersionConflictException: If the plan was saved concurrently
+        """
+        expected_version = (
+            plan.version if plan.version is not None else _read_version(path)
+        )
+        data = {"date": plan.date, "blocks": [], "version": expected_version + 1}
 
         for block in plan.blocks:
             item = {
@@ -141,13 +792,30 @@ class PlanRepository:
             }
             data["blocks"].append(item)
 
-        atomic_write_json(path, data)
+        content = self.serializer.dumps(data)
+        _write_versioned(path, content, expected_version, transaction)
+        plan.version = expected_version + 1
+        self.cache.invalidate(path)
 
 
 class ConfigRepository:
     """YAML-based configuration repository."""
 
+    def __init__(self, cache: DocumentCache | None = None):
+        """
+        Initialize config repository.
+
+        Args:
+            cache: Parsed-document cache (defaults to the process-wide one)
+        """
+        self.cache = cache if cache is not None else document_cache
+
     def load_config(self, path: str | Path) -> dict[str, Any]:
         """Load configuration from YAML file."""
+        return self.cache.load(path, lambda: self._read_config(path))
+
+    @staticmethod
+    def _read_config(path: str | Path) -> dict[str, Any]:
+        """Parse the YAML configuration, bypassing the cache."""
         with open(path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f)
@@ -4,7 +4,7 @@ from datetime import datetime
 from pathlib import Path
 
 from markov_dayflow.domain.entities import Plan
-from markov_dayflow.infrastructure.utils import read_jsonl
+from markov_dayflow.infrastructure.utils import LogStore
 
 
 class GanttGenerator:
@@ -124,15 +124,13 @@ class GanttGenerator:
         ]
 
         plan_repo = PlanRepository()
+        log_store = LogStore(logs_dir)
 
         for date_str, plan_path in plan_files:
             try:
                 plan = plan_repo.load_plan(plan_path)
 
-                log_path = logs_dir / f"actual_{date_str}.jsonl"
-                actual_logs = []
-                if log_path.exists():
-                    actual_logs = read_jsonl(log_path)
+                actual_logs = log_store.read_day(date_str)
 
                 daily_gantt = GanttGenerator.generate_daily_gantt(
                     plan, actual_logs, config
@@ -43,7 +43,9 @@ class PieChartGenerator:
 
     @staticmethod
     def generate_planning_bucket_distribution(
-        actual_logs: list[dict], title: str = "Planning Bucket Distribution"
+        actual_logs: list[dict],
+        title: str = "Planning Bucket Distribution",
+        planning_buckets: tuple[str, ...] = (),
     ) -> str | None:
         """
         Generate a Mermaid pie chart for planning bucket distribution.
@@ -52,6 +54,7 @@ class PieChartGenerator:
         Args:
             actual_logs: List of actual work logs
             title: Chart title
+            planning_buckets: Configured extra planning buckets
 
         Returns:
             Mermaid pie chart as string, or None if no data
@@ -62,7 +65,7 @@ class PieChartGenerator:
         planning_bucket_counts: dict[str, int] = {}
         for log in actual_logs:
             original_bucket = log.get("actual_bucket", "Unknown")
-            planning_bucket = map_to_planning_bucket(original_bucket)
+            planning_bucket = map_to_planning_bucket(original_bucket, planning_buckets)
             planning_bucket_counts[planning_bucket] = (
                 planning_bucket_counts.get(planning_bucket, 0) + 1
             )
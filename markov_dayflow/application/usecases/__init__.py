@@ -1,13 +1,29 @@
 """Application use cases."""
 
+from markov_dayflow.application.usecases.batch_planning import BatchPlanningUseCase
 from markov_dayflow.application.usecases.log_actual import LogActualUseCase
+from markov_dayflow.application.usecases.markov_analysis import MarkovAnalysisUseCase
 from markov_dayflow.application.usecases.plan_generation import PlanGenerationUseCase
 from markov_dayflow.application.usecases.reporting import ReportingUseCase
+from markov_dayflow.application.usecases.simulation import SimulationUseCase
+from markov_dayflow.application.usecases.state_history import StateHistoryUseCase
+from markov_dayflow.application.usecases.state_rebuild import StateRebuildUseCase
+from markov_dayflow.application.usecases.task_transfer import (
+    TaskExportUseCase,
+    TaskImportUseCase,
+)
 from markov_dayflow.application.usecases.weekly_reset import WeeklyResetUseCase
 
 __all__ = [
+    "BatchPlanningUseCase",
     "LogActualUseCase",
+    "MarkovAnalysisUseCase",
     "PlanGenerationUseCase",
     "ReportingUseCase",
+    "SimulationUseCase",
+    "StateHistoryUseCase",
+    "StateRebuildUseCase",
+    "TaskExportUseCase",
+    "TaskImportUseCase",
     "WeeklyResetUseCase",
 ]
@@ -0,0 +1,199 @@
+"""Batch planning use case - plans many data directories in a process pool."""
+
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Any
+
+from markov_dayflow.adapters.repositories import (
+    ConfigRepository,
+    create_task_repository,
+)
+from markov_dayflow.application.usecases.plan_generation import PlanGenerationUseCase
+from markov_dayflow.domain.services.planning_config import validate_config
+from markov_dayflow.domain.services.rng import derive_seed
+from markov_dayflow.infrastructure.utils import PathResolver
+
+
+# Parsed configuration handed to each worker process once, by the initializer.
+_worker_config: dict | None = None
+
+
+def read_manifest(manifest_path: str | Path) -> list[Path]:
+    """
+    Read a manifest listing one data directory per line.
+
+    Blank lines and lines starting with '#' are ignored; relative paths are
+    resolved against the manifest's directory, and every path is made
+    absolute so different spellings of one directory count as duplicates
+    and are dropped.
+
+    Args:
+        manifest_path: Manifest file path
+
+    Returns:
+        Data directories in manifest order
+    """
+    manifest = Path(manifest_path)
+    data_dirs: dict[Path, None] = {}
+
+    with open(manifest, encoding="utf-8") as f:
+        for line in f:
+            entry = line.strip()
+            if not entry or entry.startswith("#"):
+                continue
+            data_dirs[(manifest.parent / Path(entry).expanduser()).resolve()] = None
+
+    return list(data_dirs)
+
+
+def _init_worker(config: dict) -> None:
+    """Keep the shared configuration in the worker process."""
+    global _worker_config
+    _worker_config = config
+
+
+def plan_tenant(
+    data_dir: str | Path,
+    date: str,
+    config: dict | None = None,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    """
+    Generate one data directory's plan, capturing any failure.
+
+    Args:
+        data_dir: Tenant data directory (holding tasks and state.json)
+        date: ISO date string
+        config: Parsed configuration (defaults to the worker's shared one)
+        seed: Base seed; the plan draws from a stream derived from
+            (seed, resolved data_dir, date), independent of which worker runs
+            it and of how the directory was spelled
+
+    Returns:
+        Result with 'tenant', 'status' ("ok" or "failed"), 'seconds',
+        'plan_path' and 'error'
+    """
+    start = time.perf_counter()
+    result: dict[str, Any] = {
+        "tenant": str(data_dir),
+        "status": "ok",
+        "seconds": 0.0,
+        "plan_path": None,
+        "error": None,
+    }
+
+    try:
+        if not Path(data_dir).is_dir():
+            raise FileNotFoundError(f"Data directory not found: {data_dir}")
+
+        path_resolver = PathResolver(data_dir)
+        path_resolver.ensure_directories()
+        tasks_path = path_resolver.tasks_path
+
+        use_case = PlanGenerationUseCase(task_repo=create_task_repository(tasks_path))
+        tenant_seed = (
+            None if seed is None else derive_seed(seed, Path(data_dir).resolve(), date)
+        )
+
+        # Per-plan tips would interleave across workers; the summary replaces them.
+        with contextlib.redirect_stdout(io.StringIO()):
+            result["plan_path"] = use_case.execute(
+                tasks_path=str(tasks_path),
+                state_path=str(path_resolver.state_path),
+                config_path=str(PathResolver.get_config_path()),
+                output_path=str(path_resolver.get_plan_path(date)),
+                date=date,
+                config=config if config is not None else _worker_config,
+                seed=tenant_seed,
+            )
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+class BatchPlanningUseCase:
+    """Use case for planning many tenants' data directories in one run."""
+
+    def __init__(
+        self,
+        config_repo: ConfigRepository | None = None,
+        workers: int | None = None,
+        seed: int | None = None,
+    ):
+        """
+        Initialize use case.
+
+        Args:
+            config_repo: Configuration repository
+            workers: Worker processes (defaults to the CPU count; 1 plans
+                in-process)
+            seed: Base seed making every tenant's plan reproducible,
+                whatever the worker count (default: unseeded)
+        """
+        self.config_repo = config_repo or ConfigRepository()
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+
+    def execute(
+        self,
+        data_dirs: list[str | Path],
+        config_path: str | Path,
+        date: str,
+    ) -> dict[str, Any]:
+        """
+        Plan every data directory for date.
+
+        The configuration is parsed and validated once, then shared with the
+        workers; a failing tenant is recorded and doesn't stop the others.
+
+        Args:
+            data_dirs: Tenant data directories
+            config_path: Path to config YAML shared by all tenants
+            date: ISO date string
+
+        Returns:
+            Summary with 'date', 'tenants' (per-tenant results in input
+            order), 'planned' and 'failed' counts, 'workers' and 'seconds'
+        """
+        start = time.perf_counter()
+        config = self.config_repo.load_config(config_path)
+        validate_config(config)
+
+        workers = max(1, min(self.workers, len(data_dirs)))
+        tenants = [str(d) for d in data_dirs]
+
+        if workers == 1:
+            results = [plan_tenant(d, date, config, self.seed) for d in tenants]
+        else:
+            chunksize = max(1, len(tenants) // (workers * 4))
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(config,)
+            ) as executor:
+                results = list(
+                    executor.map(
+                        plan_tenant,
+                        tenants,
+                        repeat(date),
+                        repeat(None),
+                        repeat(self.seed),
+                        chunksize=chunksize,
+                    )
+                )
+
+        failed = sum(1 for r in results if r["status"] != "ok")
+        return {
+            "date": date,
+            "tenants": results,
+            "planned": len(results) - failed,
+            "failed": failed,
+            "workers": workers,
+            "seconds": time.perf_counter() - start,
+        }
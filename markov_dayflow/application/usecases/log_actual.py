@@ -1,25 +1,109 @@
 """Log actual work use case."""
 
+import random
+import time
+from pathlib import Path
+from typing import Callable
+
 from markov_dayflow.adapters.repositories import (
     PlanRepository,
+    SqliteTaskRepository,
     StateRepository,
     TaskRepository,
+    create_task_repository,
+)
+from markov_dayflow.domain.entities import Task, WeeklyState
+from markov_dayflow.domain.entities.task import map_to_planning_bucket
+from markov_dayflow.domain.exceptions import VersionConflictException
+from markov_dayflow.domain.services.decay import decay_elapsed
+from markov_dayflow.infrastructure.utils import (
+    Transaction,
+    get_current_date,
+    get_transactions_dir,
+    recover_transactions,
 )
-from markov_dayflow.infrastructure.utils import append_jsonl
 
 
 class LogActualUseCase:
-    """Use case for logging actual work done."""
+    """
+    Use case for logging actual work done.
+
+    Several processes may log at once (editor hooks, timers). Writes are
+    optimistic: state and plan saves fail with VersionConflictException if
+    another logger committed first, and the whole read-modify-write is then
+    retried on freshly loaded documents, so both loggers' weekly_blocks and
+    transitions increments end up in the state.
+
+    With half_life_days set, transition counts decay by the days elapsed
+    since the last logged day before each new transition is counted. With
+    markov_order above 1, the transition is also counted after the last
+    markov_order buckets in state.contexts. Buckets in planning_buckets (the
+    configuration's list) are counted as themselves rather than as Chaos.
+    """
 
     def __init__(
         self,
         plan_repo: PlanRepository | None = None,
         state_repo: StateRepository | None = None,
-        task_repo: TaskRepository | None = None,
+        task_repo: TaskRepository | SqliteTaskRepository | None = None,
+        max_attempts: int = 10,
+        half_life_days: float | None = None,
+        markov_order: int = 1,
+        planning_buckets: tuple[str, ...] = (),
     ):
         self.plan_repo = plan_repo or PlanRepository()
         self.state_repo = state_repo or StateRepository()
-        self.task_repo = task_repo or TaskRepository()
+        self.task_repo = task_repo
+        self.max_attempts = max_attempts
+        self.half_life_days = half_life_days
+        self.markov_order = markov_order
+        self.planning_buckets = tuple(planning_buckets)
+
+    def _transactions_dir(self, state_path: str) -> Path:
+        """Transactions live in the data dir that holds state.json."""
+        return get_transactions_dir(Path(state_path).parent)
+
+    def _find_task(self, tasks_path: str, task_id: int) -> Task:
+        """Look up a task by ID in the repository matching tasks_path."""
+        task_repo = self.task_repo or create_task_repository(tasks_path)
+        task = task_repo.find_by_id(tasks_path, task_id)
+
+        if not task:
+            raise ValueError(f"Task {task_id} not found")
+
+        return task
+
+    def _retry_on_conflict(
+        self, attempt: Callable[[], dict[str, str]]
+    ) -> dict[str, str]:
+        """Run a load-modify-commit attempt until no concurrent writer wins."""
+        attempt_number = 1
+        while True:
+            try:
+                return attempt()
+            except VersionConflictException:
+                if attempt_number >= self.max_attempts:
+                    raise
+                # Jittered exponential backoff so colliding loggers spread out.
+                time.sleep(random.uniform(0, min(0.2, 0.002 * 2**attempt_number)))
+                attempt_number += 1
+
+    def _record_transition(
+        self, state: WeeklyState, planning_bucket: str, day: str
+    ) -> None:
+        """Count a block for planning_bucket and the transition into it."""
+        if self.half_life_days:
+            decay_elapsed(state, day, self.half_life_days)
+
+        state.weekly_blocks[planning_bucket] = (
+            state.weekly_blocks.get(planning_bucket, 0) + 1
+        )
+
+        state.transitions.increment(state.current_bucket, planning_bucket)
+        if self.markov_order > 1:
+            state.contexts.increment(state.context(self.markov_order), planning_bucket)
+
+        state.advance(planning_bucket)
 
     def execute(
         self,
@@ -32,6 +116,7 @@ class LogActualUseCase:
         notes: str | None = None,
         task_id: int | None = None,
         tasks_path: str | None = None,
+        date: str | None = None,
     ) -> dict[str, str]:
         """
         Log actual work for a block or completed task and update state.
@@ -46,13 +131,20 @@ class LogActualUseCase:
             notes: Optional notes
             task_id: Task ID for unplanned completed work
             tasks_path: Path to tasks JSON (required if task_id provided)
+            date: ISO date the work was done, for time-based decay
+                (default: today)
 
         Returns:
             dict: Contains 'bucket' and 'title' actually used for logging
 
         Raises:
             ValueError: If neither block_number nor task_id provided
+            VersionConflictException: If concurrent writers kept winning for
+                max_attempts attempts
         """
+        recover_transactions(self._transactions_dir(state_path))
+        day = date or get_current_date()
+
         if task_id is not None and block_number is not None:
             if not tasks_path:
                 raise ValueError("tasks_path required for task-based logging")
@@ -65,12 +157,15 @@ class LogActualUseCase:
                 task_id,
                 tasks_path,
                 notes,
+                day,
             )
         elif task_id is not None:
             if not tasks_path:
                 raise ValueError("tasks_path required for task-based logging")
 
-            return self._log_task(state_path, log_path, task_id, tasks_path, notes)
+            return self._log_task(
+                state_path, log_path, task_id, tasks_path, notes, day
+            )
         elif block_number is not None:
             return self._log_block(
                 plan_path,
@@ -80,6 +175,7 @@ class LogActualUseCase:
                 actual_bucket,
                 actual_title,
                 notes,
+                day,
             )
         else:
             raise ValueError("Either block_number or task_id must be provided")
@@ -91,37 +187,14 @@ class LogActualUseCase:
         task_id: int,
         tasks_path: str,
         notes: str | None,
+        day: str,
     ) -> dict[str, str]:
         """Log unplanned task completion."""
-        tasks = self.task_repo.load_tasks(tasks_path)
-        task = None
-        for t in tasks:
-            if t.id == task_id:
-                task = t
-                break
-
-        if not task:
-            raise ValueError(f"Task {task_id} not found")
+        task = self._find_task(tasks_path, task_id)
 
         actual_bucket = task.bucket
         actual_title = task.title
-
-        state = self.state_repo.load_state(state_path)
-        planning_bucket = task.get_planning_bucket()
-
-        state.weekly_blocks[planning_bucket] = (
-            state.weekly_blocks.get(planning_bucket, 0) + 1
-        )
-
-        prev_bucket = state.current_bucket
-        if prev_bucket not in state.transitions:
-            state.transitions[prev_bucket] = {}
-        state.transitions[prev_bucket][planning_bucket] = (
-            state.transitions[prev_bucket].get(planning_bucket, 0.0) + 1.0
-        )
-
-        state.current_bucket = planning_bucket
-        self.state_repo.save_state(state_path, state)
+        planning_bucket = task.get_planning_bucket(self.planning_buckets)
 
         log_entry = {
             "task_id": task_id,
@@ -129,9 +202,18 @@ class LogActualUseCase:
             "actual_title": actual_title,
             "notes": notes,
         }
-        append_jsonl(log_path, log_entry)
 
-        return {"bucket": actual_bucket, "title": actual_title}
+        def attempt() -> dict[str, str]:
+            state = self.state_repo.load_state(state_path, self.planning_buckets)
+            self._record_transition(state, planning_bucket, day)
+
+            with Transaction(self._transactions_dir(state_path)) as transaction:
+                self.state_repo.save_state(state_path, state, transaction)
+                transaction.append_jsonl(log_path, log_entry)
+
+            return {"bucket": actual_bucket, "title": actual_title}
+
+        return self._retry_on_conflict(attempt)
 
     def _log_block(
         self,
@@ -142,55 +224,49 @@ class LogActualUseCase:
         actual_bucket: str | None,
         actual_title: str | None,
         notes: str | None,
+        day: str,
     ) -> dict[str, str]:
         """Log planned block completion."""
-        plan = self.plan_repo.load_plan(plan_path)
-        state = self.state_repo.load_state(state_path)
 
-        block = None
-        for b in plan.blocks:
-            if b.block == block_number:
-                block = b
-                break
+        def attempt() -> dict[str, str]:
+            plan = self.plan_repo.load_plan(plan_path)
+            state = self.state_repo.load_state(state_path, self.planning_buckets)
 
-        if not block:
-            raise ValueError(f"Block {block_number} not found in plan")
+            block = None
+            for b in plan.blocks:
+                if b.block == block_number:
+                    block = b
+                    break
 
-        block.validate_can_be_modified()
+            if not block:
+                raise ValueError(f"Block {block_number} not found in plan")
 
-        final_bucket = actual_bucket if actual_bucket else block.bucket
-        final_title = actual_title if actual_title else block.title
+            block.validate_can_be_modified()
 
-        from markov_dayflow.domain.entities.task import map_to_planning_bucket
+            final_bucket = actual_bucket if actual_bucket else block.bucket
+            final_title = actual_title if actual_title else block.title
 
-        planning_bucket = map_to_planning_bucket(final_bucket)
-
-        state.weekly_blocks[planning_bucket] = (
-            state.weekly_blocks.get(planning_bucket, 0) + 1
-        )
-
-        prev_bucket = state.current_bucket
-        if prev_bucket not in state.transitions:
-            state.transitions[prev_bucket] = {}
-        state.transitions[prev_bucket][planning_bucket] = (
-            state.transitions[prev_bucket].get(planning_bucket, 0.0) + 1.0
-        )
+            planning_bucket = map_to_planning_bucket(
+                final_bucket, self.planning_buckets
+            )
+            self._record_transition(state, planning_bucket, day)
+            block.mark_completed()
 
-        state.current_bucket = planning_bucket
-        self.state_repo.save_state(state_path, state)
+            log_entry = {
+                "block": block_number,
+                "actual_bucket": final_bucket,
+                "actual_title": final_title,
+                "notes": notes,
+            }
 
-        block.mark_completed()
-        self.plan_repo.save_plan(plan_path, plan)
+            with Transaction(self._transactions_dir(state_path)) as transaction:
+                self.state_repo.save_state(state_path, state, transaction)
+                self.plan_repo.save_plan(plan_path, plan, transaction)
+                transaction.append_jsonl(log_path, log_entry)
 
-        log_entry = {
-            "block": block_number,
-            "actual_bucket": final_bucket,
-            "actual_title": final_title,
-            "notes": notes,
-        }
-        append_jsonl(log_path, log_entry)
+            return {"bucket": final_bucket, "title": final_title}
 
-        return {"bucket": final_bucket, "title": final_title}
+        return self._retry_on_conflict(attempt)
 
     def _log_task_in_block(
         self,
@@ -201,56 +277,14 @@ class LogActualUseCase:
         task_id: int,
         tasks_path: str,
         notes: str | None,
+        day: str,
     ) -> dict[str, str]:
         """Log task completion in a specific block - updates both task and plan."""
-        tasks = self.task_repo.load_tasks(tasks_path)
-        task = None
-        for t in tasks:
-            if t.id == task_id:
-                task = t
-                break
-
-        if not task:
-            raise ValueError(f"Task {task_id} not found")
-
-        plan = self.plan_repo.load_plan(plan_path)
-        state = self.state_repo.load_state(state_path)
-
-        block = None
-        for b in plan.blocks:
-            if b.block == block_number:
-                block = b
-                break
-
-        if not block:
-            raise ValueError(f"Block {block_number} not found in plan")
-
-        block.validate_can_be_modified()
+        task = self._find_task(tasks_path, task_id)
 
         actual_bucket = task.bucket
         actual_title = task.title
-
-        from markov_dayflow.domain.entities.task import map_to_planning_bucket
-
-        planning_bucket = map_to_planning_bucket(actual_bucket)
-
-        state.weekly_blocks[planning_bucket] = (
-            state.weekly_blocks.get(planning_bucket, 0) + 1
-        )
-
-        prev_bucket = state.current_bucket
-        if prev_bucket not in state.transitions:
-            state.transitions[prev_bucket] = {}
-        state.transitions[prev_bucket][planning_bucket] = (
-            state.transitions[prev_bucket].get(planning_bucket, 0.0) + 1.0
-        )
-
-        state.current_bucket = planning_bucket
-        self.state_repo.save_state(state_path, state)
-
-        block.update_content(actual_bucket, actual_title)
-        block.mark_completed()
-        self.plan_repo.save_plan(plan_path, plan)
+        planning_bucket = map_to_planning_bucket(actual_bucket, self.planning_buckets)
 
         log_entry = {
             "block": block_number,
@@ -259,6 +293,31 @@ class LogActualUseCase:
             "actual_title": actual_title,
             "notes": notes,
         }
-        append_jsonl(log_path, log_entry)
 
-        return {"bucket": actual_bucket, "title": actual_title}
+        def attempt() -> dict[str, str]:
+            plan = self.plan_repo.load_plan(plan_path)
+            state = self.state_repo.load_state(state_path, self.planning_buckets)
+
+            block = None
+            for b in plan.blocks:
+                if b.block == block_number:
+                    block = b
+                    break
+
+            if not block:
+                raise ValueError(f"Block {block_number} not found in plan")
+
+            block.validate_can_be_modified()
+
+            self._record_transition(state, planning_bucket, day)
+            block.update_content(actual_bucket, actual_title)
+            block.mark_completed()
+
+            with Transaction(self._transactions_dir(state_path)) as transaction:
+                self.state_repo.save_state(state_path, state, transaction)
+                self.plan_repo.save_plan(plan_path, plan, transaction)
+                transaction.append_jsonl(log_path, log_entry)
+
+            return {"bucket": actual_bucket, "title": actual_title}
+
+        return self._retry_on_conflict(attempt)
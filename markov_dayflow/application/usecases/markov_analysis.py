@@ -0,0 +1,76 @@
+"""Markov analysis use case - where the learned transitions steer the week."""
+
+from pathlib import Path
+from typing import Any
+
+from markov_dayflow.adapters.repositories import ConfigRepository, StateRepository
+from markov_dayflow.domain.entities import WeeklyState
+from markov_dayflow.domain.services.markov_analysis import analyze_chain
+from markov_dayflow.domain.services.planning_config import (
+    extract_config_params,
+    validate_config,
+)
+
+
+class MarkovAnalysisUseCase:
+    """Use case for analyzing the transition matrix against the targets."""
+
+    def __init__(
+        self,
+        state_repo: StateRepository | None = None,
+        config_repo: ConfigRepository | None = None,
+    ):
+        self.state_repo = state_repo or StateRepository()
+        self.config_repo = config_repo or ConfigRepository()
+
+    def execute(
+        self,
+        state_path: str | Path,
+        config_path: str | Path,
+        laplace: float | None = None,
+        alpha: float | None = None,
+        epsilon: float = 0.25,
+    ) -> dict[str, Any]:
+        """
+        Analyze the current state's chain with the configured parameters.
+
+        Args:
+            state_path: Path to state JSON (an empty state if missing)
+            config_path: Path to config YAML
+            laplace: Override the configured Laplace smoothing
+            alpha: Override the configured ratio_bias_alpha
+            epsilon: Total variation distance considered mixed
+
+        Returns:
+            Analysis (see analyze_chain) with the 'laplace' and 'alpha'
+            values used, 'current_bucket' and its 'likely_next' (up to five
+            heaviest observed transitions as (bucket, count) pairs)
+        """
+        config = self.config_repo.load_config(config_path)
+        validate_config(config)
+        params = extract_config_params(config)
+
+        if Path(state_path).exists():
+            state = self.state_repo.load_state(state_path, params["planning_buckets"])
+        else:
+            state = WeeklyState(planning_buckets=params["planning_buckets"])
+
+        laplace = params["laplace"] if laplace is None else laplace
+        alpha = params["ratio_bias_alpha"] if alpha is None else alpha
+
+        result = analyze_chain(
+            transitions=state.transitions,
+            weekly_blocks=state.weekly_blocks,
+            targets=params["targets"],
+            laplace=laplace,
+            alpha=alpha,
+            blocks_per_day=params["blocks_per_day"],
+            epsilon=epsilon,
+        )
+        result.update(
+            laplace=laplace,
+            alpha=alpha,
+            current_bucket=state.current_bucket,
+            likely_next=state.transitions.top(state.current_bucket, 5),
+        )
+        return result
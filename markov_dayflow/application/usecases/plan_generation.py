@@ -1,28 +1,55 @@
 """Plan generation use case - cleaned and refactored."""
 
+import os
 import random
+from dataclasses import replace
+from itertools import chain
 from pathlib import Path
 
 from markov_dayflow.adapters.repositories import (
     ConfigRepository,
     PlanRepository,
+    SqliteTaskRepository,
     StateRepository,
     TaskRepository,
+    create_task_repository,
 )
-from markov_dayflow.domain.entities import Block, Plan, Task, WeeklyState
+from markov_dayflow.domain.entities import (
+    Block,
+    Plan,
+    SparseTransitionMatrix,
+    Task,
+    WeeklyState,
+)
+from markov_dayflow.domain.entities.task import map_to_planning_bucket
 from markov_dayflow.domain.services.focus_blocks import (
     apply_focus_block_bias,
     get_focus_block_name,
     suggest_focus_optimization,
     validate_focus_block_quality_gates,
 )
-from markov_dayflow.domain.services.preemptor import select_preempt
+from markov_dayflow.domain.services.planning_config import (
+    extract_config_params,
+    get_planning_buckets,
+    validate_config,
+)
+from markov_dayflow.domain.services.planning_index import PlanningIndex
+from markov_dayflow.domain.services.rng import derive_seed
 from markov_dayflow.domain.services.sampler import (
+    OTHER_BUCKETS,
     apply_ratio_bias,
+    draw_other_bucket,
     normalize,
+    sparse_row,
+)
+from markov_dayflow.infrastructure.utils import (
+    DocumentCache,
+    Transaction,
+    document_cache,
+    ensure_directory,
+    get_journal_path,
+    get_transactions_dir,
 )
-from markov_dayflow.domain.services.scoring import compute_score
-from markov_dayflow.infrastructure.utils import ensure_directory
 
 
 class PlanGenerationUseCase:
@@ -30,15 +57,17 @@ class PlanGenerationUseCase:
 
     def __init__(
         self,
-        task_repo: TaskRepository | None = None,
+        task_repo: TaskRepository | SqliteTaskRepository | None = None,
         state_repo: StateRepository | None = None,
         plan_repo: PlanRepository | None = None,
         config_repo: ConfigRepository | None = None,
+        cache: DocumentCache | None = None,
     ):
-        self.task_repo = task_repo or TaskRepository()
+        self.task_repo = task_repo
         self.state_repo = state_repo or StateRepository()
         self.plan_repo = plan_repo or PlanRepository()
         self.config_repo = config_repo or ConfigRepository()
+        self.cache = cache if cache is not None else document_cache
 
     def execute(
         self,
@@ -47,6 +76,8 @@ class PlanGenerationUseCase:
         config_path: str | Path,
         output_path: str | Path,
         date: str,
+        config: dict | None = None,
+        seed: int | None = None,
     ) -> str:
         """
         Generate a daily focus block plan.
@@ -57,6 +88,9 @@ class PlanGenerationUseCase:
             config_path: Path to config YAML
             output_path: Path for output plan
             date: ISO date string
+            config: Already parsed configuration (skips loading config_path)
+            seed: Seed for this plan's random stream; the same seed and inputs
+                give the same plan (default: a fresh unseeded stream)
 
         Returns:
             Path to generated plan file
@@ -66,13 +100,16 @@ class PlanGenerationUseCase:
         ensure_directory(state_path)
         ensure_directory(output_path)
 
+        if config is None:
+            config = self.config_repo.load_config(config_path)
         tasks = self._load_or_create_tasks(tasks_path)
-        state = self._load_or_create_state(state_path, date)
-        config = self.config_repo.load_config(config_path)
+        state = self._load_or_create_state(
+            state_path, date, get_planning_buckets(config)
+        )
 
-        self._validate_config(config)
+        validate_config(config)
 
-        params = self._extract_config_params(config)
+        params = extract_config_params(config)
 
         realized_share = self._calculate_realized_share(
             state.weekly_blocks, params["targets"]
@@ -90,6 +127,7 @@ class PlanGenerationUseCase:
             date=date,
             config=config,
             existing_blocks=existing_plan.blocks if existing_plan else [],
+            rng=random.Random(seed),
         )
 
         plan = Plan(date=date, blocks=blocks)
@@ -97,32 +135,181 @@ class PlanGenerationUseCase:
 
         return str(output_path)
 
-    def _validate_config(self, config: dict) -> None:
-        """Validate configuration consistency."""
-        blocks_per_day = config.get("blocks_per_day", 5)
-        block_config = config.get("block_config", {})
-        configured_blocks = len(block_config)
+    def execute_range(
+        self,
+        tasks_path: str | Path,
+        state_path: str | Path,
+        config_path: str | Path,
+        output_paths: dict[str, str | Path],
+        seed: int | None = None,
+    ) -> list[str]:
+        """
+        Generate plans for several days in one pass.
+
+        Tasks, state and config are loaded and validated once. Between days
+        the plans are assumed to be followed: each day's blocks are added to
+        the weekly counts behind the realized share, and the next day starts
+        from the bucket of the previous day's last block. A task planned on
+        one day is not planned again on a later day. All plans are written
+        in a single transaction.
+
+        Args:
+            tasks_path: Path to tasks JSON
+            state_path: Path to state JSON
+            config_path: Path to config YAML
+            output_paths: ISO date -> output plan path, in planning order
+            seed: Base seed; each day draws from its own stream derived from
+                (seed, date), so a day's draws don't depend on how many days
+                were planned before it
+
+        Returns:
+            Paths to generated plan files
+        """
+        dates = list(output_paths)
+        if not dates:
+            return []
+
+        ensure_directory(tasks_path)
+        ensure_directory(state_path)
+        for output_path in output_paths.values():
+            ensure_directory(output_path)
+
+        config = self.config_repo.load_config(config_path)
+        tasks = self._load_or_create_tasks(tasks_path)
+        state = self._load_or_create_state(
+            state_path, dates[0], get_planning_buckets(config)
+        )
+
+        validate_config(config)
+
+        params = extract_config_params(config)
+
+        self._display_quality_feedback(state.weekly_blocks, params["targets"])
+
+        index = self._build_index(tasks, params)
+        simulated = replace(state, weekly_blocks=dict(state.weekly_blocks))
+        plans: list[tuple[str | Path, Plan]] = []
+        rng = random.Random()
+
+        for date, output_path in output_paths.items():
+            realized_share = self._calculate_realized_share(
+                simulated.weekly_blocks, params["targets"]
+            )
+            existing_plan = self._load_existing_plan(output_path)
+
+            blocks = self._generate_blocks(
+                tasks=tasks,
+                state=simulated,
+                params=params,
+                realized_share=realized_share,
+                date=date,
+                config=config,
+                existing_blocks=existing_plan.blocks if existing_plan else [],
+                index=index,
+                rng=rng if seed is None else random.Random(derive_seed(seed, date)),
+            )
+
+            plans.append((output_path, Plan(date=date, blocks=blocks)))
+            self._simulate_day(simulated, blocks)
+
+        with Transaction(get_transactions_dir(Path(state_path).parent)) as transaction:
+            for output_path, plan in plans:
+                self.plan_repo.save_plan(output_path, plan, transaction)
+
+        return [str(output_path) for output_path, _ in plans]
+
+    def replan(
+        self,
+        tasks_path: str | Path,
+        state_path: str | Path,
+        config_path: str | Path,
+        plan_path: str | Path,
+        seed: int | None = None,
+    ) -> list[int]:
+        """
+        Regenerate the pending blocks of an existing plan, e.g. after a log.
+
+        Done blocks are kept and every pending block is drawn again from the
+        current state, which logging has moved on. The plan is only saved if
+        some block came out different. The scored task index is cached per
+        tasks file and scoring parameters, so repeated replans in one process
+        don't reload or rescore the backlog until the tasks change.
+
+        Args:
+            tasks_path: Path to tasks JSON
+            state_path: Path to state JSON
+            config_path: Path to config YAML
+            plan_path: Path to the plan to update
+            seed: Seed for the replanned blocks' random stream
+
+        Returns:
+            Numbers of the blocks that changed (empty if the plan was kept)
+
+        Raises:
+            FileNotFoundError: If there is no plan at plan_path
+            VersionConflictException: If the plan was saved concurrently
+        """
+        if not Path(plan_path).exists():
+            raise FileNotFoundError(f"No plan found at {plan_path}")
+
+        plan = self.plan_repo.load_plan(plan_path)
+        config = self.config_repo.load_config(config_path)
+
+        validate_config(config)
+
+        params = extract_config_params(config)
+
+        if len(plan.blocks) == params["blocks_per_day"] and all(
+            block.is_completed() for block in plan.blocks
+        ):
+            return []
+
+        state = self._load_or_create_state(
+            state_path, plan.date, params["planning_buckets"]
+        )
+        realized_share = self._calculate_realized_share(
+            state.weekly_blocks, params["targets"]
+        )
+
+        blocks = self._generate_blocks(
+            tasks=None,
+            state=state,
+            params=params,
+            realized_share=realized_share,
+            date=plan.date,
+            config=config,
+            existing_blocks=plan.blocks,
+            index=self._load_index(tasks_path, params),
+            rng=random.Random(seed),
+        )
+
+        stored = {block.block: block for block in plan.blocks}
+        numbers = {block.block for block in blocks}
+        changed = [block.block for block in blocks if stored.get(block.block) != block]
+        changed += [number for number in stored if number not in numbers]
+        if not changed:
+            return []
+
+        plan.blocks = blocks
+        self.plan_repo.save_plan(plan_path, plan)
+
+        return sorted(changed)
 
-        if configured_blocks != blocks_per_day:
-            raise ValueError(
-                f"Configuration mismatch: blocks_per_day={blocks_per_day} but "
-                f"only {configured_blocks} blocks configured in block_config."
+    @staticmethod
+    def _simulate_day(state: WeeklyState, blocks: list[Block]) -> None:
+        """Advance a simulated state as if the day's planned blocks were done."""
+        for block in blocks:
+            if block.status == "done":
+                continue
+            planning_bucket = map_to_planning_bucket(
+                block.bucket, state.planning_buckets
+            )
+            state.weekly_blocks[planning_bucket] = (
+                state.weekly_blocks.get(planning_bucket, 0) + 1
             )
 
-    def _extract_config_params(self, config: dict) -> dict:
-        """Extract configuration parameters into a dictionary."""
-        return {
-            "blocks_per_day": config.get("blocks_per_day", 5),
-            "beta": config.get("beta", 0.3),
-            "gamma": config.get("gamma", 0.6),
-            "targets": config.get("targets", {}),
-            "urgent_threshold": config.get("urgent_threshold", 3.5),
-            "support_threshold": config.get("support_threshold", 4.5),
-            "support_budget": config.get("support_budget", 1),
-            "allow_support_preempt": config.get("allow_support_preempt", True),
-            "laplace": config.get("laplace", 1.5),
-            "ratio_bias_alpha": config.get("ratio_bias_alpha", 1.2),
-        }
+        for block in blocks:
+            state.advance(map_to_planning_bucket(block.bucket, state.planning_buckets))
 
     def _calculate_realized_share(
         self, weekly_blocks: dict[str, int], targets: dict[str, float]
@@ -152,19 +339,24 @@ class PlanGenerationUseCase:
 
     def _generate_blocks(
         self,
-        tasks: list[Task],
+        tasks: list[Task] | None,
         state: WeeklyState,
         params: dict,
         realized_share: dict[str, float],
         date: str,
         config: dict,
         existing_blocks: list[Block] = None,
+        index: PlanningIndex | None = None,
+        rng: random.Random | None = None,
     ) -> list[Block]:
-        """Generate blocks for the day."""
+        """Generate blocks for the day (index carries used tasks across days)."""
+        if rng is None:
+            rng = random.Random()
         blocks = []
         current_bucket = state.current_bucket
         used_support = 0
-        used_tasks: set[int] = set()
+        if index is None:
+            index = self._build_index(tasks, params)
 
         existing_blocks_map = {}
         if existing_blocks:
@@ -183,15 +375,14 @@ class PlanGenerationUseCase:
                 continue
             block = self._generate_single_block(
                 block_num=block_num,
-                tasks=tasks,
+                index=index,
                 state=state,
                 params=params,
                 realized_share=realized_share,
                 current_bucket=current_bucket,
                 used_support=used_support,
-                used_tasks=used_tasks,
-                date=date,
                 config=config,
+                rng=rng,
             )
 
             blocks.append(block)
@@ -202,76 +393,89 @@ class PlanGenerationUseCase:
 
         return blocks
 
+    @staticmethod
+    def _build_index(tasks: list[Task], params: dict) -> PlanningIndex:
+        """Score the backlog once for a planning run."""
+        return PlanningIndex(
+            tasks,
+            beta=params["beta"],
+            gamma=params["gamma"],
+            urgent_thresh=params["urgent_threshold"],
+            support_thresh=params["support_threshold"],
+            planning_buckets=params["planning_buckets"],
+        )
+
+    def _load_index(self, tasks_path: str | Path, params: dict) -> PlanningIndex:
+        """Get a fresh copy of the index, rebuilt only when the tasks change."""
+        scoring = tuple(
+            params[name]
+            for name in (
+                "beta",
+                "gamma",
+                "urgent_threshold",
+                "support_threshold",
+                "planning_buckets",
+            )
+        )
+        return self.cache.load(
+            tasks_path,
+            lambda: self._build_index(self._load_or_create_tasks(tasks_path), params),
+            PlanningIndex.copy,
+            dependencies=(get_journal_path(tasks_path),),
+            key=f"{os.path.abspath(tasks_path)}#index{scoring}",
+        )
+
     def _generate_single_block(
         self,
         block_num: int,
-        tasks: list[Task],
+        index: PlanningIndex,
         state: WeeklyState,
         params: dict,
         realized_share: dict[str, float],
         current_bucket: str,
         used_support: int,
-        used_tasks: set[int],
-        date: str,
         config: dict,
+        rng: random.Random,
     ) -> Block:
         """Generate a single block."""
         focus_block_name = get_focus_block_name(block_num, config)
 
-        available_for_preempt = [t for t in tasks if t.id not in used_tasks]
-        preempt_task = select_preempt(
-            available_for_preempt,
+        preempt_task = index.select_preempt(
             allow_support=params["allow_support_preempt"],
-            urgent_thresh=params["urgent_threshold"],
-            support_thresh=params["support_threshold"],
             support_budget=params["support_budget"],
             used_support=used_support,
-            beta=params["beta"],
-            gamma=params["gamma"],
         )
 
         if preempt_task:
             bucket = preempt_task.get_display_bucket()
             title = f"{focus_block_name}: {preempt_task.title}"
-            score = compute_score(
-                preempt_task, beta=params["beta"], gamma=params["gamma"]
-            )
-            used_tasks.add(preempt_task.id)
+            score = index.score(preempt_task)
+            index.take(preempt_task)
         else:
-            available_tasks = self._get_available_tasks(tasks, date, used_tasks)
-
-            if not available_tasks:
+            if not index.has_available():
                 bucket = "Feature"
                 title = f"{focus_block_name}: No tasks available"
                 score = 0.0
             else:
-                row = state.transitions.get(current_bucket, {}).copy()
-                for b in row:
-                    row[b] += params["laplace"]
-
-                probs = normalize(row)
-                probs = apply_ratio_bias(
-                    probs, realized_share, params["targets"], params["ratio_bias_alpha"]
-                )
-                probs = apply_focus_block_bias(
-                    probs, block_num, config, available_tasks
+                probs = self._bucket_distribution(
+                    state, current_bucket, block_num, params, realized_share, config
                 )
-                probs = normalize(probs)
-
                 buckets = list(probs.keys())
                 weights = [probs[b] for b in buckets]
-                planning_bucket = random.choices(buckets, weights=weights, k=1)[0]
+                planning_bucket = rng.choices(buckets, weights=weights, k=1)[0]
+                if planning_bucket == OTHER_BUCKETS:
+                    planning_bucket = draw_other_bucket(
+                        state.transitions.labels, probs, rng
+                    )
 
-                task, score = self._select_task_from_bucket(
-                    planning_bucket, available_tasks, params, used_tasks
-                )
+                task, score = self._select_task_from_bucket(planning_bucket, index)
 
                 if task:
                     bucket = task.get_display_bucket()
                     title = f"{focus_block_name}: {task.title}"
                 else:
                     task, score = self._select_task_with_fallback(
-                        probs, available_tasks, params, used_tasks, planning_bucket
+                        probs, index, planning_bucket, state.transitions.labels
                     )
                     if task:
                         bucket = task.get_display_bucket()
@@ -289,85 +493,121 @@ class PlanGenerationUseCase:
             status="planned",
         )
 
-    def _select_task_from_bucket(
-        self,
-        planning_bucket: str,
-        available_tasks: list[Task],
+    @staticmethod
+    def _bucket_distribution(
+        state: WeeklyState,
+        current_bucket: str,
+        block_num: int,
         params: dict,
-        used_tasks: set[int],
+        realized_share: dict[str, float],
+        config: dict,
+    ) -> dict[str, float]:
+        """
+        Next-bucket probabilities with smoothing, ratio and focus biases.
+
+        With markov_order above 1, the counts come from the longest recent
+        context with enough evidence (see ContextTrie.backoff_counts()) and
+        from the current bucket's transition row otherwise.
+        """
+        laplace = params["laplace"]
+        observed = None
+        if params["markov_order"] > 1:
+            context = state.context(params["markov_order"])[:-1] + (current_bucket,)
+            observed = state.contexts.backoff_counts(
+                context, params["markov_backoff_count"]
+            )
+
+        if isinstance(state.transitions, SparseTransitionMatrix):
+            if observed is None:
+                observed = state.transitions.observed(current_bucket)
+            block = config.get("block_config", {}).get(block_num, {})
+            biased = chain(
+                (bucket for bucket, share in params["targets"].items() if share),
+                (bucket for bucket, share in realized_share.items() if share),
+                block.get("preferred_buckets", []),
+                block.get("avoid_buckets", []),
+            )
+            row = sparse_row(state.transitions, observed, laplace, biased)
+        elif observed is not None:
+            row = {
+                b: observed.get(b, 0.0) + laplace for b in state.transitions.labels
+            }
+        else:
+            row = {
+                b: count + laplace
+                for b, count in state.transitions.get(current_bucket, {}).items()
+            }
+
+        probs = normalize(row)
+        probs = apply_ratio_bias(
+            probs, realized_share, params["targets"], params["ratio_bias_alpha"]
+        )
+        probs = apply_focus_block_bias(probs, block_num, config, [])
+        return normalize(probs)
+
+    def _select_task_from_bucket(
+        self, planning_bucket: str, index: PlanningIndex
     ) -> tuple[Task | None, float]:
         """Select highest-scoring task from bucket."""
-        bucket_tasks = [
-            t for t in available_tasks if t.get_planning_bucket() == planning_bucket
-        ]
+        task = index.best_in_bucket(planning_bucket)
 
-        if bucket_tasks:
-            scored_tasks = [
-                (t, compute_score(t, beta=params["beta"], gamma=params["gamma"]))
-                for t in bucket_tasks
-            ]
-            scored_tasks.sort(key=lambda x: x[1], reverse=True)
-            task, score = scored_tasks[0]
-            used_tasks.add(task.id)
-            return task, score
+        if task:
+            index.take(task)
+            return task, index.score(task)
 
         return None, 0.0
 
     def _select_task_with_fallback(
         self,
         bucket_probs: dict[str, float],
-        available_tasks: list[Task],
-        params: dict,
-        used_tasks: set[int],
+        index: PlanningIndex,
         exclude_bucket: str,
+        labels: list[str],
     ) -> tuple[Task | None, float]:
         """
         Select task from fallback buckets in order of probability.
 
         Tries buckets in descending probability order (excluding the one that failed),
-        selecting the highest-scoring task from each bucket.
+        selecting the highest-scoring task from each bucket. An OTHER_BUCKETS
+        outcome is expanded into the unlisted buckets of labels that have tasks.
         """
-        if not available_tasks:
+        if not index.has_available():
             return None, 0.0
 
-        sorted_buckets = sorted(
-            [(b, p) for b, p in bucket_probs.items() if b != exclude_bucket],
-            key=lambda x: x[1],
-            reverse=True,
-        )
+        candidates = [
+            (b, p)
+            for b, p in bucket_probs.items()
+            if b != exclude_bucket and b != OTHER_BUCKETS
+        ]
+        if OTHER_BUCKETS in bucket_probs:
+            share = bucket_probs[OTHER_BUCKETS] / (len(labels) - len(bucket_probs) + 1)
+            candidates += [
+                (b, share)
+                for b in index.buckets()
+                if b not in bucket_probs and b != exclude_bucket
+            ]
+
+        sorted_buckets = sorted(candidates, key=lambda x: x[1], reverse=True)
 
         for bucket, _ in sorted_buckets:
-            task, score = self._select_task_from_bucket(
-                bucket, available_tasks, params, used_tasks
-            )
+            task, score = self._select_task_from_bucket(bucket, index)
             if task:
                 return task, score
 
         return None, 0.0
 
-    def _get_available_tasks(
-        self, tasks: list[Task], date: str, used_tasks: set[int]
-    ) -> list[Task]:
-        """Get tasks available for planning on given date."""
-        return [
-            task
-            for task in tasks
-            if task.status != "done"
-            and task.id not in used_tasks
-            and task.status in ["todo", "wip", "planned"]
-        ]
-
     def _load_or_create_tasks(self, tasks_path: str | Path) -> list[Task]:
         """Load tasks or create empty task file."""
         path = Path(tasks_path)
+        task_repo = self.task_repo or create_task_repository(tasks_path)
         if path.exists():
-            return self.task_repo.load_tasks(tasks_path)
+            return task_repo.load_tasks(tasks_path)
         else:
             print(f"Creating empty tasks file at {tasks_path}")
             print(
                 "[Tip] Add your first task with: markov-dayflow task add Feature 'Your task'"
             )
-            self.task_repo.save_tasks(tasks_path, [])
+            task_repo.save_tasks(tasks_path, [])
             return []
 
     def _load_existing_plan(self, plan_path: str | Path) -> Plan | None:
@@ -380,13 +620,18 @@ class PlanGenerationUseCase:
                 return None
         return None
 
-    def _load_or_create_state(self, state_path: str | Path, date: str) -> WeeklyState:
+    def _load_or_create_state(
+        self,
+        state_path: str | Path,
+        date: str,
+        planning_buckets: tuple[str, ...] = (),
+    ) -> WeeklyState:
         """Load state or create new weekly state."""
         path = Path(state_path)
         if path.exists():
-            return self.state_repo.load_state(state_path)
+            return self.state_repo.load_state(state_path, planning_buckets)
         else:
             print(f"Creating new state at {state_path}")
-            state = WeeklyState(week_start=date)
+            state = WeeklyState(week_start=date, planning_buckets=planning_buckets)
             self.state_repo.save_state(state_path, state)
             return state
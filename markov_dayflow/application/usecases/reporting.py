@@ -8,7 +8,15 @@ from markov_dayflow.adapters.repositories import (
     PlanRepository,
     StateRepository,
 )
-from markov_dayflow.infrastructure.utils import read_jsonl
+from markov_dayflow.domain.services.planning_config import get_planning_buckets
+from markov_dayflow.infrastructure.utils import (
+    LogStore,
+    RollupCache,
+    file_fingerprint,
+)
+
+
+ROLLUP_FILENAME = ".rollup.json"
 
 
 class ReportingUseCase:
@@ -43,8 +51,9 @@ class ReportingUseCase:
         Returns:
             Dictionary with report metrics
         """
-        state = self.state_repo.load_state(state_path)
         config = self.config_repo.load_config(config_path)
+        planning_buckets = get_planning_buckets(config)
+        state = self.state_repo.load_state(state_path, planning_buckets)
 
         targets = config.get("targets", {})
         total_blocks = sum(state.weekly_blocks.values())
@@ -72,7 +81,9 @@ class ReportingUseCase:
         }
 
         if logs_dir:
-            original_buckets = self._analyze_original_buckets(Path(logs_dir))
+            original_buckets = self._analyze_original_buckets(
+                Path(logs_dir), planning_buckets
+            )
             if original_buckets:
                 report["original_buckets"] = original_buckets
 
@@ -83,40 +94,45 @@ class ReportingUseCase:
 
         return report
 
-    def _analyze_original_buckets(self, logs_dir: Path) -> dict | None:
+    def _analyze_original_buckets(
+        self, logs_dir: Path, planning_buckets: tuple[str, ...] = ()
+    ) -> dict | None:
         """Analyze original bucket names from log files."""
         if not logs_dir.exists():
             return None
 
-        log_files = [f for f in logs_dir.iterdir() if f.name.startswith("actual_")]
-        if not log_files:
+        log_store = LogStore(logs_dir)
+        log_dates = log_store.list_dates()
+        if not log_dates:
             return None
 
+        cache = RollupCache(logs_dir / ROLLUP_FILENAME)
         original_bucket_counts = {}
-        chaos_breakdown = {}
-        total_entries = 0
-
-        for log_file in log_files:
-            try:
-                logs = read_jsonl(log_file)
-                for entry in logs:
-                    original_bucket = entry.get("actual_bucket", "Unknown")
-                    original_bucket_counts[original_bucket] = (
-                        original_bucket_counts.get(original_bucket, 0) + 1
-                    )
-                    total_entries += 1
-
-                    planning_bucket = map_to_planning_bucket(original_bucket)
-                    if planning_bucket == "Chaos" and original_bucket != "Chaos":
-                        chaos_breakdown[original_bucket] = (
-                            chaos_breakdown.get(original_bucket, 0) + 1
-                        )
-            except Exception:
-                continue
 
+        for log_date in log_dates:
+            day_counts = cache.get_or_compute(
+                log_date,
+                log_store.fingerprint(log_date),
+                lambda: self._count_log_buckets(log_store, log_date),
+            )
+            for bucket, count in day_counts.items():
+                original_bucket_counts[bucket] = (
+                    original_bucket_counts.get(bucket, 0) + count
+                )
+
+        cache.save()
+
+        total_entries = sum(original_bucket_counts.values())
         if total_entries == 0:
             return None
 
+        chaos_breakdown = {
+            bucket: count
+            for bucket, count in original_bucket_counts.items()
+            if bucket != "Chaos"
+            and map_to_planning_bucket(bucket, planning_buckets) == "Chaos"
+        }
+
         original_percentages = {
             bucket: round(count / total_entries, 3)
             for bucket, count in original_bucket_counts.items()
@@ -139,6 +155,23 @@ class ReportingUseCase:
 
         return result
 
+    @staticmethod
+    def _count_log_buckets(log_store: LogStore, log_date: str) -> dict[str, int]:
+        """
+        Count one day's log entries per original bucket.
+
+        The chaos breakdown is derived from these counts at report time, so
+        cached days stay valid if the planning bucket mapping changes.
+        """
+        counts: dict[str, int] = {}
+        try:
+            for entry in log_store.read_day(log_date):
+                bucket = entry.get("actual_bucket", "Unknown")
+                counts[bucket] = counts.get(bucket, 0) + 1
+        except Exception:
+            return {}
+        return counts
+
     def _calculate_adherence(self, plans_dir: Path) -> dict | None:
         """Calculate plan adherence metrics from plan files."""
         if not plans_dir.exists():
@@ -149,22 +182,24 @@ class ReportingUseCase:
         if not plan_files:
             return None
 
+        cache = RollupCache(plans_dir / ROLLUP_FILENAME)
         total_blocks = 0
         done_blocks = 0
-        on_plan_blocks = 0
 
         for plan_file in plan_files:
-            try:
-                plan = self.plan_repo.load_plan(plan_file)
+            plan_total, plan_done = cache.get_or_compute(
+                plan_file.name,
+                file_fingerprint(plan_file),
+                lambda: self._count_plan_blocks(plan_file),
+            )
+            total_blocks += plan_total
+            done_blocks += plan_done
 
-                for block in plan.blocks:
-                    total_blocks += 1
+        cache.save()
 
-                    if block.status == "done":
-                        done_blocks += 1
-                        on_plan_blocks += 1
-            except Exception:
-                continue
+        # Every done block counts as on-plan: logging a block marks the
+        # planned block done whatever was actually worked on.
+        on_plan_blocks = done_blocks
 
         if total_blocks == 0:
             return None
@@ -175,3 +210,13 @@ class ReportingUseCase:
             "completion_rate": round(done_blocks / total_blocks, 3),
             "on_plan_rate": round(on_plan_blocks / total_blocks, 3),
         }
+
+    def _count_plan_blocks(self, plan_file: Path) -> list[int]:
+        """Count a plan's [total, done] blocks; unreadable plans count as empty."""
+        try:
+            plan = self.plan_repo.load_plan(plan_file)
+        except Exception:
+            return [0, 0]
+
+        done = sum(1 for block in plan.blocks if block.status == "done")
+        return [len(plan.blocks), done]
@@ -0,0 +1,83 @@
+"""Simulation use case - Monte Carlo weeks for tuning planner parameters."""
+
+from pathlib import Path
+from typing import Any
+
+from markov_dayflow.adapters.repositories import ConfigRepository, StateRepository
+from markov_dayflow.domain.entities import WeeklyState
+from markov_dayflow.domain.services.planning_config import (
+    extract_config_params,
+    validate_config,
+)
+from markov_dayflow.domain.services.simulation import simulate_weeks
+
+
+class SimulationUseCase:
+    """Use case for simulating how a configuration converges to its targets."""
+
+    def __init__(
+        self,
+        state_repo: StateRepository | None = None,
+        config_repo: ConfigRepository | None = None,
+    ):
+        self.state_repo = state_repo or StateRepository()
+        self.config_repo = config_repo or ConfigRepository()
+
+    def execute(
+        self,
+        state_path: str | Path,
+        config_path: str | Path,
+        simulations: int = 10_000,
+        days: int = 5,
+        tolerance: float = 0.05,
+        seed: int | None = None,
+        fresh: bool = False,
+        laplace: float | None = None,
+        alpha: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Simulate weeks with the configured (or overridden) parameters.
+
+        Args:
+            state_path: Path to state JSON (starting point unless fresh)
+            config_path: Path to config YAML
+            simulations: Number of simulated weeks
+            days: Days per week
+            tolerance: Largest per-bucket share error counted as converged
+            seed: Seed for reproducible runs
+            fresh: Start from an empty state instead of state_path
+            laplace: Override the configured Laplace smoothing
+            alpha: Override the configured ratio_bias_alpha
+
+        Returns:
+            Simulation summary (see simulate_weeks) with the 'laplace' and
+            'alpha' values used
+        """
+        config = self.config_repo.load_config(config_path)
+        validate_config(config)
+        params = extract_config_params(config)
+
+        if fresh or not Path(state_path).exists():
+            state = WeeklyState(planning_buckets=params["planning_buckets"])
+        else:
+            state = self.state_repo.load_state(state_path, params["planning_buckets"])
+
+        laplace = params["laplace"] if laplace is None else laplace
+        alpha = params["ratio_bias_alpha"] if alpha is None else alpha
+
+        result = simulate_weeks(
+            transitions=state.transitions,
+            weekly_blocks=state.weekly_blocks,
+            current_bucket=state.current_bucket,
+            targets=params["targets"],
+            block_config=config.get("block_config", {}),
+            blocks_per_day=params["blocks_per_day"],
+            days=days,
+            laplace=laplace,
+            alpha=alpha,
+            simulations=simulations,
+            tolerance=tolerance,
+            seed=seed,
+        )
+        result.update(laplace=laplace, alpha=alpha)
+        return result
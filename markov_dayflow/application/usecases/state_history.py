@@ -0,0 +1,56 @@
+"""State history use case - weekly trends from the state archive."""
+
+from pathlib import Path
+from typing import Any
+
+from markov_dayflow.adapters.repositories import StateArchiveRepository
+from markov_dayflow.infrastructure.utils import get_archive_dir
+
+
+class StateHistoryUseCase:
+    """Use case for reading bucket shares of archived weeks."""
+
+    def __init__(self, archive_repo: StateArchiveRepository | None = None):
+        self.archive_repo = archive_repo or StateArchiveRepository()
+
+    def execute(
+        self,
+        state_path: str | Path,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Summarize each archived week within [start, end].
+
+        Only weekly block counts are rebuilt from the archive, so long
+        histories scan quickly.
+
+        Args:
+            state_path: Path to state JSON (the archive sits next to it)
+            start: First week (ISO date) to include
+            end: Last week (ISO date) to include
+
+        Returns:
+            One dict per week, oldest first, with 'week', 'blocks' (total
+            logged) and 'shares' (bucket -> share of that week's blocks)
+        """
+        archive_dir = get_archive_dir(Path(state_path).parent)
+        weeks = []
+
+        for week, snapshot in self.archive_repo.scan_weeks(
+            archive_dir, start, end, fields=("weekly_blocks",)
+        ):
+            blocks = snapshot.get("weekly_blocks", {})
+            total = sum(blocks.values())
+            weeks.append(
+                {
+                    "week": week,
+                    "blocks": total,
+                    "shares": {
+                        bucket: count / total if total else 0.0
+                        for bucket, count in blocks.items()
+                    },
+                }
+            )
+
+        return weeks
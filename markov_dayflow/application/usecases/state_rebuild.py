@@ -0,0 +1,243 @@
+"""State rebuild use case - reconstructs the weekly state from the work logs."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import groupby, repeat
+from pathlib import Path
+from typing import Any
+
+from markov_dayflow.adapters.repositories import ConfigRepository, StateRepository
+from markov_dayflow.application.usecases.weekly_reset import WeeklyResetUseCase
+from markov_dayflow.domain.entities import WeeklyState
+from markov_dayflow.domain.services.decay import decay_elapsed
+from markov_dayflow.domain.services.planning_config import get_planning_buckets
+from markov_dayflow.domain.services.replay import (
+    DayReplay,
+    replay_day,
+    summarize_day,
+)
+from markov_dayflow.infrastructure.utils import LogStore, get_current_date
+
+
+def summarize_days(
+    logs_dir: str | Path,
+    dates: list[str],
+    markov_order: int = 1,
+    planning_buckets: tuple[str, ...] = (),
+) -> list[DayReplay]:
+    """
+    Read and summarize a run of days (one month, sharing its segment index).
+
+    Args:
+        logs_dir: Logs directory
+        dates: ISO dates to read
+        markov_order: Context length counted for state.contexts
+        planning_buckets: Configured extra planning buckets
+
+    Returns:
+        One DayReplay per date, in the order given
+    """
+    store = LogStore(logs_dir)
+    return [
+        summarize_day(day, store.read_day(day), markov_order, planning_buckets)
+        for day in dates
+    ]
+
+
+def week_of(day: str, anchor: str | None = None) -> str:
+    """
+    Get the start of the 7-day week containing day.
+
+    Args:
+        day: ISO date
+        anchor: ISO date of any week start (default: weeks start on Monday)
+
+    Returns:
+        ISO date
+    """
+    day_date = date.fromisoformat(day)
+    if anchor:
+        offset = (day_date - date.fromisoformat(anchor)).days % 7
+    else:
+        offset = day_date.weekday()
+    return (day_date - timedelta(days=offset)).isoformat()
+
+
+class StateRebuildUseCase:
+    """
+    Use case for rebuilding state.json by replaying every logged day.
+
+    Days are read and summarized in parallel, a month per task, then merged
+    in date order with the rules LogActualUseCase applies as work is logged
+    and WeeklyResetUseCase applies at every week boundary.
+    """
+
+    def __init__(
+        self,
+        state_repo: StateRepository | None = None,
+        config_repo: ConfigRepository | None = None,
+        workers: int | None = None,
+    ):
+        """
+        Initialize use case.
+
+        Args:
+            state_repo: State repository
+            config_repo: Configuration repository
+            workers: Worker processes (defaults to the CPU count; 1 reads
+                in-process)
+        """
+        self.state_repo = state_repo or StateRepository()
+        self.config_repo = config_repo or ConfigRepository()
+        self.workers = workers or os.cpu_count() or 1
+
+    def execute(
+        self,
+        state_path: str | Path,
+        config_path: str | Path,
+        logs_dir: str | Path,
+        week_start: str | None = None,
+        today: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Rebuild the state from the logs and save it over state_path.
+
+        Weeks are assumed to have been reset every 7 days, on the weekday of
+        week_start. A readable state.json is overwritten as a new version
+        (failing if it is saved concurrently); an unreadable one is moved
+        aside to state.json.corrupt first.
+
+        Args:
+            state_path: Path to state JSON
+            config_path: Path to config YAML
+            logs_dir: Logs directory (day files and monthly segments)
+            week_start: Start of any week (default: the stored state's
+                week_start, else a Monday)
+            today: ISO date the rebuilt state is current as of (default:
+                today); weeks up to it are started even without logs
+
+        Returns:
+            Summary with 'days', 'blocks', 'resets' (weekly resets replayed),
+            'week_start', 'workers', 'seconds' and 'corrupt_path' (None unless
+            the old state was moved)
+
+        Raises:
+            VersionConflictException: If the state was saved concurrently
+        """
+        start = time.perf_counter()
+        config = self.config_repo.load_config(config_path)
+        markov_order = config.get("markov_order", 1)
+        half_life_days = config.get("decay_half_life_days")
+        planning_buckets = get_planning_buckets(config)
+        today = today or get_current_date()
+
+        stored, corrupt_path = self._load_stored_state(
+            Path(state_path), planning_buckets
+        )
+        anchor = week_start or (stored.week_start if stored else None)
+
+        replays, workers = self._summarize(logs_dir, markov_order, planning_buckets)
+
+        state = WeeklyState(planning_buckets=planning_buckets)
+        resets = 0
+        for replay in replays:
+            state, started = self._start_weeks(
+                state, week_of(replay.day, anchor), config
+            )
+            resets += started
+            if half_life_days:
+                decay_elapsed(state, replay.day, half_life_days)
+            replay_day(state, replay, markov_order)
+
+        state, started = self._start_weeks(state, week_of(today, anchor), config)
+        resets += started
+
+        state.version = stored.version if stored else None
+        self.state_repo.save_state(state_path, state)
+
+        return {
+            "days": len(replays),
+            "blocks": sum(len(replay.buckets) for replay in replays),
+            "resets": resets,
+            "week_start": state.week_start,
+            "workers": workers,
+            "seconds": time.perf_counter() - start,
+            "corrupt_path": corrupt_path,
+        }
+
+    def _load_stored_state(
+        self, state_path: Path, planning_buckets: tuple[str, ...] = ()
+    ) -> tuple[WeeklyState | None, str | None]:
+        """Load the current state, moving it aside if it can't be read."""
+        if not state_path.exists():
+            return None, None
+
+        try:
+            return self.state_repo.load_state(state_path, planning_buckets), None
+        except (ValueError, TypeError, AttributeError):
+            corrupt_path = state_path.with_name(f"{state_path.name}.corrupt")
+            os.replace(state_path, corrupt_path)
+            return None, str(corrupt_path)
+
+    def _summarize(
+        self,
+        logs_dir: str | Path,
+        markov_order: int,
+        planning_buckets: tuple[str, ...],
+    ) -> tuple[list[DayReplay], int]:
+        """
+        Summarize every logged day, a month per worker task, in date order.
+
+        Returns:
+            (day summaries, worker processes used)
+        """
+        dates = LogStore(logs_dir).list_dates()
+        months = [list(days) for _, days in groupby(dates, key=lambda d: d[:7])]
+
+        workers = min(self.workers, len(months)) or 1
+        if workers == 1:
+            chunks = [
+                summarize_days(logs_dir, days, markov_order, planning_buckets)
+                for days in months
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = list(
+                    executor.map(
+                        summarize_days,
+                        repeat(str(logs_dir)),
+                        months,
+                        repeat(markov_order),
+                        repeat(planning_buckets),
+                    )
+                )
+
+        return [replay for chunk in chunks for replay in chunk], workers
+
+    @staticmethod
+    def _start_weeks(
+        state: WeeklyState, week: str, config: dict
+    ) -> tuple[WeeklyState, int]:
+        """
+        Reset the state once per week from its week_start up to week.
+
+        A state without a week_start (nothing replayed yet) just starts at
+        week.
+
+        Returns:
+            (state, number of weekly resets)
+        """
+        if not state.week_start:
+            state.week_start = week
+            return state, 0
+
+        resets = 0
+        while state.week_start < week:
+            next_week = date.fromisoformat(state.week_start) + timedelta(days=7)
+            state = WeeklyResetUseCase.start_week(state, next_week.isoformat(), config)
+            # Pruned as saving the reset state would
+            state.contexts.prune()
+            resets += 1
+        return state, resets
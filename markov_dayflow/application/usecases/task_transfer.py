@@ -0,0 +1,305 @@
+"""Bulk task import and export use cases."""
+
+import csv
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO
+
+from markov_dayflow.adapters.repositories import (
+    SqliteTaskRepository,
+    TaskRepository,
+    create_task_repository,
+)
+from markov_dayflow.domain.entities import Task
+from markov_dayflow.domain.value_objects.task_size import TASK_SIZE_HOURS
+from markov_dayflow.domain.value_objects.task_status import TaskStatus
+
+
+TRANSFER_FORMATS = ("csv", "jsonl")
+
+TASK_FIELDS = ("id",) + tuple(f.name for f in fields(Task) if f.name != "id")
+
+_INT_RANGES = {"urgency": (0, 5), "impact": (1, 5), "difficulty": (0, 5)}
+_DEFAULTS = {"urgency": 2, "impact": 3, "size": 2.0, "difficulty": 2}
+_STATUSES = {s.value for s in TaskStatus}
+
+
+def detect_format(path: str | Path, fmt: str | None = None) -> str:
+    """
+    Pick the transfer format from an explicit choice or the file suffix.
+
+    Args:
+        path: File path ("-" for stdin/stdout requires fmt)
+        fmt: Explicit format, "csv" or "jsonl"
+
+    Returns:
+        Format name
+
+    Raises:
+        ValueError: If the format cannot be determined
+    """
+    if fmt:
+        return fmt.lower()
+
+    suffix = Path(str(path)).suffix.lower().lstrip(".")
+    if suffix in TRANSFER_FORMATS:
+        return suffix
+    if suffix in ("json", "ndjson"):
+        return "jsonl"
+    raise ValueError(f"Cannot infer format from {path}; use --format csv|jsonl")
+
+
+def _blank(value: Any) -> bool:
+    """CSV cells are strings; treat empty cells as missing values."""
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _parse_int(record: dict[str, Any], name: str, default: int | None) -> int | None:
+    """Read an optional integer field."""
+    value = record.get(name)
+    if _blank(value):
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+
+def _parse_float(record: dict[str, Any], name: str, default: float) -> float:
+    """Read an optional float field."""
+    value = record.get(name)
+    if _blank(value):
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+
+
+def parse_task_record(record: dict[str, Any]) -> Task:
+    """
+    Validate one imported record and build a Task (without an ID).
+
+    Missing optional fields get the same defaults as 'task add'. size accepts
+    a T-shirt size (XS..XL) or hours. Any id field is ignored: imported tasks
+    are numbered after the existing ones.
+
+    Args:
+        record: Field name -> value mapping (CSV row or JSON object)
+
+    Returns:
+        Task entity
+
+    Raises:
+        ValueError: If a field is missing or invalid
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+
+    title = str(record.get("title") or "").strip()
+    bucket = str(record.get("bucket") or "").strip()
+    if not title:
+        raise ValueError("title is required")
+    if not bucket:
+        raise ValueError("bucket is required")
+
+    values: dict[str, Any] = {}
+    for name, (low, high) in _INT_RANGES.items():
+        value = _parse_int(record, name, _DEFAULTS[name])
+        if not low <= value <= high:
+            raise ValueError(f"{name} must be between {low} and {high}, got {value}")
+        values[name] = value
+
+    size = record.get("size")
+    if isinstance(size, str) and size.strip().upper() in TASK_SIZE_HOURS:
+        values["size"] = TASK_SIZE_HOURS[size.strip().upper()]
+    else:
+        values["size"] = _parse_float(record, "size", _DEFAULTS["size"])
+    if values["size"] <= 0:
+        raise ValueError(f"size must be positive, got {values['size']}")
+
+    status = str(record.get("status") or TaskStatus.TODO.value).strip().lower()
+    if status not in _STATUSES:
+        raise ValueError(f"status must be one of {sorted(_STATUSES)}, got {status!r}")
+
+    planned_date = record.get("planned_date")
+
+    return Task(
+        title=title,
+        bucket=bucket,
+        status=status,
+        planned_date=None if _blank(planned_date) else str(planned_date),
+        sla_penalty=_parse_float(record, "sla_penalty", 0.0),
+        age_days=_parse_int(record, "age_days", 0),
+        deadline_days=_parse_int(record, "deadline_days", None),
+        **values,
+    )
+
+
+def read_records(source: TextIO, fmt: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Stream records from a CSV or JSONL source.
+
+    Args:
+        source: Open text stream
+        fmt: "csv" or "jsonl"
+
+    Yields:
+        (line number, record) pairs
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(source)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {line_number}: invalid JSON ({e.msg})") from None
+        yield line_number, record
+
+
+def write_records(target: TextIO, tasks: Iterable[Task], fmt: str) -> int:
+    """
+    Stream tasks to a CSV or JSONL target.
+
+    Args:
+        target: Open text stream
+        tasks: Tasks to write
+        fmt: "csv" or "jsonl"
+
+    Returns:
+        Number of written tasks
+    """
+    count = 0
+
+    if fmt == "csv":
+        writer = csv.writer(target)
+        writer.writerow(TASK_FIELDS)
+        for task in tasks:
+            writer.writerow(
+                "" if getattr(task, name) is None else getattr(task, name)
+                for name in TASK_FIELDS
+            )
+            count += 1
+        return count
+
+    for task in tasks:
+        record = {name: getattr(task, name) for name in TASK_FIELDS}
+        target.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+class TaskImportUseCase:
+    """Use case for importing many tasks in one commit."""
+
+    def __init__(
+        self,
+        task_repo: TaskRepository | SqliteTaskRepository | None = None,
+        max_errors: int = 20,
+    ):
+        self.task_repo = task_repo
+        self.max_errors = max_errors
+
+    def execute(
+        self,
+        source: TextIO,
+        tasks_path: str | Path,
+        fmt: str,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Validate every record, then add them all with one write.
+
+        The import is all-or-nothing: if any record is invalid nothing is
+        written and the errors are reported.
+
+        Args:
+            source: Open CSV/JSONL text stream
+            tasks_path: Tasks file path
+            fmt: "csv" or "jsonl"
+            dry_run: Validate only, don't write
+
+        Returns:
+            Dictionary with 'imported' count, 'first_id'/'last_id' of the
+            added tasks (None for dry runs) and 'errors' (line-prefixed
+            messages, capped at max_errors)
+        """
+        new_tasks: list[Task] = []
+        errors: list[str] = []
+        error_count = 0
+
+        try:
+            for line_number, record in read_records(source, fmt):
+                try:
+                    new_tasks.append(parse_task_record(record))
+                except ValueError as e:
+                    error_count += 1
+                    if len(errors) < self.max_errors:
+                        errors.append(f"line {line_number}: {e}")
+        except (ValueError, csv.Error) as e:
+            error_count += 1
+            errors.append(str(e))
+
+        result: dict[str, Any] = {
+            "imported": 0,
+            "validated": len(new_tasks),
+            "first_id": None,
+            "last_id": None,
+            "errors": errors,
+            "error_count": error_count,
+        }
+
+        if error_count or dry_run or not new_tasks:
+            return result
+
+        task_repo = self.task_repo or create_task_repository(tasks_path)
+        task_repo.add_tasks(tasks_path, new_tasks)
+
+        result.update(
+            imported=len(new_tasks),
+            first_id=new_tasks[0].id,
+            last_id=new_tasks[-1].id,
+        )
+        return result
+
+
+class TaskExportUseCase:
+    """Use case for exporting tasks to CSV or JSONL."""
+
+    def __init__(self, task_repo: TaskRepository | SqliteTaskRepository | None = None):
+        self.task_repo = task_repo
+
+    def execute(
+        self,
+        target: TextIO,
+        tasks_path: str | Path,
+        fmt: str,
+        status: str | None = None,
+    ) -> int:
+        """
+        Write tasks to target.
+
+        Args:
+            target: Open text stream
+            tasks_path: Tasks file path
+            fmt: "csv" or "jsonl"
+            status: Only export tasks with this status
+
+        Returns:
+            Number of exported tasks
+        """
+        task_repo = self.task_repo or create_task_repository(tasks_path)
+
+        if status:
+            tasks = task_repo.find_by_status(tasks_path, status)
+        else:
+            tasks = task_repo.load_tasks(tasks_path)
+
+        return write_records(target, tasks, fmt)
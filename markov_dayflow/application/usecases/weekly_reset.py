@@ -1,12 +1,18 @@
 """Weekly reset use case - resets Markov state for a new week."""
 
+from dataclasses import replace
+from datetime import date, timedelta
 from pathlib import Path
 
 from markov_dayflow.domain.entities import WeeklyState
+from markov_dayflow.domain.services.decay import decay_elapsed
+from markov_dayflow.domain.services.planning_config import get_planning_buckets
 from markov_dayflow.adapters.repositories import (
     ConfigRepository,
+    StateArchiveRepository,
     StateRepository,
 )
+from markov_dayflow.infrastructure.utils import get_archive_dir
 
 
 class WeeklyResetUseCase:
@@ -16,22 +22,76 @@ class WeeklyResetUseCase:
         self,
         state_repo: StateRepository | None = None,
         config_repo: ConfigRepository | None = None,
+        archive_repo: StateArchiveRepository | None = None,
     ):
         """Initialize use case with repositories."""
         self.state_repo = state_repo or StateRepository()
         self.config_repo = config_repo or ConfigRepository()
+        self.archive_repo = archive_repo or StateArchiveRepository()
 
     def execute(self, state_path: str, config_path: str, week_start: str) -> None:
         """
         Reset weekly state.
 
-        Creates a fresh WeeklyState for the new week, preserving configuration.
+        Starts the new week with empty block counts. Transitions and
+        higher-order context counts are kept but decayed, so old patterns
+        fade instead of being forgotten at once: by decay_half_life_days up
+        to week_start when it is configured, otherwise by weekly_decay. The
+        current bucket and the buckets before it carry over.
+
+        The finished week's state is first appended to the state archive
+        (archive/ next to state.json), keyed by its week_start.
 
         Args:
             state_path: Path to state.json file
-            config_path: Path to config.yaml file (not used, kept for compatibility)
+            config_path: Path to config.yaml file
+            week_start: ISO format date for week start (YYYY-MM-DD)
+        """
+        config = self.config_repo.load_config(config_path)
+        planning_buckets = get_planning_buckets(config)
+
+        if not Path(state_path).exists():
+            self.state_repo.save_state(
+                Path(state_path),
+                WeeklyState(week_start=week_start, planning_buckets=planning_buckets),
+            )
+            return
+
+        state = self.state_repo.load_state(state_path, planning_buckets)
+        if state.week_start != week_start:
+            finished_week = state.week_start or (
+                date.fromisoformat(week_start) - timedelta(days=7)
+            ).isoformat()
+            self.archive_repo.append_week(
+                get_archive_dir(Path(state_path).parent), finished_week, state
+            )
+
+        self.state_repo.save_state(
+            Path(state_path), self.start_week(state, week_start, config)
+        )
+
+    @staticmethod
+    def start_week(state: WeeklyState, week_start: str, config: dict) -> WeeklyState:
+        """
+        Get the state a new week starts from (see execute()).
+
+        Args:
+            state: State at the end of the previous week (its counts are
+                shared with the result, not copied)
             week_start: ISO format date for week start (YYYY-MM-DD)
+            config: Configuration dictionary
+
+        Returns:
+            New week's state
         """
-        fresh_state = WeeklyState(week_start=week_start)
+        new_state = replace(state, weekly_blocks={}, week_start=week_start)
+
+        half_life_days = config.get("decay_half_life_days")
+        if half_life_days:
+            decay_elapsed(new_state, week_start, half_life_days)
+        elif state.week_start != week_start:
+            weekly_decay = config.get("weekly_decay", 0.85)
+            new_state.transitions.decay(weekly_decay)
+            new_state.contexts.decay(weekly_decay)
 
-        self.state_repo.save_state(Path(state_path), fresh_state)
+        return new_state
@@ -1,12 +1,27 @@
 """Domain layer."""
 
-from markov_dayflow.domain.entities import Block, Plan, Task, WeeklyState
-from markov_dayflow.domain.exceptions import BlockAlreadyCompletedException
+from markov_dayflow.domain.entities import (
+    Block,
+    ContextTrie,
+    Plan,
+    SparseTransitionMatrix,
+    Task,
+    TransitionMatrix,
+    WeeklyState,
+)
+from markov_dayflow.domain.exceptions import (
+    BlockAlreadyCompletedException,
+    VersionConflictException,
+)
 
 __all__ = [
     "Task",
     "Plan",
     "Block",
     "WeeklyState",
+    "TransitionMatrix",
+    "SparseTransitionMatrix",
+    "ContextTrie",
     "BlockAlreadyCompletedException",
+    "VersionConflictException",
 ]
@@ -1,8 +1,21 @@
 """Domain entities."""
 
 from markov_dayflow.domain.entities.block import Block
+from markov_dayflow.domain.entities.context_trie import ContextTrie
 from markov_dayflow.domain.entities.plan import Plan
 from markov_dayflow.domain.entities.task import Task
+from markov_dayflow.domain.entities.transition_matrix import (
+    SparseTransitionMatrix,
+    TransitionMatrix,
+)
 from markov_dayflow.domain.entities.weekly_state import WeeklyState
 
-__all__ = ["Block", "Plan", "Task", "WeeklyState"]
+__all__ = [
+    "Block",
+    "ContextTrie",
+    "Plan",
+    "Task",
+    "SparseTransitionMatrix",
+    "TransitionMatrix",
+    "WeeklyState",
+]
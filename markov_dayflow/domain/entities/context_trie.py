@@ -0,0 +1,206 @@
+"""Context trie entity for higher-order bucket transitions."""
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+# Longest context (in buckets, the current one included) the planner
+# conditions on.
+MAX_ORDER = 3
+
+# Counts that decay below this are dropped when decay is folded in.
+PRUNE_BELOW = 0.25
+
+# Scale below which decay() folds right away, as in TransitionMatrix.
+_MIN_SCALE = 1e-12
+
+
+class ContextNode:
+    """One context in the trie: next-bucket counts and longer contexts."""
+
+    __slots__ = ("counts", "total", "children")
+
+    def __init__(self) -> None:
+        self.counts: dict[str, float] = {}
+        self.total = 0.0
+        self.children: dict[str, "ContextNode"] = {}
+
+    def copy(self) -> "ContextNode":
+        """Copy the node and everything below it."""
+        node = ContextNode()
+        node.counts = dict(self.counts)
+        node.total = self.total
+        node.children = {
+            bucket: child.copy() for bucket, child in self.children.items()
+        }
+        return node
+
+
+class ContextTrie:
+    """
+    Next-bucket counts for the last few buckets, stored as a prefix trie.
+
+    Contexts are read backwards, most recent bucket first: the root's
+    children are keyed by the current bucket, theirs by the bucket before it,
+    and so on. Counts live on nodes of depth 2 and deeper; order-1 counts
+    are the transition matrix. Contexts of every order share the path of
+    their common suffix, only observed transitions are stored, and a lookup
+    costs one dict access per bucket of context.
+
+    Decay is lazy, as in TransitionMatrix: stored counts are raw and each
+    count is raw * scale. When the scale is folded in, counts that decayed
+    below PRUNE_BELOW are dropped along with contexts left empty. Each logged
+    block adds at most MAX_ORDER - 1 counts, so with decay the trie stays
+    bounded by the blocks logged over a few half-lives, however long the
+    history.
+    """
+
+    def __init__(self) -> None:
+        self._root = ContextNode()
+        self.scale = 1.0
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ContextTrie":
+        """
+        Build a trie from the nested dict stored in state.json.
+
+        Args:
+            data: Bucket -> {"next": target -> count, "before": nested dict}
+
+        Returns:
+            ContextTrie
+        """
+        trie = cls()
+
+        def build(node: ContextNode, children: Mapping[str, Any]) -> None:
+            for bucket, child_data in children.items():
+                child = node.children[bucket] = ContextNode()
+                child.counts = dict(child_data.get("next", {}))
+                child.total = sum(child.counts.values())
+                build(child, child_data.get("before", {}))
+
+        build(trie._root, data)
+        return trie
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to the nested dict stored in state.json (empty parts left out)."""
+        self._fold()
+
+        def dump(node: ContextNode) -> dict[str, Any]:
+            data: dict[str, Any] = {}
+            for bucket, child in node.children.items():
+                entry: dict[str, Any] = {}
+                if child.counts:
+                    entry["next"] = dict(child.counts)
+                if child.children:
+                    entry["before"] = dump(child)
+                data[bucket] = entry
+            return data
+
+        return dump(self._root)
+
+    def copy(self) -> "ContextTrie":
+        """Copy the trie."""
+        trie = ContextTrie.__new__(ContextTrie)
+        trie._root = self._root.copy()
+        trie.scale = self.scale
+        return trie
+
+    def __bool__(self) -> bool:
+        return bool(self._root.children)
+
+    def __len__(self) -> int:
+        """Number of stored (context, next bucket) counts."""
+        self._fold()
+
+        def size(node: ContextNode) -> int:
+            return len(node.counts) + sum(size(c) for c in node.children.values())
+
+        return size(self._root)
+
+    def __repr__(self) -> str:
+        return f"ContextTrie({self.to_dict()!r})"
+
+    def increment(
+        self, context: Sequence[str], target: str, amount: float = 1.0
+    ) -> None:
+        """
+        Count target after context and after each of its shorter suffixes.
+
+        Args:
+            context: Buckets leading up to target, oldest first (at most
+                MAX_ORDER are used; suffixes of length 1 are not stored)
+            target: Bucket that followed
+            amount: Count to add
+        """
+        raw = amount / self.scale
+        node = self._root
+        for depth, bucket in enumerate(reversed(context[-MAX_ORDER:]), 1):
+            child = node.children.get(bucket)
+            if child is None:
+                child = node.children[bucket] = ContextNode()
+            node = child
+            if depth >= 2:
+                node.counts[target] = node.counts.get(target, 0.0) + raw
+                node.total += raw
+
+    def backoff_counts(
+        self, context: Sequence[str], min_count: float = 0.0
+    ) -> dict[str, float] | None:
+        """
+        Get next-bucket counts for the longest well-observed suffix of context.
+
+        Backs off from the full context to shorter ones until one has been
+        followed by at least min_count (decayed) blocks.
+
+        Args:
+            context: Buckets leading up to now, oldest first
+            min_count: Evidence a context needs to be used
+
+        Returns:
+            Observed next-bucket counts, or None to back off to order 1
+        """
+        best = None
+        node = self._root
+        for depth, bucket in enumerate(reversed(context[-MAX_ORDER:]), 1):
+            node = node.children.get(bucket)
+            if node is None:
+                break
+            if depth >= 2:
+                if not node.counts or node.total * self.scale < min_count:
+                    break
+                best = node
+
+        if best is None:
+            return None
+        return {target: count * self.scale for target, count in best.counts.items()}
+
+    def decay(self, factor: float) -> None:
+        """Multiply every count by factor."""
+        self.scale *= factor
+        if self.scale < _MIN_SCALE:
+            self._fold()
+
+    def prune(self) -> None:
+        """Fold pending decay into the counts now, as saving the trie does."""
+        self._fold()
+
+    def _fold(self) -> None:
+        """Apply pending decay to the stored counts and prune faded ones."""
+        if self.scale == 1.0:
+            return
+        scale = self.scale
+
+        def fold(node: ContextNode) -> None:
+            node.counts = {
+                target: count * scale
+                for target, count in node.counts.items()
+                if count * scale >= PRUNE_BELOW
+            }
+            node.total = sum(node.counts.values())
+            for bucket, child in list(node.children.items()):
+                fold(child)
+                if not child.counts and not child.children:
+                    del node.children[bucket]
+
+        fold(self._root)
+        self.scale = 1.0
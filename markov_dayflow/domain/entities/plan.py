@@ -13,10 +13,13 @@ class Plan:
     Attributes:
         date: ISO date string (YYYY-MM-DD)
         blocks: List of Block entities for the day
+        version: Stored document version this plan was loaded from (None for
+            a plan that was never loaded, which overwrites whatever is stored)
     """
 
     date: str
     blocks: list[Block] = field(default_factory=list)
+    version: int | None = None
 
     def __post_init__(self) -> None:
         """Validate plan attributes."""
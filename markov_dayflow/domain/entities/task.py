@@ -1,5 +1,6 @@
 """Task entity."""
 
+from collections.abc import Collection
 from dataclasses import dataclass
 
 from markov_dayflow.domain.value_objects import TaskStatus
@@ -8,27 +9,29 @@ from markov_dayflow.domain.value_objects import TaskStatus
 STANDARD_BUCKETS = {"Feature", "Bug", "R&D", "Docs", "Review", "Support", "Urgent"}
 
 
-def map_to_planning_bucket(bucket: str) -> str:
+def map_to_planning_bucket(bucket: str, planning_buckets: Collection[str] = ()) -> str:
     """
     Map any bucket name to a planning bucket.
 
-    Standard buckets pass through unchanged.
-    Non-standard buckets (like 'meeting', 'email', 'admin') map to 'Chaos'.
+    Standard and configured buckets pass through unchanged.
+    Other buckets (like 'meeting', 'email', 'admin') map to 'Chaos'.
 
     Args:
         bucket: Original bucket name from user
+        planning_buckets: Configured extra planning buckets (the
+            configuration's planning_buckets list)
 
     Returns:
-        Planning bucket name (standard bucket or 'Chaos')
+        Planning bucket name (standard or configured bucket, or 'Chaos')
     """
-    if bucket in STANDARD_BUCKETS:
+    if bucket in STANDARD_BUCKETS or bucket in planning_buckets:
         return bucket
     return "Chaos"
 
 
-def get_all_planning_buckets() -> set[str]:
-    """Get all possible planning bucket names including Chaos."""
-    return STANDARD_BUCKETS | {"Chaos"}
+def get_all_planning_buckets(planning_buckets: Collection[str] = ()) -> set[str]:
+    """Get all possible planning bucket names including Chaos and planning_buckets."""
+    return STANDARD_BUCKETS | set(planning_buckets) | {"Chaos"}
 
 
 @dataclass
@@ -73,9 +76,9 @@ class Task:
         assert 0 <= self.difficulty <= 5
         assert self.status in [s.value for s in TaskStatus]
 
-    def get_planning_bucket(self) -> str:
-        """Get the bucket name used for planning (maps non-standard buckets to Chaos)."""
-        return map_to_planning_bucket(self.bucket)
+    def get_planning_bucket(self, planning_buckets: Collection[str] = ()) -> str:
+        """Get the bucket name used for planning (maps unknown buckets to Chaos)."""
+        return map_to_planning_bucket(self.bucket, planning_buckets)
 
     def get_display_bucket(self) -> str:
         """Get the bucket name for display (always the original bucket name)."""
@@ -0,0 +1,492 @@
+"""Transition matrix entity."""
+
+import heapq
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+
+
+# Scale below which decay() folds the scale into the counts right away, so
+# raw counts never grow towards overflow between reads.
+_MIN_SCALE = 1e-12
+
+# Largest bucket vocabulary stored as a dense matrix; see
+# create_transition_matrix().
+DENSE_MAX_BUCKETS = 64
+
+
+class TransitionRow(MutableMapping):
+    """
+    Live, mapping-style view of one source bucket's row.
+
+    Reads and writes go straight to the matrix storage; nothing is copied.
+    copy() returns a plain dict snapshot, like dict.copy().
+    """
+
+    __slots__ = ("_matrix", "_source")
+
+    def __init__(self, matrix: "TransitionMatrix", source: str):
+        self._matrix = matrix
+        self._source = source
+
+    def _values(self) -> memoryview:
+        return self._matrix.row_values(self._source)
+
+    def __getitem__(self, target: str) -> float:
+        index = self._matrix._ids.get(target)
+        if index is None:
+            raise KeyError(target)
+        return self._values()[index]
+
+    def __setitem__(self, target: str, value: float) -> None:
+        self._matrix.set(self._source, target, value)
+
+    def __delitem__(self, target: str) -> None:
+        raise TypeError("Transition rows have a fixed set of buckets")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._matrix.labels)
+
+    def __len__(self) -> int:
+        return len(self._matrix.labels)
+
+    def items(self):
+        return zip(self._matrix.labels, self._values())
+
+    def values(self):
+        return self._values().tolist()
+
+    def copy(self) -> dict[str, float]:
+        """Snapshot the row as a dict."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"TransitionRow({self._source!r}, {self.copy()!r})"
+
+
+class TransitionMatrix(Mapping):
+    """
+    Dense Markov transition counts indexed by bucket ID.
+
+    Bucket names are mapped to integer IDs once; counts live row-major in a
+    single contiguous array of doubles. The matrix reads like the
+    bucket -> bucket -> count dict it replaces (matrix[src][dst], .get(),
+    .items()), and to_dict()/from_dict() keep state.json unchanged.
+
+    Every row spans every known bucket, in the order the buckets were first
+    seen, so iteration order (and therefore seeded sampling) is stable.
+
+    Decay is lazy: the stored counts are raw, and each count is raw * scale.
+    decay() only multiplies scale and increment() adds amount / scale, so
+    both are O(1); the scale is folded into the counts (O(buckets^2)) when
+    they are next read.
+    """
+
+    def __init__(self, labels: Iterable[str] = ()):
+        """
+        Create a zero matrix over labels.
+
+        Args:
+            labels: Bucket names, in row/column order
+        """
+        self.labels: list[str] = list(dict.fromkeys(labels))
+        self._ids: dict[str, int] = {label: i for i, label in enumerate(self.labels)}
+        self._counts = array("d", bytes(8 * len(self.labels) ** 2))
+        self.scale = 1.0
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Mapping[str, float]]) -> "TransitionMatrix":
+        """
+        Build a matrix from the nested dict stored in state.json.
+
+        Buckets missing from a row count as 0.0.
+
+        Args:
+            data: Source bucket -> target bucket -> count
+
+        Returns:
+            TransitionMatrix
+        """
+        labels: dict[str, None] = {}
+        for source, row in data.items():
+            labels.update(dict.fromkeys(row))
+        labels.update(dict.fromkeys(data))
+
+        matrix = cls(labels)
+        size = len(matrix.labels)
+        ids = matrix._ids
+        counts = matrix._counts
+        for source, row in data.items():
+            start = ids[source] * size
+            for target, value in row.items():
+                counts[start + ids[target]] = value
+        return matrix
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        """Convert to the nested dict stored in state.json."""
+        self._fold()
+        size = len(self.labels)
+        counts = self._counts
+        return {
+            source: dict(zip(self.labels, counts[i * size : (i + 1) * size]))
+            for i, source in enumerate(self.labels)
+        }
+
+    def copy(self) -> "TransitionMatrix":
+        """Copy the matrix (the label mapping is copied, the array too)."""
+        matrix = TransitionMatrix.__new__(TransitionMatrix)
+        matrix.labels = list(self.labels)
+        matrix._ids = dict(self._ids)
+        matrix._counts = array("d", self._counts)
+        matrix.scale = self.scale
+        return matrix
+
+    # ------------------------------------------------------------------
+    # Mapping API
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, source: str) -> TransitionRow:
+        if source not in self._ids:
+            raise KeyError(source)
+        return TransitionRow(self, source)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.labels)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, source: object) -> bool:
+        return source in self._ids
+
+    def __repr__(self) -> str:
+        return f"TransitionMatrix({self.to_dict()!r})"
+
+    # ------------------------------------------------------------------
+    # Array operations
+    # ------------------------------------------------------------------
+
+    def row_values(self, source: str) -> memoryview:
+        """
+        Get a zero-copy view of a row's counts, in label order.
+
+        Pending decay is folded in first. The view is invalidated when a new
+        bucket is added or the matrix decays.
+
+        Args:
+            source: Source bucket
+
+        Returns:
+            memoryview of doubles
+        """
+        self._fold()
+        size = len(self.labels)
+        start = self._ids[source] * size
+        return memoryview(self._counts)[start : start + size]
+
+    def observed(self, source: str) -> dict[str, float]:
+        """Get a row's non-zero counts, in label order."""
+        if source not in self._ids:
+            return {}
+        return {target: value for target, value in self[source].items() if value}
+
+    def top(self, source: str, k: int) -> list[tuple[str, float]]:
+        """Get a row's k heaviest non-zero transitions, heaviest first."""
+        return heapq.nlargest(
+            k, self.observed(source).items(), key=lambda item: item[1]
+        )
+
+    def set(self, source: str, target: str, value: float) -> None:
+        """Set one count, adding unknown buckets."""
+        source_id = self._index(source)
+        target_id = self._index(target)
+        self._counts[source_id * len(self.labels) + target_id] = value / self.scale
+
+    def increment(self, source: str, target: str, amount: float = 1.0) -> None:
+        """Add amount to one count, adding unknown buckets."""
+        source_id = self._index(source)
+        target_id = self._index(target)
+        self._counts[source_id * len(self.labels) + target_id] += amount / self.scale
+
+    def decay(self, factor: float, laplace: float = 0.0) -> None:
+        """
+        Scale every count by factor, then add laplace to the diagonal.
+
+        The scaling is O(1); only the diagonal is touched when laplace is set.
+
+        Args:
+            factor: Decay factor
+            laplace: Smoothing added to each self-transition
+        """
+        self.scale *= factor
+        if self.scale < _MIN_SCALE:
+            self._fold()
+
+        if laplace:
+            stride = len(self.labels) + 1
+            for position in range(0, len(self._counts), stride):
+                self._counts[position] += laplace / self.scale
+
+    def _fold(self) -> None:
+        """Apply the pending scale to the stored counts."""
+        if self.scale != 1.0:
+            scale = self.scale
+            self._counts = array("d", [value * scale for value in self._counts])
+            self.scale = 1.0
+
+    def _index(self, label: str) -> int:
+        """Get a bucket's ID, growing the matrix by one row and column if new."""
+        index = self._ids.get(label)
+        if index is not None:
+            return index
+
+        size = len(self.labels)
+        grown = array("d", bytes(8 * (size + 1) ** 2))
+        for row in range(size):
+            start = row * (size + 1)
+            grown[start : start + size] = self._counts[row * size : (row + 1) * size]
+
+        self._counts = grown
+        self._ids[label] = size
+        self.labels.append(label)
+        return size
+
+
+class SparseTransitionRow(MutableMapping):
+    """
+    Live, mapping-style view of one source bucket's observed transitions.
+
+    Iterates only the targets with a stored count; any other bucket of the
+    matrix reads as 0.0.
+    """
+
+    __slots__ = ("_matrix", "_source")
+
+    def __init__(self, matrix: "SparseTransitionMatrix", source: str):
+        self._matrix = matrix
+        self._source = source
+
+    def _counts(self) -> dict[str, float]:
+        return self._matrix._rows.get(self._source, {})
+
+    def __getitem__(self, target: str) -> float:
+        if target not in self._matrix._vocabulary:
+            raise KeyError(target)
+        return self._counts().get(target, 0.0) * self._matrix.scale
+
+    def __setitem__(self, target: str, value: float) -> None:
+        self._matrix.set(self._source, target, value)
+
+    def __delitem__(self, target: str) -> None:
+        raise TypeError("Transition rows have a fixed set of buckets")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._counts())
+
+    def __len__(self) -> int:
+        return len(self._counts())
+
+    def items(self):
+        scale = self._matrix.scale
+        return [(target, value * scale) for target, value in self._counts().items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def copy(self) -> dict[str, float]:
+        """Snapshot the observed counts as a dict."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"SparseTransitionRow({self._source!r}, {self.copy()!r})"
+
+
+class SparseTransitionMatrix(Mapping):
+    """
+    Transition counts stored per observed transition, for large vocabularies.
+
+    Each row is a hash of the targets actually seen from its source, so
+    memory grows with observed transitions rather than buckets^2. labels
+    still lists the whole bucket vocabulary, and every bucket of it reads as
+    a row (possibly empty). Decay is lazy, as in TransitionMatrix, and each
+    row keeps a cache of its heaviest transitions for top().
+    """
+
+    def __init__(self, labels: Iterable[str] = ()):
+        """
+        Create an empty matrix over the labels vocabulary.
+
+        Args:
+            labels: Bucket names, in order
+        """
+        self.labels: list[str] = list(dict.fromkeys(labels))
+        self._vocabulary: set[str] = set(self.labels)
+        self._rows: dict[str, dict[str, float]] = {}
+        self._top: dict[str, list[tuple[str, float]]] = {}
+        self.scale = 1.0
+
+    @classmethod
+    def from_dict(
+        cls, data: Mapping[str, Mapping[str, float]], labels: Iterable[str] = ()
+    ) -> "SparseTransitionMatrix":
+        """
+        Build a matrix from the nested dict stored in state.json.
+
+        Zero counts are not stored.
+
+        Args:
+            data: Source bucket -> target bucket -> count
+            labels: Bucket vocabulary (buckets found in data are added)
+
+        Returns:
+            SparseTransitionMatrix
+        """
+        matrix = cls(labels)
+        for source, row in data.items():
+            matrix._add_label(source)
+            for target, value in row.items():
+                if value:
+                    matrix.set(source, target, value)
+        return matrix
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        """Convert to the nested dict stored in state.json (observed only)."""
+        self._fold()
+        return {source: dict(row) for source, row in self._rows.items() if row}
+
+    def copy(self) -> "SparseTransitionMatrix":
+        """Copy the matrix."""
+        matrix = SparseTransitionMatrix.__new__(SparseTransitionMatrix)
+        matrix.labels = list(self.labels)
+        matrix._vocabulary = set(self._vocabulary)
+        matrix._rows = {source: dict(row) for source, row in self._rows.items()}
+        matrix._top = dict(self._top)
+        matrix.scale = self.scale
+        return matrix
+
+    # ------------------------------------------------------------------
+    # Mapping API
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, source: str) -> SparseTransitionRow:
+        if source not in self._vocabulary:
+            raise KeyError(source)
+        return SparseTransitionRow(self, source)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.labels)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, source: object) -> bool:
+        return source in self._vocabulary
+
+    def __repr__(self) -> str:
+        return f"SparseTransitionMatrix({self.to_dict()!r})"
+
+    # ------------------------------------------------------------------
+    # Row operations
+    # ------------------------------------------------------------------
+
+    def observed(self, source: str) -> dict[str, float]:
+        """Get a row's non-zero counts, in the order they were first seen."""
+        return dict(self[source].items()) if source in self._vocabulary else {}
+
+    def top(self, source: str, k: int) -> list[tuple[str, float]]:
+        """
+        Get a row's k heaviest transitions, heaviest first.
+
+        The ranking is cached per row until the row is written to; decay
+        scales every count alike, so it keeps the cache.
+
+        Args:
+            source: Source bucket
+            k: Number of transitions
+
+        Returns:
+            (target, count) pairs
+        """
+        ranking = self._top.get(source)
+        if ranking is None or len(ranking) < min(k, len(self._rows.get(source, {}))):
+            row = self._rows.get(source, {})
+            ranking = heapq.nlargest(k, row.items(), key=lambda item: item[1])
+            self._top[source] = ranking
+        return [(target, value * self.scale) for target, value in ranking[:k]]
+
+    def set(self, source: str, target: str, value: float) -> None:
+        """Set one count, adding unknown buckets."""
+        self._add_label(source)
+        self._add_label(target)
+        self._rows.setdefault(source, {})[target] = value / self.scale
+        self._top.pop(source, None)
+
+    def increment(self, source: str, target: str, amount: float = 1.0) -> None:
+        """Add amount to one count, adding unknown buckets."""
+        self._add_label(source)
+        self._add_label(target)
+        row = self._rows.setdefault(source, {})
+        row[target] = row.get(target, 0.0) + amount / self.scale
+        self._top.pop(source, None)
+
+    def decay(self, factor: float, laplace: float = 0.0) -> None:
+        """
+        Scale every count by factor, then add laplace to the diagonal.
+
+        The scaling is O(1); laplace adds a diagonal entry for every bucket.
+
+        Args:
+            factor: Decay factor
+            laplace: Smoothing added to each self-transition
+        """
+        self.scale *= factor
+        if self.scale < _MIN_SCALE:
+            self._fold()
+
+        if laplace:
+            for label in self.labels:
+                self.increment(label, label, laplace)
+
+    def _fold(self) -> None:
+        """Apply the pending scale to the stored counts."""
+        if self.scale != 1.0:
+            scale = self.scale
+            for row in self._rows.values():
+                for target in row:
+                    row[target] *= scale
+            self._top.clear()
+            self.scale = 1.0
+
+    def _add_label(self, label: str) -> None:
+        """Add a bucket to the vocabulary if it is new."""
+        if label not in self._vocabulary:
+            self._vocabulary.add(label)
+            self.labels.append(label)
+
+
+def create_transition_matrix(
+    labels: Iterable[str],
+    data: Mapping[str, Mapping[str, float]] | None = None,
+) -> TransitionMatrix | SparseTransitionMatrix:
+    """
+    Create the transition store suited to a bucket vocabulary.
+
+    Vocabularies of up to DENSE_MAX_BUCKETS buckets use the dense
+    TransitionMatrix; larger ones use SparseTransitionMatrix.
+
+    Args:
+        labels: Planning bucket vocabulary
+        data: Stored counts to load (source -> target -> count)
+
+    Returns:
+        TransitionMatrix or SparseTransitionMatrix
+    """
+    labels = list(labels)
+    if len(labels) > DENSE_MAX_BUCKETS:
+        return SparseTransitionMatrix.from_dict(data or {}, labels)
+    if not data:
+        return TransitionMatrix(labels)
+
+    matrix = TransitionMatrix.from_dict(data)
+    for label in labels:
+        matrix._index(label)
+    return matrix
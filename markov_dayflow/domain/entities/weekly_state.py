@@ -2,7 +2,13 @@
 
 from dataclasses import dataclass, field
 
+from markov_dayflow.domain.entities.context_trie import MAX_ORDER, ContextTrie
 from markov_dayflow.domain.entities.task import get_all_planning_buckets
+from markov_dayflow.domain.entities.transition_matrix import (
+    SparseTransitionMatrix,
+    TransitionMatrix,
+    create_transition_matrix,
+)
 
 
 @dataclass
@@ -13,20 +19,62 @@ class WeeklyState:
     Attributes:
         current_bucket: Last bucket worked on
         weekly_blocks: Count of blocks per bucket this week
-        transitions: Markov transition matrix (bucket -> bucket -> count)
+        transitions: Markov transition matrix (bucket -> bucket -> count); a
+            nested dict is converted with create_transition_matrix(), which
+            goes sparse for large planning bucket vocabularies
         week_start: ISO date string for week start
+        decay_epoch: ISO date up to which time-based decay has been applied
+            to transitions ("" if it never was)
+        previous_buckets: Buckets worked on before current_bucket, oldest
+            first (at most MAX_ORDER - 1)
+        contexts: Higher-order transition counts (see ContextTrie); a nested
+            dict is converted with ContextTrie.from_dict()
+        version: Stored document version this state was loaded from (None for
+            a state that was never loaded, which overwrites whatever is stored)
+        planning_buckets: Configured extra planning buckets (the
+            configuration's planning_buckets list; not stored in state.json)
     """
 
     current_bucket: str = "Feature"
     weekly_blocks: dict[str, int] = field(default_factory=dict)
-    transitions: dict[str, dict[str, float]] = field(default_factory=dict)
+    transitions: TransitionMatrix | SparseTransitionMatrix = field(
+        default_factory=TransitionMatrix
+    )
     week_start: str = ""
+    decay_epoch: str = ""
+    previous_buckets: list[str] = field(default_factory=list)
+    contexts: ContextTrie = field(default_factory=ContextTrie)
+    version: int | None = None
+    planning_buckets: tuple[str, ...] = ()
 
     def __post_init__(self) -> None:
         """Initialize empty structures if needed."""
+        # Sorted so new states order buckets the same way in every process;
+        # seeded plans depend on that order.
+        buckets = sorted(get_all_planning_buckets(self.planning_buckets))
+
         if not self.weekly_blocks:
-            self.weekly_blocks = {b: 0 for b in get_all_planning_buckets()}
+            self.weekly_blocks = {b: 0 for b in buckets}
 
         if not self.transitions:
-            buckets = list(get_all_planning_buckets())
-            self.transitions = {b: {b2: 0.0 for b2 in buckets} for b in buckets}
+            self.transitions = create_transition_matrix(buckets)
+        elif not isinstance(
+            self.transitions, (TransitionMatrix, SparseTransitionMatrix)
+        ):
+            self.transitions = create_transition_matrix(buckets, self.transitions)
+
+        if not isinstance(self.contexts, ContextTrie):
+            self.contexts = ContextTrie.from_dict(self.contexts)
+
+    def context(self, order: int) -> tuple[str, ...]:
+        """Get the last order buckets worked on, oldest first."""
+        if order <= 1:
+            return (self.current_bucket,)
+        return (*self.previous_buckets[-(order - 1) :], self.current_bucket)
+
+    def advance(self, bucket: str) -> None:
+        """Move to bucket, remembering the buckets that came before."""
+        self.previous_buckets = [*self.previous_buckets, self.current_bucket][
+            -(MAX_ORDER - 1) :
+        ]
+        self.current_bucket = bucket
@@ -1,5 +1,6 @@
 """Domain exceptions for business rule violations."""
 
+from .concurrency_exceptions import VersionConflictException
 from .security_exceptions import BlockAlreadyCompletedException
 
-__all__ = ["BlockAlreadyCompletedException"]
+__all__ = ["BlockAlreadyCompletedException", "VersionConflictException"]
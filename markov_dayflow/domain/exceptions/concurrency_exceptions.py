@@ -0,0 +1,15 @@
+"""Domain exceptions for concurrent modification of persisted documents."""
+
+
+class VersionConflictException(Exception):
+    """Raised when a document changed on disk since it was loaded."""
+
+    def __init__(self, path: str, expected: int, actual: int) -> None:
+        self.path = path
+        self.expected = expected
+        self.actual = actual
+        self.message = (
+            f"{path} was modified concurrently "
+            f"(expected version {expected}, found {actual})"
+        )
+        super().__init__(self.message)
@@ -1,8 +1,20 @@
 """Decay logic for transition matrix."""
 
+from datetime import date
+
+from markov_dayflow.domain.entities import (
+    SparseTransitionMatrix,
+    TransitionMatrix,
+    WeeklyState,
+)
+
 
 def decay_transitions(
-    transitions: dict[str, dict[str, float]], decay: float = 0.9, laplace: float = 1.0
+    transitions: (
+        TransitionMatrix | SparseTransitionMatrix | dict[str, dict[str, float]]
+    ),
+    decay: float = 0.9,
+    laplace: float = 1.0,
 ) -> None:
     """
     Apply exponential decay to transition counts and add Laplace smoothing.
@@ -14,8 +26,42 @@ def decay_transitions(
         decay: Decay factor (0-1, default 0.9)
         laplace: Smoothing to add to diagonal (default 1.0)
     """
+    if isinstance(transitions, (TransitionMatrix, SparseTransitionMatrix)):
+        transitions.decay(decay, laplace)
+        return
+
     for source_bucket, row in transitions.items():
         for target_bucket in row:
             transitions[source_bucket][target_bucket] *= decay
 
         transitions[source_bucket][source_bucket] += laplace
+
+
+def decay_elapsed(state: WeeklyState, day: str, half_life_days: float) -> float:
+    """
+    Decay transition and context counts for the days since state.decay_epoch.
+
+    Counts lose half their weight every half_life_days, however many events
+    happen in between. The first call only sets the epoch, and a day before
+    the epoch (e.g. logging a past day) changes nothing.
+
+    Args:
+        state: Weekly state (transitions, contexts and decay_epoch updated in
+            place)
+        day: ISO date of the event
+        half_life_days: Days for a count to lose half its weight
+
+    Returns:
+        Decay factor applied (1.0 if none)
+    """
+    factor = 1.0
+    if state.decay_epoch:
+        elapsed = (date.fromisoformat(day) - date.fromisoformat(state.decay_epoch)).days
+        if elapsed <= 0:
+            return factor
+        factor = 0.5 ** (elapsed / half_life_days)
+        state.transitions.decay(factor)
+        state.contexts.decay(factor)
+
+    state.decay_epoch = day
+    return factor
@@ -0,0 +1,203 @@
+"""Closed-form analysis of the bucket Markov chain (requires NumPy)."""
+
+import math
+from typing import Any, Mapping
+
+from markov_dayflow.domain.entities import TransitionMatrix
+from markov_dayflow.domain.services.simulation import _normalize_rows
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def transition_probabilities(
+    transitions: TransitionMatrix,
+    buckets: list[str],
+    laplace: float = 1.5,
+) -> "np.ndarray":
+    """
+    Smoothed transition probabilities, as the planner derives them per row.
+
+    Args:
+        transitions: Transition counts
+        buckets: Bucket order of the returned matrix
+        laplace: Laplace smoothing added to every count
+
+    Returns:
+        (buckets, buckets) row-stochastic matrix
+    """
+    column = {bucket: i for i, bucket in enumerate(buckets)}
+    counts = np.zeros((len(buckets), len(buckets)))
+    for source, row in transitions.items():
+        for target, count in row.items():
+            counts[column[source], column[target]] = count
+
+    return _normalize_rows(counts + laplace)
+
+
+def ratio_biased(
+    probs: "np.ndarray",
+    realized: "np.ndarray",
+    targets: "np.ndarray",
+    alpha: float,
+) -> "np.ndarray":
+    """Apply apply_ratio_bias() to every row and renormalize."""
+    return _normalize_rows(probs * 2 ** (-alpha * (realized - targets)))
+
+
+def stationary_distribution(probs: "np.ndarray") -> tuple["np.ndarray", float]:
+    """
+    Stationary distribution of a row-stochastic matrix via its eigenvectors.
+
+    Args:
+        probs: Transition matrix
+
+    Returns:
+        (stationary distribution, modulus of the second largest eigenvalue);
+        the latter sets how fast the chain forgets where it started
+    """
+    values, vectors = np.linalg.eig(probs.T)
+    order = np.argsort(-np.abs(values))
+
+    stationary = np.abs(np.real(vectors[:, order[0]]))
+    stationary /= stationary.sum()
+
+    second = float(np.abs(values[order[1]])) if len(values) > 1 else 0.0
+    return stationary, second
+
+
+def mixing_time(
+    probs: "np.ndarray",
+    stationary: "np.ndarray",
+    epsilon: float = 0.25,
+    max_steps: int = 1000,
+) -> int | None:
+    """
+    Steps until the chain is within epsilon of stationary from any start.
+
+    Distance is total variation, checked for every starting bucket at once by
+    powering the matrix.
+
+    Args:
+        probs: Transition matrix
+        stationary: Its stationary distribution
+        epsilon: Total variation distance considered mixed
+        max_steps: Give up after this many steps
+
+    Returns:
+        Number of steps, or None if the chain did not mix within max_steps
+    """
+    power = np.eye(len(stationary))
+    for step in range(1, max_steps + 1):
+        power = power @ probs
+        if 0.5 * np.abs(power - stationary).sum(axis=1).max() <= epsilon:
+            return step
+    return None
+
+
+def equilibrium_distribution(
+    probs: "np.ndarray",
+    targets: "np.ndarray",
+    alpha: float,
+    max_iterations: int = 500,
+    tolerance: float = 1e-10,
+) -> "np.ndarray":
+    """
+    Long-run share when the ratio bias is driven by that same share.
+
+    Finds the share s such that s is stationary for the chain biased by
+    realized share s, by damped fixed-point iteration.
+
+    Args:
+        probs: Smoothed transition matrix (without ratio bias)
+        targets: Target share per bucket
+        alpha: Ratio bias strength
+        max_iterations: Iteration limit
+        tolerance: Largest change per bucket considered converged
+
+    Returns:
+        Equilibrium share per bucket
+    """
+    share, _ = stationary_distribution(probs)
+    for _ in range(max_iterations):
+        biased, _ = stationary_distribution(ratio_biased(probs, share, targets, alpha))
+        updated = 0.5 * (share + biased)
+        if np.abs(updated - share).max() < tolerance:
+            return updated
+        share = updated
+    return share
+
+
+def analyze_chain(
+    transitions: TransitionMatrix,
+    weekly_blocks: Mapping[str, int],
+    targets: Mapping[str, float],
+    laplace: float = 1.5,
+    alpha: float = 1.2,
+    blocks_per_day: int = 5,
+    epsilon: float = 0.25,
+) -> dict[str, Any]:
+    """
+    Analyze where the learned transitions steer the week, without sampling.
+
+    Three long-run bucket shares are computed: 'habit' from the smoothed
+    transitions alone, 'steering' with the ratio bias at this week's realized
+    share (what the planner pushes towards right now) and 'equilibrium',
+    where the ratio bias is fed by the long-run share itself. Focus block
+    biases vary by block and are left out.
+
+    Args:
+        transitions: Transition counts
+        weekly_blocks: This week's block counts
+        targets: Target share per bucket
+        laplace: Laplace smoothing
+        alpha: Ratio bias strength
+        blocks_per_day: Blocks per day, to express mixing time in days
+        epsilon: Total variation distance considered mixed
+
+    Returns:
+        Dictionary with 'buckets', 'targets', 'realized', the three shares
+        (bucket -> share), 'equilibrium_error' (largest gap to a target),
+        'second_eigenvalue', 'relaxation_blocks', 'mixing_blocks' and
+        'mixing_days' of the steering chain
+    """
+    if np is None:
+        raise RuntimeError("Markov analysis requires NumPy (pip install numpy)")
+
+    buckets = list(transitions.labels)
+    for bucket in list(weekly_blocks) + list(targets):
+        if bucket not in buckets:
+            buckets.append(bucket)
+
+    target_share = np.array([targets.get(b, 0.0) for b in buckets])
+    weekly = np.array([weekly_blocks.get(b, 0) for b in buckets], dtype=float)
+    realized = weekly / weekly.sum() if weekly.sum() > 0 else np.zeros_like(weekly)
+
+    probs = transition_probabilities(transitions, buckets, laplace)
+    habit, _ = stationary_distribution(probs)
+
+    steering_probs = ratio_biased(probs, realized, target_share, alpha)
+    steering, second = stationary_distribution(steering_probs)
+    mixing = mixing_time(steering_probs, steering, epsilon)
+
+    equilibrium = equilibrium_distribution(probs, target_share, alpha)
+
+    def by_bucket(values: "np.ndarray") -> dict[str, float]:
+        return dict(zip(buckets, values.tolist()))
+
+    return {
+        "buckets": buckets,
+        "targets": by_bucket(target_share),
+        "realized": by_bucket(realized),
+        "habit": by_bucket(habit),
+        "steering": by_bucket(steering),
+        "equilibrium": by_bucket(equilibrium),
+        "equilibrium_error": float(np.abs(equilibrium - target_share).max()),
+        "second_eigenvalue": second,
+        "relaxation_blocks": 1 / (1 - second) if second < 1 else math.inf,
+        "mixing_blocks": mixing,
+        "mixing_days": None if mixing is None else math.ceil(mixing / blocks_per_day),
+        "epsilon": epsilon,
+    }
@@ -0,0 +1,75 @@
+"""Validation and parameter extraction for the planning configuration."""
+
+from markov_dayflow.domain.entities.context_trie import MAX_ORDER
+
+
+def validate_config(config: dict) -> None:
+    """
+    Check that a parsed configuration is consistent.
+
+    Args:
+        config: Parsed configuration
+
+    Raises:
+        ValueError: If block_config doesn't define blocks_per_day blocks or
+            markov_order is out of range
+    """
+    blocks_per_day = config.get("blocks_per_day", 5)
+    block_config = config.get("block_config", {})
+    configured_blocks = len(block_config)
+
+    if configured_blocks != blocks_per_day:
+        raise ValueError(
+            f"Configuration mismatch: blocks_per_day={blocks_per_day} but "
+            f"only {configured_blocks} blocks configured in block_config."
+        )
+
+    markov_order = config.get("markov_order", 1)
+    if markov_order not in range(1, MAX_ORDER + 1):
+        raise ValueError(
+            f"markov_order must be between 1 and {MAX_ORDER}, got {markov_order}."
+        )
+
+
+def extract_config_params(config: dict) -> dict:
+    """
+    Extract the planning parameters, filling in defaults.
+
+    Args:
+        config: Parsed configuration
+
+    Returns:
+        Parameters keyed by their configuration names
+    """
+    return {
+        "blocks_per_day": config.get("blocks_per_day", 5),
+        "beta": config.get("beta", 0.3),
+        "gamma": config.get("gamma", 0.6),
+        "targets": config.get("targets", {}),
+        "urgent_threshold": config.get("urgent_threshold", 3.5),
+        "support_threshold": config.get("support_threshold", 4.5),
+        "support_budget": config.get("support_budget", 1),
+        "allow_support_preempt": config.get("allow_support_preempt", True),
+        "laplace": config.get("laplace", 1.5),
+        "ratio_bias_alpha": config.get("ratio_bias_alpha", 1.2),
+        "markov_order": config.get("markov_order", 1),
+        "markov_backoff_count": config.get("markov_backoff_count", 3.0),
+        "planning_buckets": get_planning_buckets(config),
+    }
+
+
+def get_planning_buckets(config: dict) -> tuple[str, ...]:
+    """
+    Get the configured extra planning buckets.
+
+    Buckets listed in planning_buckets are planned as first-class buckets
+    instead of mapping to Chaos; pass them wherever buckets are mapped (see
+    map_to_planning_bucket()) or states are built (WeeklyState).
+
+    Args:
+        config: Parsed configuration
+
+    Returns:
+        Bucket names, in configured order
+    """
+    return tuple(config.get("planning_buckets") or ())
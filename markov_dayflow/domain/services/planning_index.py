@@ -0,0 +1,163 @@
+"""Per-run index of scored tasks for block selection."""
+
+import heapq
+from collections.abc import Collection
+from typing import Optional
+
+from markov_dayflow.domain.entities import Task
+from markov_dayflow.domain.services.scoring import compute_score
+
+
+PLANNABLE_STATUSES = ("todo", "wip", "planned")
+
+# Heap entries are (-score, position, task): highest score first, and the
+# earliest task in the backlog on ties, like a stable descending sort.
+_Entry = tuple[float, int, Task]
+
+
+class PlanningIndex:
+    """
+    Scores every task once and keeps per-bucket max-heaps for a planning run.
+
+    Tasks taken for a block are recorded by ID and skipped lazily when they
+    reach the top of a heap, so each selection costs O(log n) amortized
+    instead of re-scoring and sorting the backlog.
+
+    Selections match select_preempt() and a stable descending sort by score:
+    the highest score wins and ties go to the task listed first.
+    """
+
+    def __init__(
+        self,
+        tasks: list[Task],
+        beta: float = 0.3,
+        gamma: float = 0.6,
+        urgent_thresh: float = 4.0,
+        support_thresh: float = 6.0,
+        planning_buckets: Collection[str] = (),
+    ):
+        """
+        Build the index.
+
+        Args:
+            tasks: Backlog in stored order
+            beta: Difficulty penalty factor
+            gamma: Deadline urgency bonus
+            urgent_thresh: Score threshold for urgent preemption
+            support_thresh: Score threshold for support preemption
+            planning_buckets: Configured extra planning buckets
+        """
+        self.used: set[int] = set()
+        self._scores: dict[int, float] = {}
+        self._buckets: dict[str, list[_Entry]] = {}
+        self._urgent: list[_Entry] = []
+        self._support: list[_Entry] = []
+        self._plannable_by_id: dict[int, int] = {}
+        self._available = 0
+
+        for position, task in enumerate(tasks):
+            if task.status == "done":
+                continue
+
+            score = compute_score(task, beta=beta, gamma=gamma)
+            self._scores[id(task)] = score
+            entry = (-score, position, task)
+
+            if task.bucket == "Urgent" and score >= urgent_thresh:
+                self._urgent.append(entry)
+            elif task.bucket == "Support" and score >= support_thresh:
+                self._support.append(entry)
+
+            if task.status in PLANNABLE_STATUSES:
+                planning_bucket = task.get_planning_bucket(planning_buckets)
+                self._buckets.setdefault(planning_bucket, []).append(entry)
+                self._plannable_by_id[task.id] = (
+                    self._plannable_by_id.get(task.id, 0) + 1
+                )
+                self._available += 1
+
+        for heap in (self._urgent, self._support, *self._buckets.values()):
+            heapq.heapify(heap)
+
+    def copy(self) -> "PlanningIndex":
+        """
+        Copy the index without rescoring, e.g. to reuse it across runs.
+
+        The heaps and used tasks are copied; scores and the tasks themselves
+        are shared, as neither is modified once the index is built.
+        """
+        index = PlanningIndex.__new__(PlanningIndex)
+        index.used = set(self.used)
+        index._scores = self._scores
+        index._buckets = {bucket: list(heap) for bucket, heap in self._buckets.items()}
+        index._urgent = list(self._urgent)
+        index._support = list(self._support)
+        index._plannable_by_id = self._plannable_by_id
+        index._available = self._available
+        return index
+
+    def score(self, task: Task) -> float:
+        """Get the score computed for an indexed task."""
+        return self._scores[id(task)]
+
+    def has_available(self) -> bool:
+        """Check whether any plannable task is still unused."""
+        return self._available > 0
+
+    def take(self, task: Task) -> None:
+        """Mark a task (and any task sharing its ID) as used."""
+        if task.id in self.used:
+            return
+        self.used.add(task.id)
+        self._available -= self._plannable_by_id.get(task.id, 0)
+
+    def select_preempt(
+        self,
+        allow_support: bool = True,
+        support_budget: int = 2,
+        used_support: int = 0,
+    ) -> Optional[Task]:
+        """
+        Find the task that should preempt normal planning, if any.
+
+        Equivalent to select_preempt() over the unused tasks.
+
+        Args:
+            allow_support: Whether to allow support preemption
+            support_budget: Max support preemptions
+            used_support: Number of support preemptions already used
+
+        Returns:
+            Highest-scoring preempting task or None
+        """
+        best = self._peek(self._urgent)
+
+        if allow_support and used_support < support_budget:
+            support = self._peek(self._support)
+            if support is not None and (best is None or support < best):
+                best = support
+
+        return best[2] if best is not None else None
+
+    def buckets(self) -> list[str]:
+        """Get the planning buckets that have plannable tasks (used or not)."""
+        return list(self._buckets)
+
+    def best_in_bucket(self, planning_bucket: str) -> Optional[Task]:
+        """
+        Find the highest-scoring unused plannable task in a planning bucket.
+
+        Args:
+            planning_bucket: Planning bucket name
+
+        Returns:
+            Task or None if the bucket has no unused tasks
+        """
+        entry = self._peek(self._buckets.get(planning_bucket, []))
+        return entry[2] if entry is not None else None
+
+    def _peek(self, heap: list[_Entry]) -> Optional[_Entry]:
+        """Drop used tasks from the top of heap and return the best entry."""
+        while heap and heap[0][2].id in self.used:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
@@ -0,0 +1,108 @@
+"""Replay of logged work into a weekly state, one day at a time."""
+
+from collections import Counter
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from markov_dayflow.domain.entities import WeeklyState
+from markov_dayflow.domain.entities.context_trie import MAX_ORDER
+from markov_dayflow.domain.entities.task import map_to_planning_bucket
+
+
+@dataclass
+class DayReplay:
+    """
+    A day's logged blocks, summarized so days can be read independently.
+
+    Attributes:
+        day: ISO date
+        buckets: Planning buckets worked on, in logging order
+        transitions: Counts of transitions between the day's own blocks
+        contexts: Counts of (context, next bucket) for blocks whose whole
+            context lies within the day
+    """
+
+    day: str
+    buckets: list[str] = field(default_factory=list)
+    transitions: Counter = field(default_factory=Counter)
+    contexts: Counter = field(default_factory=Counter)
+
+
+def summarize_day(
+    day: str,
+    entries: Iterable[Mapping[str, Any]],
+    markov_order: int = 1,
+    planning_buckets: Collection[str] = (),
+) -> DayReplay:
+    """
+    Summarize a day's log entries for replay_day().
+
+    Args:
+        day: ISO date
+        entries: The day's log entries, in logging order
+        markov_order: Context length counted for state.contexts (1: none)
+        planning_buckets: Configured extra planning buckets
+
+    Returns:
+        DayReplay
+    """
+    buckets = [
+        map_to_planning_bucket(entry["actual_bucket"], planning_buckets)
+        for entry in entries
+        if entry.get("actual_bucket")
+    ]
+    contexts: Counter = Counter()
+    if markov_order > 1:
+        for i in range(markov_order, len(buckets)):
+            contexts[tuple(buckets[i - markov_order : i]), buckets[i]] += 1
+
+    return DayReplay(
+        day=day,
+        buckets=buckets,
+        transitions=Counter(zip(buckets, buckets[1:])),
+        contexts=contexts,
+    )
+
+
+def replay_day(state: WeeklyState, replay: DayReplay, markov_order: int = 1) -> None:
+    """
+    Count a day's blocks into state, as logging them one by one would.
+
+    Blocks whose transitions reach back into earlier days are counted from
+    the state's current and previous buckets; the rest come from the
+    summary's counts. Contexts are pruned after the first block, where
+    logging would save the state; later blocks that day add no decay, so
+    their saves prune nothing. Decay and week boundaries are up to the caller.
+
+    Args:
+        state: State to update in place
+        replay: Summary of the day
+        markov_order: Context length counted for state.contexts (1: none)
+    """
+    buckets = replay.buckets
+    if not buckets:
+        return
+
+    for bucket, count in Counter(buckets).items():
+        state.weekly_blocks[bucket] = state.weekly_blocks.get(bucket, 0) + count
+
+    state.transitions.increment(state.current_bucket, buckets[0])
+    for (source, target), count in replay.transitions.items():
+        state.transitions.increment(source, target, count)
+
+    if markov_order > 1:
+        history = [*state.context(markov_order), *buckets]
+        offset = len(history) - len(buckets)
+        for i in range(min(markov_order, len(buckets))):
+            position = offset + i
+            state.contexts.increment(
+                history[max(0, position - markov_order) : position], buckets[i]
+            )
+            if i == 0:
+                state.contexts.prune()
+        for (context, target), count in replay.contexts.items():
+            state.contexts.increment(context, target, count)
+
+    for bucket in buckets[-MAX_ORDER:]:
+        state.advance(bucket)
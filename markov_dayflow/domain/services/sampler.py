@@ -1,6 +1,15 @@
 """Markov chain sampler for bucket selection."""
 
 import random
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import chain
+
+from markov_dayflow.domain.entities import ContextTrie, SparseTransitionMatrix
+
+
+# Outcome standing for every bucket a sparse distribution doesn't list; they
+# all share one weight, so one is drawn uniformly when it comes up.
+OTHER_BUCKETS = "\x00other"
 
 
 def normalize(d: dict[str, float]) -> dict[str, float]:
@@ -47,30 +56,85 @@ def apply_ratio_bias(
     return result
 
 
+def sparse_row(
+    transitions: SparseTransitionMatrix,
+    observed: Mapping[str, float],
+    laplace: float,
+    biased: Iterable[str] = (),
+) -> dict[str, float]:
+    """
+    Smoothed row of a sparse matrix, sized by what can tell buckets apart.
+
+    Only observed transitions (the current row's or a context's) and the
+    biased buckets (those a later bias applies to) are listed. Every other
+    bucket has weight laplace and no bias, so together they are one
+    OTHER_BUCKETS outcome; the distribution is the same as listing every
+    bucket. Resolve a drawn OTHER_BUCKETS with draw_other_bucket().
+
+    Args:
+        transitions: Transition counts
+        observed: Counts to smooth, e.g. transitions.observed(current)
+        laplace: Laplace smoothing added to every bucket
+        biased: Buckets a target, realized share or focus list applies to
+
+    Returns:
+        Unnormalized weights, possibly with an OTHER_BUCKETS entry
+    """
+    row = {bucket: count + laplace for bucket, count in observed.items()}
+    for bucket in biased:
+        if bucket in transitions and bucket not in row:
+            row[bucket] = laplace
+
+    others = len(transitions) - len(row)
+    if others:
+        row[OTHER_BUCKETS] = laplace * others
+    return row
+
+
+def draw_other_bucket(
+    labels: Sequence[str], listed: Mapping[str, float], rng: random.Random
+) -> str:
+    """Draw uniformly among the buckets a sparse distribution left out."""
+    while True:
+        bucket = labels[int(rng.random() * len(labels))]
+        if bucket not in listed:
+            return bucket
+
+
 def sample_next_bucket(
     current: str,
-    transitions: dict[str, dict[str, float]],
+    transitions: Mapping[str, Mapping[str, float]],
     realized_share: dict[str, float],
     targets: dict[str, float],
     cfg: dict,
     use_priors: bool = False,
+    rng: random.Random | None = None,
+    history: Sequence[str] = (),
+    contexts: ContextTrie | None = None,
 ) -> str:
     """
     Sample the next bucket using Markov chain with biases.
 
     Steps:
-    1. Get transition row for current bucket
+    1. Get transition row for current bucket (or, with contexts and a
+       markov_order above 1, the counts after the longest recent context
+       with markov_backoff_count blocks of evidence); a bucket with no
+       row yet starts from empty counts
     2. Apply Laplace smoothing
     3. Apply ratio bias
     4. Normalize and sample
 
     Args:
         current: Current bucket
-        transitions: Transition count matrix
+        transitions: Transition count matrix (TransitionMatrix,
+            SparseTransitionMatrix or nested dict)
         realized_share: Current weekly share
         targets: Target weekly share
         cfg: Configuration
         use_priors: Use target priors instead of transitions
+        rng: Random stream to draw from (defaults to the random module)
+        history: Buckets worked on before current, oldest first
+        contexts: Higher-order transition counts
 
     Returns:
         Next bucket name
@@ -78,13 +142,32 @@ def sample_next_bucket(
     laplace = cfg.get("laplace", 1.0)
     alpha = cfg.get("ratio_bias_alpha", 1.0)
 
+    observed = None
+    order = cfg.get("markov_order", 1)
+    if contexts is not None and order > 1 and not use_priors:
+        observed = contexts.backoff_counts(
+            (*history, current)[-order:], cfg.get("markov_backoff_count", 3.0)
+        )
+
     if use_priors:
         row = targets.copy()
+    elif isinstance(transitions, SparseTransitionMatrix):
+        if observed is None:
+            observed = transitions.observed(current)
+        biased = chain(
+            (bucket for bucket, share in targets.items() if share),
+            (bucket for bucket, share in realized_share.items() if share),
+        )
+        row = sparse_row(transitions, observed, laplace, biased)
     else:
-        row = transitions.get(current, {}).copy()
+        counts = transitions.get(current) or {bucket: 0.0 for bucket in transitions}
+        if observed is not None:
+            counts = {bucket: observed.get(bucket, 0.0) for bucket in counts}
+        row = {bucket: count + laplace for bucket, count in counts.items()}
 
-        for bucket in row:
-            row[bucket] += laplace
+    if not row:
+        # No buckets known yet: fall back to the targets.
+        row = targets.copy()
 
     probs = normalize(row)
 
@@ -95,4 +178,8 @@ def sample_next_bucket(
     buckets = list(probs.keys())
     weights = [probs[b] for b in buckets]
 
-    return random.choices(buckets, weights=weights, k=1)[0]
+    rng = rng or random
+    bucket = rng.choices(buckets, weights=weights, k=1)[0]
+    if bucket == OTHER_BUCKETS:
+        bucket = draw_other_bucket(transitions.labels, probs, rng)
+    return bucket
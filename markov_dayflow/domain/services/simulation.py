@@ -0,0 +1,210 @@
+"""Monte Carlo simulation of planned-and-logged weeks (requires NumPy)."""
+
+from typing import Any, Mapping, Optional
+
+from markov_dayflow.domain.entities import TransitionMatrix
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Multipliers used by apply_focus_block_bias().
+PREFERRED_FACTOR = 1.3
+AVOIDED_FACTOR = 0.4
+
+# Transition count cells held per batch; caps memory for large vocabularies.
+MAX_BATCH_CELLS = 2**25
+
+
+def _normalize_rows(weights: "np.ndarray") -> "np.ndarray":
+    """Row-wise normalize(): rows summing to zero become uniform."""
+    totals = weights.sum(axis=1, keepdims=True)
+    uniform = np.full_like(weights, 1.0 / weights.shape[1])
+    return np.divide(weights, totals, out=uniform, where=totals != 0)
+
+
+def focus_multipliers(
+    buckets: list[str], block_config: Mapping[int, Mapping[str, Any]], blocks: int
+) -> "np.ndarray":
+    """
+    Per-block bucket multipliers equivalent to apply_focus_block_bias().
+
+    Args:
+        buckets: Bucket order of the simulation arrays
+        block_config: Configuration's block_config section
+        blocks: Blocks per day
+
+    Returns:
+        (blocks, buckets) array of multipliers
+    """
+    factors = np.ones((blocks, len(buckets)))
+    column = {bucket: i for i, bucket in enumerate(buckets)}
+
+    for block_index in range(1, blocks + 1):
+        block = block_config.get(block_index)
+        if not block:
+            continue
+        for bucket in block.get("preferred_buckets", []):
+            if bucket in column:
+                factors[block_index - 1, column[bucket]] *= PREFERRED_FACTOR
+        for bucket in block.get("avoid_buckets", []):
+            if bucket in column:
+                factors[block_index - 1, column[bucket]] *= AVOIDED_FACTOR
+
+    return factors
+
+
+def _percentiles(values: "np.ndarray") -> dict[str, float]:
+    """Summary statistics of a 1-D sample."""
+    if values.size == 0:
+        return {"mean": None, "p05": None, "p50": None, "p90": None, "p95": None}
+    p05, p50, p90, p95 = np.percentile(values, [5, 50, 90, 95])
+    return {
+        "mean": float(values.mean()),
+        "p05": float(p05),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p95": float(p95),
+    }
+
+
+def simulate_weeks(
+    transitions: TransitionMatrix,
+    weekly_blocks: Mapping[str, int],
+    current_bucket: str,
+    targets: Mapping[str, float],
+    block_config: Mapping[int, Mapping[str, Any]],
+    blocks_per_day: int = 5,
+    days: int = 5,
+    laplace: float = 1.5,
+    alpha: float = 1.2,
+    simulations: int = 10_000,
+    tolerance: float = 0.05,
+    seed: Optional[int] = None,
+    batch_size: int = 20_000,
+) -> dict[str, Any]:
+    """
+    Simulate many weeks of planning followed by logging every block as planned.
+
+    Each day mirrors plan generation: the day's blocks are drawn from the
+    current bucket's transition row with Laplace smoothing, the ratio bias
+    towards targets (from the realized share at the start of the day) and
+    each block's focus bias. The blocks are then logged in order, updating
+    transition counts, weekly counts and the current bucket for the next day.
+    Task availability and preemption are not modelled: every draw stands.
+
+    Simulations run side by side as arrays, in batches of batch_size.
+
+    Args:
+        transitions: Starting transition counts
+        weekly_blocks: Starting weekly block counts
+        current_bucket: Starting bucket
+        targets: Target share per bucket
+        block_config: Configuration's block_config section
+        blocks_per_day: Blocks per day
+        days: Days per simulated week
+        laplace: Laplace smoothing
+        alpha: Ratio bias strength
+        simulations: Number of simulated weeks
+        tolerance: Largest per-bucket share error counted as converged
+        seed: Seed for reproducible runs
+        batch_size: Simulations held in memory at once (fewer for large
+            vocabularies, see MAX_BATCH_CELLS)
+
+    Returns:
+        Dictionary with 'buckets', 'targets', per-bucket 'realized' share
+        statistics, 'final_error' statistics (largest per-bucket share error
+        at the end of the week) and 'convergence' (share of weeks that end
+        within tolerance and how many blocks they needed to stay there)
+    """
+    if np is None:
+        raise RuntimeError("Simulation requires NumPy (pip install numpy)")
+
+    buckets = list(transitions.labels)
+    for bucket in list(weekly_blocks) + list(targets) + [current_bucket]:
+        if bucket not in buckets:
+            buckets.append(bucket)
+    column = {bucket: i for i, bucket in enumerate(buckets)}
+    size = len(buckets)
+
+    start_counts = np.zeros((size, size))
+    for source, row in transitions.items():
+        for target, count in row.items():
+            start_counts[column[source], column[target]] = count
+    start_weekly = np.array([weekly_blocks.get(b, 0) for b in buckets], dtype=float)
+    target_share = np.array([targets.get(b, 0.0) for b in buckets])
+    focus = focus_multipliers(buckets, block_config, blocks_per_day)
+    batch_size = max(1, min(batch_size, MAX_BATCH_CELLS // (size * size)))
+
+    rng = np.random.default_rng(seed)
+    steps = days * blocks_per_day
+    final_shares = []
+    final_errors = []
+    converged_at = []
+
+    for offset in range(0, simulations, batch_size):
+        count = min(batch_size, simulations - offset)
+        rows = np.arange(count)
+        counts = np.broadcast_to(start_counts, (count, size, size)).copy()
+        weekly = np.broadcast_to(start_weekly, (count, size)).copy()
+        current = np.full(count, column[current_bucket])
+        errors = np.empty((count, steps))
+
+        for day in range(days):
+            probs = _normalize_rows(counts[rows, current] + laplace)
+
+            total = weekly.sum(axis=1, keepdims=True)
+            realized = np.divide(
+                weekly, total, out=np.zeros_like(weekly), where=total > 0
+            )
+            probs = probs * 2 ** (-alpha * (realized - target_share))
+
+            draws = np.empty((count, blocks_per_day), dtype=np.intp)
+            for block in range(blocks_per_day):
+                cumulative = np.cumsum(_normalize_rows(probs * focus[block]), axis=1)
+                picks = rng.random((count, 1)) * cumulative[:, -1:]
+                draws[:, block] = np.minimum(
+                    (cumulative <= picks).sum(axis=1), size - 1
+                )
+
+            for block in range(blocks_per_day):
+                drawn = draws[:, block]
+                counts[rows, current, drawn] += 1.0
+                weekly[rows, drawn] += 1.0
+                current = drawn
+
+                share = weekly / weekly.sum(axis=1, keepdims=True)
+                step = day * blocks_per_day + block
+                errors[:, step] = np.abs(share - target_share).max(axis=1)
+
+        within = errors <= tolerance
+        # within_from[s, t]: week s stays within tolerance from step t onward.
+        within_from = np.flip(np.logical_and.accumulate(np.flip(within, 1), 1), 1)
+        first = within_from.argmax(axis=1)
+        converged = within_from[rows, first]
+
+        final_shares.append(weekly / weekly.sum(axis=1, keepdims=True))
+        final_errors.append(errors[:, -1])
+        converged_at.append(first[converged] + 1)
+
+    shares = np.concatenate(final_shares)
+    blocks_needed = np.concatenate(converged_at).astype(float)
+
+    return {
+        "simulations": simulations,
+        "days": days,
+        "blocks_per_day": blocks_per_day,
+        "tolerance": tolerance,
+        "buckets": buckets,
+        "targets": dict(zip(buckets, target_share.tolist())),
+        "realized": {
+            bucket: _percentiles(shares[:, i]) for i, bucket in enumerate(buckets)
+        },
+        "final_error": _percentiles(np.concatenate(final_errors)),
+        "convergence": {
+            "rate": blocks_needed.size / simulations if simulations else 0.0,
+            "blocks": _percentiles(blocks_needed),
+            "days": _percentiles(np.ceil(blocks_needed / blocks_per_day)),
+        },
+    }
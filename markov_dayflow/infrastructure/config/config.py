@@ -13,8 +13,11 @@ class Config:
     """Application configuration loaded from YAML."""
 
     weekly_decay: float = 0.85
+    decay_half_life_days: float | None = None
     laplace: float = 1.5
     ratio_bias_alpha: float = 1.2
+    markov_order: int = 1
+    markov_backoff_count: float = 3.0
 
     beta: float = 0.3
     gamma: float = 0.6
@@ -45,8 +48,11 @@ class Config:
 
         return cls(
             weekly_decay=data.get("weekly_decay", 0.85),
+            decay_half_life_days=data.get("decay_half_life_days"),
             laplace=data.get("laplace", 1.5),
             ratio_bias_alpha=data.get("ratio_bias_alpha", 1.2),
+            markov_order=data.get("markov_order", 1),
+            markov_backoff_count=data.get("markov_backoff_count", 3.0),
             beta=data.get("beta", 0.3),
             gamma=data.get("gamma", 0.6),
             urgent_threshold=data.get("urgent_threshold", 3.5),
@@ -1,25 +1,81 @@
 """Consolidated utility functions - re-export from utils module."""
 
 from markov_dayflow.infrastructure.utils.utils import (
+    TASK_STORAGE_BACKENDS,
+    Durability,
     PathResolver,
     append_jsonl,
+    atomic_write_bytes,
     atomic_write_json,
+    atomic_write_text,
+    dumps_json,
     ensure_directory,
+    file_lock,
     format_date,
+    fsync_directory,
+    get_archive_dir,
     get_current_date,
+    get_journal_path,
+    get_lock_path,
+    get_transactions_dir,
     parse_date,
+    parse_date_range,
     read_json,
     read_jsonl,
 )
+from markov_dayflow.infrastructure.utils.document_cache import (
+    DocumentCache,
+    document_cache,
+)
+from markov_dayflow.infrastructure.utils.log_store import LogStore
+from markov_dayflow.infrastructure.utils.rollup_cache import (
+    RollupCache,
+    file_fingerprint,
+)
+from markov_dayflow.infrastructure.utils.serializers import (
+    Serializer,
+    available_serializers,
+    decode_document,
+    get_serializer,
+)
+from markov_dayflow.infrastructure.utils.state_archive import StateArchive
+from markov_dayflow.infrastructure.utils.transaction import (
+    Transaction,
+    recover_transactions,
+)
 
 __all__ = [
+    "TASK_STORAGE_BACKENDS",
+    "DocumentCache",
+    "Durability",
+    "LogStore",
     "PathResolver",
+    "RollupCache",
+    "Serializer",
+    "StateArchive",
+    "Transaction",
     "append_jsonl",
+    "atomic_write_bytes",
     "atomic_write_json",
+    "atomic_write_text",
+    "available_serializers",
+    "decode_document",
+    "document_cache",
+    "dumps_json",
     "ensure_directory",
+    "file_fingerprint",
+    "file_lock",
+    "fsync_directory",
     "format_date",
+    "get_archive_dir",
     "get_current_date",
+    "get_journal_path",
+    "get_lock_path",
+    "get_serializer",
+    "get_transactions_dir",
     "parse_date",
+    "parse_date_range",
     "read_json",
     "read_jsonl",
+    "recover_transactions",
 ]
@@ -0,0 +1,99 @@
+"""Process-wide read-through cache for parsed documents."""
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+
+def _stat_key(path: str | Path) -> tuple[int, int, int] | None:
+    """Fingerprint a file by (inode, mtime_ns, size); None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class DocumentCache:
+    """
+    Keeps materialized documents keyed on their file fingerprint.
+
+    load() parses a file only when its (inode, mtime, size) differs from the
+    last load in this process; otherwise it returns a copy of the cached
+    value, so callers can mutate what they get back. Repositories call
+    invalidate() whenever they write a path. Atomic writes replace the inode,
+    so even a rewrite within one mtime tick is detected.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize document cache.
+
+        Args:
+            max_entries: Number of documents kept before evicting the least
+                recently used one
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[tuple, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        path: str | Path,
+        loader: Callable[[], Any],
+        copier: Callable[[Any], Any] = copy.deepcopy,
+        dependencies: Iterable[str | Path] = (),
+        key: str | None = None,
+    ) -> Any:
+        """
+        Load a document through the cache.
+
+        Args:
+            path: Document path (the cache key unless key is given)
+            loader: Callable parsing the document from disk
+            copier: Callable returning an independent copy of a cached value
+            dependencies: Other files the document is built from (e.g. a
+                journal); a change to any of them invalidates the entry
+            key: Cache key for a value derived from path (e.g. an index
+                built from it), kept apart from the parsed document itself
+
+        Returns:
+            Copy of the materialized document
+        """
+        if key is None:
+            key = os.path.abspath(path)
+        fingerprint = tuple(_stat_key(p) for p in (path, *dependencies))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return copier(entry[1])
+
+        # Fingerprint is taken before parsing: if the file changes meanwhile,
+        # the next load sees a mismatch and parses again.
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return copier(value)
+
+    def invalidate(self, path: str | Path) -> None:
+        """Forget the cached document for path."""
+        with self._lock:
+            self._entries.pop(os.path.abspath(path), None)
+
+    def clear(self) -> None:
+        """Forget all cached documents."""
+        with self._lock:
+            self._entries.clear()
+
+
+document_cache = DocumentCache()
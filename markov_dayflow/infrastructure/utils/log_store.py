@@ -0,0 +1,304 @@
+"""Segmented store for actual-work logs.
+
+Today's work is appended to one small file per day (logs/actual_{date}.jsonl).
+compact() rolls finished days into monthly segments
+(logs/segments/actual_{YYYY-MM}.jsonl) with a sidecar index
+(actual_{YYYY-MM}.idx.json) mapping each date to the byte spans and entry
+counts it occupies, so readers seek straight to the days a query needs and
+only open the segments whose month overlaps it.
+"""
+
+import os
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from markov_dayflow.infrastructure.utils.serializers import loads_json
+from markov_dayflow.infrastructure.utils.utils import (
+    atomic_write_json,
+    file_lock,
+    get_current_date,
+    read_json,
+)
+
+
+DAY_PREFIX = "actual_"
+DAY_SUFFIX = ".jsonl"
+
+
+def _parse_lines(raw: bytes) -> list[dict[str, Any]]:
+    """Decode JSONL bytes, skipping blank lines."""
+    return [loads_json(line) for line in raw.splitlines() if line.strip()]
+
+
+class LogStore:
+    """Reads and compacts daily logs and monthly log segments."""
+
+    def __init__(self, logs_dir: str | Path):
+        """
+        Initialize log store.
+
+        Args:
+            logs_dir: Directory holding actual_{date}.jsonl files
+        """
+        self.logs_dir = Path(logs_dir)
+        self.segments_dir = self.logs_dir / "segments"
+        self._indexes: dict[str, dict[str, list[dict[str, int]]]] = {}
+
+    def day_path(self, date_str: str) -> Path:
+        """Get the active (uncompacted) log file for a date."""
+        return self.logs_dir / f"{DAY_PREFIX}{date_str}{DAY_SUFFIX}"
+
+    def segment_path(self, month: str) -> Path:
+        """Get the segment file for a YYYY-MM month."""
+        return self.segments_dir / f"{DAY_PREFIX}{month}{DAY_SUFFIX}"
+
+    def index_path(self, month: str) -> Path:
+        """Get the sidecar index for a YYYY-MM month."""
+        return self.segments_dir / f"{DAY_PREFIX}{month}.idx.json"
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def day_dates(self) -> list[str]:
+        """List dates that still have an active day file."""
+        if not self.logs_dir.exists():
+            return []
+
+        return sorted(
+            f.name[len(DAY_PREFIX) : -len(DAY_SUFFIX)]
+            for f in self.logs_dir.iterdir()
+            if f.is_file()
+            and f.name.startswith(DAY_PREFIX)
+            and f.name.endswith(DAY_SUFFIX)
+        )
+
+    def months(self) -> list[str]:
+        """List months that have a segment index."""
+        if not self.segments_dir.exists():
+            return []
+
+        suffix = ".idx.json"
+        return sorted(
+            f.name[len(DAY_PREFIX) : -len(suffix)]
+            for f in self.segments_dir.iterdir()
+            if f.name.startswith(DAY_PREFIX) and f.name.endswith(suffix)
+        )
+
+    def list_dates(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> list[str]:
+        """
+        List dates with logged entries, optionally within [start, end].
+
+        Args:
+            start: First ISO date to include
+            end: Last ISO date to include
+
+        Returns:
+            Sorted ISO dates
+        """
+        dates = set(self.day_dates())
+        for month in self._months_in_range(start, end):
+            dates.update(self._load_index(month))
+
+        return sorted(d for d in dates if self._in_range(d, start, end))
+
+    def read_day(self, date_str: str) -> list[dict[str, Any]]:
+        """
+        Read all entries logged on a date, from segments and the day file.
+
+        Args:
+            date_str: ISO date string (YYYY-MM-DD)
+
+        Returns:
+            Entries in logging order
+        """
+        month = date_str[:7]
+        spans = self._load_index(month).get(date_str, [])
+        chunks = []
+
+        if spans:
+            with open(self.segment_path(month), "rb") as f:
+                for span in spans:
+                    f.seek(span["offset"])
+                    chunks.append(f.read(span["length"]))
+
+        day_path = self.day_path(date_str)
+        if day_path.exists():
+            raw = day_path.read_bytes()
+            # A crash between indexing and deleting the day file leaves the
+            # same bytes in both places; don't count them twice.
+            if not chunks or chunks[-1] != raw:
+                chunks.append(raw)
+
+        return _parse_lines(b"".join(chunks))
+
+    def fingerprint(self, date_str: str) -> list[Any]:
+        """
+        Fingerprint a date's log content without reading it.
+
+        Indexed spans never change once written, so the spans plus the day
+        file's mtime and size identify the content.
+
+        Args:
+            date_str: ISO date string (YYYY-MM-DD)
+
+        Returns:
+            JSON-serializable fingerprint
+        """
+        spans = [
+            [span["offset"], span["length"]]
+            for span in self._load_index(date_str[:7]).get(date_str, [])
+        ]
+        day_path = self.day_path(date_str)
+        if day_path.exists():
+            stat = day_path.stat()
+            return [spans, stat.st_mtime_ns, stat.st_size]
+        return [spans, None, None]
+
+    def read_range(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """
+        Iterate (date, entries) for every logged date within [start, end].
+
+        Only segments whose month overlaps the range are opened.
+
+        Args:
+            start: First ISO date to include
+            end: Last ISO date to include
+
+        Yields:
+            (date, entries) pairs in date order
+        """
+        for date_str in self.list_dates(start, end):
+            yield date_str, self.read_day(date_str)
+
+    def iter_entries(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate every log entry within [start, end] in date order."""
+        for _, entries in self.read_range(start, end):
+            yield from entries
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self, before: Optional[str] = None) -> dict[str, int]:
+        """
+        Roll day files older than before into their monthly segments.
+
+        Args:
+            before: ISO date; days strictly earlier are compacted (defaults to
+                today, so the active day keeps its own file)
+
+        Returns:
+            Statistics: compacted days, entries and touched segments
+        """
+        before = before or get_current_date()
+        stats = {"days": 0, "entries": 0, "segments": 0}
+
+        by_month: dict[str, list[str]] = {}
+        for date_str in self.day_dates():
+            if date_str < before:
+                by_month.setdefault(date_str[:7], []).append(date_str)
+
+        for month, dates in by_month.items():
+            stats["entries"] += self._compact_month(month, dates)
+            stats["days"] += len(dates)
+            stats["segments"] += 1
+
+        return stats
+
+    def _compact_month(self, month: str, dates: list[str]) -> int:
+        """
+        Append day files to the month segment, then index and delete them.
+
+        The segment and every day file stay locked from reading to deleting,
+        with the same locks Transaction takes to append to a day, so a block
+        logged meanwhile is never appended to a file about to be deleted.
+        """
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        segment_path = self.segment_path(month)
+        entries = 0
+
+        with ExitStack() as locks:
+            locks.enter_context(file_lock(segment_path))
+            day_paths = [self.day_path(date_str).resolve() for date_str in dates]
+            for day_path in day_paths:
+                locks.enter_context(file_lock(day_path))
+
+            # Reread under the lock, in case another compaction just ran.
+            self._indexes.pop(month, None)
+            index = self._load_index(month)
+            compacted = []
+
+            with open(segment_path, "ab") as segment:
+                for date_str, day_path in zip(dates, day_paths):
+                    if not day_path.exists():
+                        continue
+                    compacted.append(day_path)
+
+                    raw = day_path.read_bytes()
+                    if raw and not raw.endswith(b"\n"):
+                        raw += b"\n"
+
+                    spans = index.setdefault(date_str, [])
+                    if spans and self._span_matches(segment_path, spans[-1], raw):
+                        continue
+
+                    count = len(_parse_lines(raw))
+                    spans.append(
+                        {"offset": segment.tell(), "length": len(raw), "count": count}
+                    )
+                    segment.write(raw)
+                    entries += count
+
+                # The index must never point past what reached the disk.
+                segment.flush()
+                os.fsync(segment.fileno())
+
+            atomic_write_json(self.index_path(month), index)
+
+            for day_path in compacted:
+                day_path.unlink()
+
+        return entries
+
+    @staticmethod
+    def _span_matches(segment_path: Path, span: dict[str, int], raw: bytes) -> bool:
+        """Check whether a day file was already appended by an earlier run."""
+        if span["length"] != len(raw):
+            return False
+
+        with open(segment_path, "rb") as f:
+            f.seek(span["offset"])
+            return f.read(span["length"]) == raw
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _load_index(self, month: str) -> dict[str, list[dict[str, int]]]:
+        """Load (and memoize) a month's date -> spans index."""
+        if month not in self._indexes:
+            path = self.index_path(month)
+            self._indexes[month] = read_json(path) if path.exists() else {}
+        return self._indexes[month]
+
+    def _months_in_range(self, start: Optional[str], end: Optional[str]) -> list[str]:
+        """Months with segments that overlap [start, end]."""
+        return [
+            month
+            for month in self.months()
+            if (start is None or month >= start[:7])
+            and (end is None or month <= end[:7])
+        ]
+
+    @staticmethod
+    def _in_range(date_str: str, start: Optional[str], end: Optional[str]) -> bool:
+        """Check whether an ISO date lies within [start, end]."""
+        return (start is None or date_str >= start) and (end is None or date_str <= end)
@@ -0,0 +1,112 @@
+"""Persisted per-file aggregates invalidated by file fingerprints."""
+
+from pathlib import Path
+from typing import Any, Callable
+
+from markov_dayflow.infrastructure.utils.utils import (
+    Durability,
+    atomic_write_json,
+    read_json,
+)
+
+
+def file_fingerprint(path: str | Path) -> list[int]:
+    """
+    Fingerprint a file by modification time and size.
+
+    Args:
+        path: File to fingerprint
+
+    Returns:
+        [mtime_ns, size]
+    """
+    stat = Path(path).stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class RollupCache:
+    """
+    Aggregates keyed by source (a file or a day), stored next to the data.
+
+    Each entry remembers the fingerprint of the source it was computed from;
+    get_or_compute() only recomputes entries whose fingerprint changed, so a
+    report over N days costs O(changed days) instead of O(N). Entries whose
+    source disappeared are dropped on save(). The cache is disposable: a
+    missing, corrupt or outdated file just starts empty.
+
+    Usage:
+        cache = RollupCache(plans_dir / ".rollup.json")
+        for plan_file in plan_files:
+            counts = cache.get_or_compute(
+                plan_file.name, file_fingerprint(plan_file), lambda: ...
+            )
+        cache.save()
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str | Path):
+        """
+        Initialize rollup cache.
+
+        Args:
+            path: Cache file path
+        """
+        self.path = Path(path)
+        self._entries: dict[str, dict[str, Any]] = self._load()
+        self._seen: set[str] = set()
+        self._dirty = False
+
+    def get_or_compute(
+        self, key: str, fingerprint: Any, compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Get a cached aggregate, recomputing it if its source changed.
+
+        Args:
+            key: Source identifier (e.g. file name or date)
+            fingerprint: JSON-serializable fingerprint of the source
+            compute: Callable producing the aggregate
+
+        Returns:
+            Aggregate value
+        """
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry["fingerprint"] == fingerprint:
+            return entry["value"]
+
+        value = compute()
+        self._entries[key] = {"fingerprint": fingerprint, "value": value}
+        self._dirty = True
+        return value
+
+    def save(self) -> None:
+        """Drop entries not requested since loading and persist any changes."""
+        stale = set(self._entries) - self._seen
+        for key in stale:
+            del self._entries[key]
+
+        if not self._dirty and not stale:
+            return
+
+        atomic_write_json(
+            self.path,
+            {"version": self.VERSION, "entries": self._entries},
+            durability=Durability.NONE,
+        )
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Load entries, discarding unreadable or outdated cache files."""
+        if not self.path.exists():
+            return {}
+
+        try:
+            data = read_json(self.path)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+        return data.get("entries", {})
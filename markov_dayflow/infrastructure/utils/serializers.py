@@ -0,0 +1,186 @@
+"""Pluggable document serializers with optional accelerated codecs."""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+class Serializer(ABC):
+    """Encodes documents to bytes and decodes them back."""
+
+    name = "base"
+    binary = False
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """Encode data to bytes."""
+
+    @abstractmethod
+    def loads(self, raw: bytes) -> Any:
+        """Decode bytes produced by dumps."""
+
+
+class JsonSerializer(Serializer):
+    """Standard library JSON (compact unless an indent is given)."""
+
+    name = "json"
+
+    def __init__(self, indent: Optional[int] = None):
+        self.indent = indent
+
+    def dumps(self, data: Any) -> bytes:
+        """Encode data as UTF-8 JSON."""
+        if self.indent is None:
+            text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = json.dumps(data, indent=self.indent, ensure_ascii=False)
+        return text.encode("utf-8")
+
+    def loads(self, raw: bytes) -> Any:
+        """Decode JSON bytes."""
+        return json.loads(raw)
+
+
+class OrjsonSerializer(Serializer):
+    """orjson-backed JSON; output stays readable by JsonSerializer.
+
+    orjson only pretty-prints with two spaces, so any indent means indent=2.
+    """
+
+    name = "orjson"
+
+    def __init__(self, indent: Optional[int] = None):
+        if orjson is None:
+            raise ImportError("orjson serializer requires: pip install orjson")
+        self.options = orjson.OPT_NON_STR_KEYS
+        if indent:
+            self.options |= orjson.OPT_INDENT_2
+
+    def dumps(self, data: Any) -> bytes:
+        """Encode data as UTF-8 JSON with orjson."""
+        return orjson.dumps(data, option=self.options)
+
+    def loads(self, raw: bytes) -> Any:
+        """Decode JSON bytes with orjson."""
+        return orjson.loads(raw)
+
+
+class MsgpackSerializer(Serializer):
+    """Binary MessagePack documents."""
+
+    name = "msgpack"
+    binary = True
+
+    def __init__(self, indent: Optional[int] = None):
+        if msgpack is None:
+            raise ImportError("msgpack serializer requires: pip install msgpack")
+
+    def dumps(self, data: Any) -> bytes:
+        """Encode data as MessagePack."""
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, raw: bytes) -> Any:
+        """Decode MessagePack bytes."""
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+SERIALIZERS: dict[str, type[Serializer]] = {
+    JsonSerializer.name: JsonSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+}
+
+
+def available_serializers() -> list[str]:
+    """List serializer names whose codec is importable."""
+    names = [JsonSerializer.name]
+    if orjson is not None:
+        names.append(OrjsonSerializer.name)
+    if msgpack is not None:
+        names.append(MsgpackSerializer.name)
+    return names
+
+
+def get_serializer(
+    name: Optional[str] = None, indent: Optional[int] = None
+) -> Serializer:
+    """
+    Get a serializer by name.
+
+    Args:
+        name: "json", "orjson", "msgpack" or "auto" (orjson when installed and
+            indent is None or 2, else json). Defaults to
+            $MARKOV_DAYFLOW_SERIALIZER, then "auto".
+        indent: Indentation for JSON codecs (ignored by msgpack)
+
+    Returns:
+        Serializer instance
+
+    Raises:
+        ValueError: If name is unknown
+        ImportError: If the requested codec is not installed
+    """
+    name = name or os.environ.get("MARKOV_DAYFLOW_SERIALIZER") or "auto"
+
+    if name == "auto":
+        use_orjson = orjson is not None and indent in (None, 2)
+        name = OrjsonSerializer.name if use_orjson else JsonSerializer.name
+
+    if name not in SERIALIZERS:
+        raise ValueError(
+            f"Unknown serializer: {name}. "
+            f"Expected one of auto, {', '.join(SERIALIZERS)}"
+        )
+
+    return SERIALIZERS[name](indent=indent)
+
+
+def dumps_json_line(data: Any) -> str:
+    """Encode one compact JSON line (without newline) with the fastest codec."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False)
+
+
+def loads_json(raw: bytes | str) -> Any:
+    """Decode JSON text with the fastest available codec."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def decode_document(raw: bytes) -> Any:
+    """
+    Decode a document written by any serializer, including legacy JSON files.
+
+    JSON always starts with an ASCII byte, while MessagePack maps and arrays
+    start with a byte >= 0x80, so the first non-whitespace byte tells them
+    apart.
+
+    Args:
+        raw: File contents
+
+    Returns:
+        Decoded data
+
+    Raises:
+        ValueError: If the document is binary but msgpack is not installed
+    """
+    stripped = raw.lstrip()
+    if not stripped or stripped[0] < 0x80:
+        return loads_json(raw)
+
+    if msgpack is None:
+        raise ValueError("Binary document requires msgpack: pip install msgpack")
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)
@@ -0,0 +1,295 @@
+"""Delta-encoded archive of weekly state snapshots.
+
+Every weekly reset appends the finished week's state to archive/weeks.jsonl.
+Every KEYFRAME_INTERVAL-th record is a full snapshot (a keyframe); the others
+only hold what changed since the week before. Transition and context counts
+mostly change by the reset's decay, so a delta stores one scale factor for
+them plus the counts that don't follow it. A sidecar index (weeks.idx.json)
+lists each week's byte span, so load() decodes at most KEYFRAME_INTERVAL
+records and scan() streams a range of weeks decoding each record once.
+"""
+
+import bisect
+import copy
+import math
+from pathlib import Path
+from statistics import median_low
+from typing import Any, Iterable, Iterator, Optional
+
+from markov_dayflow.infrastructure.utils.serializers import dumps_json_line, loads_json
+from markov_dayflow.infrastructure.utils.utils import (
+    atomic_write_json,
+    ensure_directory,
+    read_json,
+)
+
+
+KEYFRAME_INTERVAL = 13
+
+# Snapshot fields whose numbers decay together; deltas scale them as a whole.
+SCALED_FIELDS = ("transitions", "contexts")
+
+# Largest error a delta may leave in a scaled count (relative, absolute);
+# the counts it does store are rounded to DIGITS significant digits.
+REL_TOLERANCE = 1e-9
+ABS_TOLERANCE = 1e-12
+DIGITS = 12
+
+_KeyPath = tuple[str, ...]
+
+
+def _flatten(snapshot: dict[str, Any]) -> dict[_KeyPath, Any]:
+    """Map each leaf's key path to its value (lists and empty dicts are leaves)."""
+    flat: dict[_KeyPath, Any] = {}
+
+    def walk(prefix: _KeyPath, node: dict[str, Any]) -> None:
+        for key, value in node.items():
+            path = (*prefix, key)
+            if isinstance(value, dict) and value:
+                walk(path, value)
+            else:
+                flat[path] = value
+
+    walk((), snapshot)
+    return flat
+
+
+def _nest(leaves: Iterable[tuple[_KeyPath, Any]]) -> dict[str, Any]:
+    """Inverse of _flatten(): build nested dicts from (path, value) pairs."""
+    root: dict[str, Any] = {}
+    for path, value in leaves:
+        node = root
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return root
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_scaled(path: _KeyPath, value: Any) -> bool:
+    return path[0] in SCALED_FIELDS and _is_number(value)
+
+
+class _Decoder:
+    """
+    Running state while decoding records in order.
+
+    Scaled counts are stored raw and read as raw * scale, so applying a
+    delta costs what it lists, not the size of the snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.flat: dict[_KeyPath, Any] = {}
+        self.scale = 1.0
+
+    def apply(self, record: dict[str, Any]) -> None:
+        """Apply a keyframe or delta record."""
+        if "snapshot" in record:
+            self.flat = _flatten(record["snapshot"])
+            self.scale = 1.0
+            return
+
+        self.scale *= record["scale"]
+        for path in _flatten(record["drop"]):
+            del self.flat[path]
+        for path, value in _flatten(record["set"]).items():
+            self.flat[path] = value / self.scale if _is_scaled(path, value) else value
+
+    def value(self, path: _KeyPath) -> Any:
+        raw = self.flat[path]
+        return raw * self.scale if _is_scaled(path, raw) else raw
+
+    def values(self) -> dict[_KeyPath, Any]:
+        """Get every decoded leaf."""
+        return {path: self.value(path) for path in self.flat}
+
+    def snapshot(self, fields: Optional[Iterable[str]] = None) -> dict[str, Any]:
+        """Rebuild the nested snapshot, optionally only some top-level fields."""
+        wanted = None if fields is None else set(fields)
+        return _nest(
+            (path, copy.copy(self.value(path)))
+            for path in self.flat
+            if wanted is None or path[0] in wanted
+        )
+
+
+def _encode_delta(
+    previous: dict[_KeyPath, Any], current: dict[_KeyPath, Any]
+) -> dict[str, Any]:
+    """
+    Encode current as a change to previous.
+
+    The scale is the most common ratio between consecutive scaled counts
+    (the week's decay); counts within tolerance of previous * scale are left
+    out. Changed and dropped leaves are stored as nested dicts, so their
+    paths share prefixes as in the snapshot.
+    """
+    ratios = [
+        value / previous[path]
+        for path, value in current.items()
+        if _is_scaled(path, value)
+        and value > 0
+        and _is_number(previous.get(path))
+        and previous[path] > 0
+    ]
+    scale = median_low(ratios) if ratios else 1.0
+
+    changed = []
+    for path, value in current.items():
+        old = previous.get(path)
+        if _is_scaled(path, value) and _is_scaled(path, old):
+            if math.isclose(
+                old * scale, value, rel_tol=REL_TOLERANCE, abs_tol=ABS_TOLERANCE
+            ):
+                continue
+        elif path in previous and type(old) is type(value) and old == value:
+            continue
+        if _is_scaled(path, value):
+            value = float(f"{value:.{DIGITS}g}")
+        changed.append((path, value))
+
+    return {
+        "scale": scale,
+        "drop": _nest((path, None) for path in previous if path not in current),
+        "set": _nest(changed),
+    }
+
+
+class StateArchive:
+    """Appends and reads weekly state snapshots (plain dicts) by week."""
+
+    def __init__(self, archive_dir: str | Path):
+        """
+        Initialize archive.
+
+        Args:
+            archive_dir: Directory holding weeks.jsonl and its index
+        """
+        self.archive_dir = Path(archive_dir)
+        self.data_path = self.archive_dir / "weeks.jsonl"
+        self.index_path = self.archive_dir / "weeks.idx.json"
+        self._index: Optional[list[dict[str, Any]]] = None
+
+    def weeks(self) -> list[str]:
+        """List archived weeks (ISO week start dates), oldest first."""
+        return [entry["week"] for entry in self._load_index()]
+
+    def append(self, week: str, snapshot: dict[str, Any]) -> bool:
+        """
+        Archive a week's snapshot.
+
+        Weeks are append-only: a week not after the last archived one is
+        skipped, so rerunning a reset doesn't archive anything twice.
+
+        Args:
+            week: ISO date the week started
+            snapshot: JSON-serializable state snapshot
+
+        Returns:
+            True if the snapshot was archived
+        """
+        index = self._load_index()
+        if index and week <= index[-1]["week"]:
+            return False
+
+        if len(index) % KEYFRAME_INTERVAL == 0:
+            record = {"week": week, "snapshot": snapshot}
+        else:
+            previous = self._decode_through(len(index) - 1)
+            record = {
+                "week": week,
+                **_encode_delta(previous.values(), _flatten(snapshot)),
+            }
+
+        raw = (dumps_json_line(record) + "\n").encode("utf-8")
+        ensure_directory(self.archive_dir)
+        with open(self.data_path, "ab") as f:
+            offset = f.tell()
+            f.write(raw)
+
+        index.append({"week": week, "offset": offset, "length": len(raw)})
+        atomic_write_json(self.index_path, index)
+        return True
+
+    def load(self, week: str) -> Optional[dict[str, Any]]:
+        """
+        Get the snapshot archived for a week.
+
+        Args:
+            week: ISO date the week started
+
+        Returns:
+            Snapshot dict, or None if the week isn't archived
+        """
+        weeks = self.weeks()
+        position = bisect.bisect_left(weeks, week)
+        if position == len(weeks) or weeks[position] != week:
+            return None
+        return self._decode_through(position).snapshot()
+
+    def scan(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """
+        Iterate (week, snapshot) for archived weeks within [start, end].
+
+        Records are decoded once each, in order, from the keyframe before
+        start; asking only for the fields a query needs (e.g. weekly_blocks)
+        skips rebuilding the rest.
+
+        Args:
+            start: First week to include
+            end: Last week to include
+            fields: Top-level snapshot fields to rebuild (default: all)
+
+        Yields:
+            (week, snapshot) pairs in week order
+        """
+        weeks = self.weeks()
+        first = 0 if start is None else bisect.bisect_left(weeks, start)
+        last = len(weeks) if end is None else bisect.bisect_right(weeks, end)
+        if first >= last:
+            return
+
+        decoder = _Decoder()
+        for position, record in self._records(self._keyframe(first), last):
+            decoder.apply(record)
+            if position >= first:
+                yield record["week"], decoder.snapshot(fields)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _load_index(self) -> list[dict[str, Any]]:
+        """Load (and memoize) the week -> byte span index."""
+        if self._index is None:
+            path = self.index_path
+            self._index = read_json(path) if path.exists() else []
+        return self._index
+
+    @staticmethod
+    def _keyframe(position: int) -> int:
+        """Position of the keyframe a record is decoded from."""
+        return position - position % KEYFRAME_INTERVAL
+
+    def _records(self, first: int, last: int) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Read records first..last-1 by their indexed spans."""
+        index = self._load_index()
+        with open(self.data_path, "rb") as f:
+            for position in range(first, last):
+                f.seek(index[position]["offset"])
+                yield position, loads_json(f.read(index[position]["length"]))
+
+    def _decode_through(self, position: int) -> _Decoder:
+        """Decode records from the keyframe up to and including position."""
+        decoder = _Decoder()
+        for _, record in self._records(self._keyframe(position), position + 1):
+            decoder.apply(record)
+        return decoder
@@ -0,0 +1,386 @@
+"""Unit of work grouping JSON writes and JSONL appends into one commit."""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Optional
+
+from markov_dayflow.infrastructure.utils.serializers import dumps_json_line
+from markov_dayflow.infrastructure.utils.utils import (
+    Durability,
+    dumps_json,
+    ensure_directory,
+    file_lock,
+    fsync_directory,
+)
+
+
+def _fsync(f: IO) -> None:
+    """Flush an open file's contents to stable storage."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _digest(path: Path) -> Optional[str]:
+    """Fingerprint a file's contents (None if it doesn't exist)."""
+    try:
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _truncate_append(path: Path, offset: int, length: int) -> None:
+    """Remove an uncommitted append of length bytes made at offset."""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return
+    # Anything beyond the append isn't ours to remove.
+    if offset < size <= offset + length:
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+
+
+class Transaction:
+    """
+    Stages writes to several files and commits them together.
+
+    Commit protocol, with every target file locked throughout:
+    1. An intent file listing the operations is written under its own lock.
+       Full writes are staged as temporary files next to their targets and
+       JSONL lines are appended to their targets at a recorded offset, so
+       each byte is written once and the intent only references them.
+    2. Each file written in step 1 is fsynced, then the intent is
+       atomically renamed from .json.tmp to .json. That rename is the commit
+       point.
+    3. The staged files are renamed over their targets and the intent is
+       removed.
+
+    The durability level controls the flushing: NONE skips it (still atomic
+    against process crashes), FILE fsyncs the files written before the
+    commit point, and DIRECTORY also fsyncs the directories whose entries
+    were renamed.
+
+    A commit that dies is resolved by recover_transactions(): after the
+    commit point its remaining renames are replayed, before it its staged
+    files and appends are removed. Commits first resolve dead intents that
+    touch their files, so they never build on a half-applied transaction.
+
+    Guards registered with guard() run under the target locks right before
+    step 1, so an optimistic version check and the writes it protects happen
+    atomically. A failing guard discards the transaction and propagates its
+    exception.
+
+    Usage:
+        with Transaction(path_resolver.transactions_dir) as tx:
+            tx.write_json(state_path, state_data)
+            tx.append_jsonl(log_path, entry)
+    """
+
+    def __init__(
+        self,
+        transactions_dir: str | Path,
+        durability: Durability | str = Durability.FILE,
+    ):
+        """
+        Initialize transaction.
+
+        Args:
+            transactions_dir: Directory for intent files
+            durability: How far commits go to reach stable storage
+        """
+        self.transactions_dir = Path(transactions_dir)
+        self.durability = Durability(durability)
+        self._writes: dict[Path, bytes] = {}
+        self._appends: dict[Path, list[str]] = {}
+        self._guards: dict[Path, list[Callable[[], None]]] = {}
+
+    def write_json(
+        self, path: str | Path, data: Any, indent: int | None = None
+    ) -> None:
+        """
+        Stage a full JSON file write.
+
+        Args:
+            path: Target file path
+            data: Data to serialize as JSON
+            indent: JSON indentation level (None writes compact JSON)
+        """
+        self.write_bytes(path, dumps_json(data, indent).encode("utf-8"))
+
+    def write_bytes(self, path: str | Path, content: bytes) -> None:
+        """
+        Stage a full file write of already-serialized content.
+
+        Args:
+            path: Target file path
+            content: File contents
+        """
+        self._writes[Path(path).resolve()] = content
+
+    def append_jsonl(self, path: str | Path, data: dict[str, Any]) -> None:
+        """
+        Stage a JSON line append.
+
+        Args:
+            path: Target JSONL file path
+            data: Dictionary to append as JSON line
+        """
+        line = dumps_json_line(data) + "\n"
+        self._appends.setdefault(Path(path).resolve(), []).append(line)
+
+    def guard(self, path: str | Path, check: Callable[[], None]) -> None:
+        """
+        Register a precondition checked under path's lock at commit time.
+
+        Args:
+            path: Document the check reads (its lock is held during commit)
+            check: Callable raising an exception if the commit must not happen
+        """
+        self._guards.setdefault(Path(path).resolve(), []).append(check)
+
+    def commit(self) -> None:
+        """Check guards, then durably record and apply all staged operations."""
+        if not self._writes and not self._appends:
+            return
+
+        targets = sorted({*self._guards, *self._writes, *self._appends})
+        while True:
+            with ExitStack() as locks:
+                # Sorted acquisition keeps concurrent transactions deadlock-free.
+                for path in targets:
+                    locks.enter_context(file_lock(path))
+
+                # Live commits hold their targets' locks, so an intent naming
+                # one of ours belongs to a commit that died.
+                if not _intents_touching(self.transactions_dir, targets):
+                    try:
+                        for checks in self._guards.values():
+                            for check in checks:
+                                check()
+                    except Exception:
+                        self.rollback()
+                        raise
+
+                    self._commit_operations()
+                    return
+
+            recover_transactions(self.transactions_dir)
+
+    def _commit_operations(self) -> None:
+        """Write the intent, stage and flush, commit, apply and clean up."""
+        tx_id = f"tx-{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        intent_path = self.transactions_dir / f"{tx_id}.json"
+        pending_path = intent_path.with_suffix(".json.tmp")
+
+        operations = [
+            {
+                "op": "write",
+                "path": str(path),
+                "staged": str(path.with_name(f"{path.name}.{tx_id}.tmp")),
+                "pre_image": _digest(path),
+            }
+            for path in self._writes
+        ]
+        appends = {
+            path: "".join(lines).encode("utf-8")
+            for path, lines in self._appends.items()
+        }
+        for path, content in appends.items():
+            operations.append(
+                {
+                    "op": "append",
+                    "path": str(path),
+                    "offset": path.stat().st_size if path.exists() else 0,
+                    "length": len(content),
+                }
+            )
+
+        self.transactions_dir.mkdir(parents=True, exist_ok=True)
+        # The intent lock is taken before the intent exists and held until it
+        # is gone, so recovery never mistakes a running commit for a dead one.
+        sync = self.durability != Durability.NONE
+        with file_lock(intent_path):
+            with open(pending_path, "w", encoding="utf-8") as f:
+                json.dump({"operations": operations}, f, ensure_ascii=False)
+                if sync:
+                    _fsync(f)
+
+            try:
+                for operation in operations:
+                    path = Path(operation["path"])
+                    ensure_directory(path.parent)
+                    if operation["op"] == "write":
+                        with open(operation["staged"], "xb") as f:
+                            f.write(self._writes[path])
+                            if sync:
+                                _fsync(f)
+                    else:
+                        with open(path, "ab") as f:
+                            f.write(appends[path])
+                            if sync:
+                                _fsync(f)
+
+                os.replace(pending_path, intent_path)
+            except BaseException:
+                _undo(operations)
+                pending_path.unlink(missing_ok=True)
+                raise
+
+            if self.durability == Durability.DIRECTORY:
+                fsync_directory(self.transactions_dir)
+
+            # The locks held since the intent was written guarantee the targets
+            # still hold their pre-images.
+            _apply(operations, verify=False)
+
+            if self.durability == Durability.DIRECTORY:
+                touched = {Path(operation["path"]).parent for operation in operations}
+                for directory in touched:
+                    fsync_directory(directory)
+
+            intent_path.unlink()
+
+        self.rollback()
+
+    def rollback(self) -> None:
+        """Discard all staged operations."""
+        self._writes.clear()
+        self._appends.clear()
+        self._guards.clear()
+
+    def __enter__(self) -> "Transaction":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+def _apply(operations: list[dict[str, Any]], verify: bool = True) -> None:
+    """
+    Move a committed intent's staged files over their targets.
+
+    A write whose staged file is gone was already applied. When verifying,
+    one whose target no longer holds the content it replaced lost to a newer
+    commit, and its staged file is dropped instead.
+    """
+    for operation in operations:
+        if operation["op"] != "write":
+            continue
+        staged = Path(operation["staged"])
+        if not staged.exists():
+            continue
+        path = Path(operation["path"])
+        if not verify or _digest(path) == operation["pre_image"]:
+            os.replace(staged, path)
+        else:
+            staged.unlink()
+
+
+def _undo(operations: list[dict[str, Any]]) -> None:
+    """Remove what an uncommitted intent's operations wrote."""
+    for operation in operations:
+        if operation["op"] == "write":
+            Path(operation["staged"]).unlink(missing_ok=True)
+        else:
+            _truncate_append(
+                Path(operation["path"]), operation["offset"], operation["length"]
+            )
+
+
+def _read_intent(intent_path: Path) -> Optional[list[dict[str, Any]]]:
+    """
+    Read an intent's operations.
+
+    Returns:
+        Operations, or None if the intent is gone or was never fully written
+        (a commit dies writing it before touching any target)
+    """
+    try:
+        with open(intent_path, "r", encoding="utf-8") as f:
+            return json.load(f)["operations"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def _intent_paths(directory: Path) -> list[Path]:
+    """Committed (.json) paths of committed and pending intents, oldest first."""
+    if not directory.exists():
+        return []
+    names = {path.name for path in directory.glob("tx-*.json")}
+    names.update(path.name[: -len(".tmp")] for path in directory.glob("tx-*.json.tmp"))
+    return [directory / name for name in sorted(names)]
+
+
+def _intents_touching(directory: Path, targets: Iterable[Path]) -> bool:
+    """Check whether any intent in directory operates on one of targets."""
+    wanted = {str(path) for path in targets}
+    for intent_path in _intent_paths(directory):
+        operations = (
+            _read_intent(intent_path)
+            or _read_intent(intent_path.with_suffix(".json.tmp"))
+            or []
+        )
+        if any(operation["path"] in wanted for operation in operations):
+            return True
+    return False
+
+
+def _resolve_intent(intent_path: Path) -> bool:
+    """
+    Finish or undo one dead transaction, under its intent and target locks.
+
+    Args:
+        intent_path: Committed (.json) path of the intent
+
+    Returns:
+        True if the intent was resolved, False if its commit is still running
+        (or another process resolved it first)
+    """
+    pending_path = intent_path.with_suffix(".json.tmp")
+    try:
+        with file_lock(intent_path, blocking=False):
+            if intent_path.exists():
+                path, resolve = intent_path, _apply
+            elif pending_path.exists():
+                path, resolve = pending_path, _undo
+            else:
+                return False
+            operations = _read_intent(path) or []
+
+            with ExitStack() as locks:
+                for target in sorted({Path(op["path"]) for op in operations}):
+                    locks.enter_context(file_lock(target))
+                resolve(operations)
+
+            path.unlink()
+            return True
+    except BlockingIOError:
+        return False
+
+
+def recover_transactions(transactions_dir: str | Path) -> int:
+    """
+    Resolve transactions whose commit died.
+
+    Committed intents are replayed and pending ones are undone (see
+    Transaction). An intent whose lock is held belongs to a commit that is
+    still running and is left alone.
+
+    Args:
+        transactions_dir: Directory for intent files
+
+    Returns:
+        Number of resolved transactions
+    """
+    return sum(
+        _resolve_intent(intent_path)
+        for intent_path in _intent_paths(Path(transactions_dir))
+    )
@@ -1,9 +1,25 @@
 """Consolidated utility functions for file operations, paths, and dates."""
 
-import json
-from datetime import date, datetime
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from enum import Enum
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+from markov_dayflow.infrastructure.utils.serializers import (
+    decode_document,
+    dumps_json_line,
+    get_serializer,
+    loads_json,
+)
 
 
 # ============================================================================
@@ -23,27 +39,117 @@ def ensure_directory(path: str | Path) -> None:
     directory.mkdir(parents=True, exist_ok=True)
 
 
-def atomic_write_json(path: str | Path, data: Any, indent: int = 2) -> None:
+class Durability(str, Enum):
+    """How far an atomic write goes to survive a crash or power loss."""
+
+    NONE = "none"
+    FILE = "file"
+    DIRECTORY = "directory"
+
+
+def dumps_json(data: Any, indent: Optional[int] = None) -> str:
+    """
+    Serialize data to a JSON string with the fastest available codec.
+
+    Args:
+        data: Data to serialize
+        indent: JSON indentation level (None writes compact JSON)
+
+    Returns:
+        JSON text
+    """
+    return get_serializer("auto", indent).dumps(data).decode("utf-8")
+
+
+def fsync_directory(directory: str | Path) -> None:
     """
-    Atomically write JSON data to file using temporary file and rename.
+    Flush directory entries (e.g. a rename) to stable storage.
+
+    Args:
+        directory: Directory path (no-op on Windows, which can't open dirs)
+    """
+    if os.name == "nt":
+        return
+
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(
+    path: str | Path,
+    content: bytes,
+    durability: Durability | str = Durability.FILE,
+) -> None:
+    """
+    Atomically replace a file's contents using a temporary file and os.replace.
+
+    The target is never missing: readers see either the old or the new file.
 
     Args:
         path: Target file path
-        data: Data to serialize as JSON
-        indent: JSON indentation level
+        content: Bytes to write
+        durability: NONE (rename only), FILE (fsync contents before rename) or
+            DIRECTORY (also fsync the parent dir so the rename itself persists)
     """
+    durability = Durability(durability)
     path_obj = Path(path)
     ensure_directory(path_obj.parent)
 
-    temp_path = path_obj.with_suffix(path_obj.suffix + ".tmp")
+    temp_path = path_obj.with_name(
+        f"{path_obj.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+    )
+    try:
+        with open(temp_path, "xb") as f:
+            f.write(content)
+            if durability != Durability.NONE:
+                f.flush()
+                os.fsync(f.fileno())
+
+        os.replace(temp_path, path_obj)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    if durability == Durability.DIRECTORY:
+        fsync_directory(path_obj.parent)
+
+
+def atomic_write_text(
+    path: str | Path,
+    content: str,
+    durability: Durability | str = Durability.FILE,
+) -> None:
+    """
+    Atomically write UTF-8 text to file (see atomic_write_bytes).
+
+    Args:
+        path: Target file path
+        content: Text to write
+        durability: See atomic_write_bytes
+    """
+    atomic_write_bytes(path, content.encode("utf-8"), durability)
 
-    with open(temp_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
 
-    if path_obj.exists():
-        path_obj.unlink()
+def atomic_write_json(
+    path: str | Path,
+    data: Any,
+    indent: Optional[int] = None,
+    durability: Durability | str = Durability.FILE,
+) -> None:
+    """
+    Atomically write JSON data to file using temporary file and os.replace.
 
-    temp_path.rename(path_obj)
+    Args:
+        path: Target file path
+        data: Data to serialize as JSON
+        indent: JSON indentation level (None writes compact JSON, which suits
+            machine-only files such as state.json)
+        durability: See atomic_write_bytes
+    """
+    atomic_write_bytes(path, get_serializer("auto", indent).dumps(data), durability)
 
 
 def append_jsonl(path: str | Path, data: dict[str, Any]) -> None:
@@ -58,12 +164,12 @@ def append_jsonl(path: str | Path, data: dict[str, Any]) -> None:
     ensure_directory(path_obj.parent)
 
     with open(path_obj, "a", encoding="utf-8") as f:
-        f.write(json.dumps(data, ensure_ascii=False) + "\n")
+        f.write(dumps_json_line(data) + "\n")
 
 
 def read_json(path: str | Path) -> Any:
     """
-    Read JSON from file.
+    Read a JSON document from file (binary msgpack documents are detected).
 
     Args:
         path: JSON file path
@@ -71,8 +177,7 @@ def read_json(path: str | Path) -> Any:
     Returns:
         Deserialized JSON data
     """
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return decode_document(Path(path).read_bytes())
 
 
 def read_jsonl(path: str | Path) -> list[dict[str, Any]]:
@@ -95,38 +200,217 @@ def read_jsonl(path: str | Path) -> list[dict[str, Any]]:
         for line in f:
             line = line.strip()
             if line:
-                lines.append(json.loads(line))
+                lines.append(loads_json(line))
 
     return lines
 
 
+def get_lock_path(path: str | Path) -> Path:
+    """
+    Get the hidden sibling file file_lock() locks for path.
+
+    Args:
+        path: Document path
+
+    Returns:
+        Lock file path (".<name>.lock" next to the document)
+    """
+    path_obj = Path(path)
+    return path_obj.with_name(f".{path_obj.name}.lock")
+
+
+def _lock_file(f: Any, blocking: bool) -> None:
+    """Take an exclusive lock on an open lock file."""
+    if fcntl is not None:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        fcntl.flock(f.fileno(), flags)
+    else:  # pragma: no cover - Windows
+        f.seek(0)
+        mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+        try:
+            msvcrt.locking(f.fileno(), mode, 1)
+        except OSError as e:
+            if blocking:
+                raise
+            raise BlockingIOError(str(e)) from e
+
+
+def _is_linked(f: Any, lock_path: Path) -> bool:
+    """Check that an open lock file is still the one at lock_path."""
+    try:
+        linked = os.stat(lock_path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(f.fileno())
+    return (opened.st_dev, opened.st_ino) == (linked.st_dev, linked.st_ino)
+
+
+@contextmanager
+def file_lock(path: str | Path, blocking: bool = True) -> Iterator[None]:
+    """
+    Hold an exclusive inter-process lock on path for the duration of a block.
+
+    The lock is taken on a hidden sibling ".<name>.lock" file so the document
+    itself can still be replaced atomically while it is held, and directory
+    scans for plan_*/actual_* files don't pick it up. The lock file is
+    deleted on release, so locked documents don't leave one behind; a
+    waiter that wakes up on a deleted lock file retries on a new one.
+
+    Args:
+        path: Document path to lock
+        blocking: Wait for the lock (else fail at once if another holds it)
+
+    Raises:
+        BlockingIOError: If blocking is False and the lock is held elsewhere
+    """
+    lock_path = get_lock_path(path)
+    ensure_directory(lock_path.parent)
+
+    while True:
+        f = open(lock_path, "a+b")
+        try:
+            _lock_file(f, blocking)
+        except BaseException:
+            f.close()
+            raise
+        if _is_linked(f, lock_path):
+            break
+        # The holder we waited for deleted the file on release.
+        f.close()
+
+    try:
+        yield
+    finally:
+        if fcntl is not None:
+            # Deleted while still locked, so waiters see it is stale.
+            lock_path.unlink(missing_ok=True)
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            f.close()
+        else:  # pragma: no cover - Windows
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            f.close()
+            # Fails while another process has the file open, which is fine.
+            try:
+                lock_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
 # ============================================================================
 # Path Resolution
 # ============================================================================
 
 
+def get_transactions_dir(base_dir: str | Path) -> Path:
+    """
+    Get the directory holding pending transaction intents for a data dir.
+
+    Args:
+        base_dir: Data directory (the one containing state.json)
+
+    Returns:
+        Path to the transactions directory
+    """
+    return Path(base_dir) / ".transactions"
+
+
+def get_archive_dir(base_dir: str | Path) -> Path:
+    """
+    Get the directory holding the weekly state archive for a data dir.
+
+    Args:
+        base_dir: Data directory (the one containing state.json)
+
+    Returns:
+        Path to the archive directory
+    """
+    return Path(base_dir) / "archive"
+
+
+TASK_STORAGE_BACKENDS = ("json", "journal", "sqlite")
+
+
+def get_journal_path(path: str | Path) -> Path:
+    """
+    Get the mutation journal path that sits next to a JSON snapshot.
+
+    Args:
+        path: Snapshot file path (e.g. data/tasks.json)
+
+    Returns:
+        Journal path (e.g. data/tasks.journal.jsonl)
+    """
+    path_obj = Path(path)
+    return path_obj.with_name(f"{path_obj.stem}.journal.jsonl")
+
+
 class PathResolver:
     """Centralizes path resolution for data files."""
 
-    def __init__(self, base_dir: Optional[str | Path] = None):
+    def __init__(
+        self,
+        base_dir: Optional[str | Path] = None,
+        task_storage: Optional[str] = None,
+    ):
         """
         Initialize path resolver.
 
         Args:
             base_dir: Base directory for data files (defaults to ./data)
+            task_storage: Task storage backend ("json", "journal" or "sqlite").
+                Defaults to $MARKOV_DAYFLOW_TASK_STORAGE, then to whichever
+                tasks file exists. It is only checked when a task repository
+                is created (see create_task_repository()), so commands that
+                don't touch tasks work with any value.
         """
         self.base_dir = Path(base_dir) if base_dir else Path.cwd() / "data"
+        self.task_storage = (
+            task_storage
+            or os.environ.get("MARKOV_DAYFLOW_TASK_STORAGE")
+            or self._detect_task_storage()
+        )
+
+    def _detect_task_storage(self) -> str:
+        """Pick the backend whose tasks file exists, falling back to JSON."""
+        if self.sqlite_tasks_path.exists():
+            return "sqlite"
+        if self.tasks_journal_path.exists():
+            return "journal"
+        return "json"
 
     @property
     def tasks_path(self) -> Path:
+        """Get path to the tasks file for the active storage backend."""
+        if self.task_storage == "sqlite":
+            return self.sqlite_tasks_path
+        return self.json_tasks_path
+
+    @property
+    def json_tasks_path(self) -> Path:
         """Get path to tasks.json."""
         return self.base_dir / "tasks.json"
 
+    @property
+    def tasks_journal_path(self) -> Path:
+        """Get path to tasks.journal.jsonl (journaled storage only)."""
+        return get_journal_path(self.json_tasks_path)
+
+    @property
+    def sqlite_tasks_path(self) -> Path:
+        """Get path to tasks.db."""
+        return self.base_dir / "tasks.db"
+
     @property
     def state_path(self) -> Path:
         """Get path to state.json."""
         return self.base_dir / "state.json"
 
+    @property
+    def transactions_dir(self) -> Path:
+        """Get path to the pending transactions directory."""
+        return get_transactions_dir(self.base_dir)
+
     @property
     def plans_dir(self) -> Path:
         """Get path to plans directory."""
@@ -230,6 +514,37 @@ def parse_date(date_str: str | None) -> str:
         raise ValueError(f"Invalid date format: {date_str}. Expected YYYY-MM-DD") from e
 
 
+def parse_date_range(range_str: str, max_days: int = 366) -> list[str]:
+    """
+    Parse an inclusive START..END date range.
+
+    Args:
+        range_str: Range such as "2026-10-19..2026-10-23" (either end may be
+            "today")
+        max_days: Longest accepted range
+
+    Returns:
+        ISO date strings from START to END
+
+    Raises:
+        ValueError: If the range is malformed, reversed or too long
+    """
+    start_str, separator, end_str = range_str.partition("..")
+    if not separator:
+        raise ValueError(f"Invalid date range: {range_str}. Expected START..END")
+
+    start = date.fromisoformat(parse_date(start_str.strip()))
+    end = date.fromisoformat(parse_date(end_str.strip()))
+    days = (end - start).days + 1
+
+    if days < 1:
+        raise ValueError(f"Invalid date range: {range_str}. END is before START")
+    if days > max_days:
+        raise ValueError(f"Date range too long: {days} days (max {max_days})")
+
+    return [format_date(start + timedelta(days=offset)) for offset in range(days)]
+
+
 def format_date(date_obj: date) -> str:
     """
     Format date object to ISO string.
@@ -0,0 +1,144 @@
+"""Crash recovery of multi-file transactions."""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from markov_dayflow.infrastructure.utils import Transaction, recover_transactions
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _commit_and_crash(data_dir: Path, version: int, line: str, crash_at: int) -> None:
+    """Commit in a child process that dies at its crash_at-th os.replace call."""
+    script = textwrap.dedent(
+        f"""
+        import os
+        from pathlib import Path
+        from markov_dayflow.infrastructure.utils import Transaction
+
+        real_replace = os.replace
+        calls = []
+
+        def replace(src, dst):
+            calls.append(dst)
+            if len(calls) == {crash_at}:
+                os._exit(1)
+            real_replace(src, dst)
+
+        os.replace = replace
+        data_dir = Path({str(data_dir)!r})
+        with Transaction(data_dir / "transactions") as tx:
+            tx.write_json(data_dir / "state.json", {{"v": {version}}})
+            tx.write_json(data_dir / "plan.json", {{"v": {version}}})
+            tx.append_jsonl(data_dir / "log.jsonl", {{"line": {line!r}}})
+        """
+    )
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    result = subprocess.run([sys.executable, "-c", script], env=env)
+    assert result.returncode == 1
+
+
+def _commit(data_dir: Path, version: int, line: str) -> None:
+    with Transaction(data_dir / "transactions") as tx:
+        tx.write_json(data_dir / "state.json", {"v": version})
+        tx.write_json(data_dir / "plan.json", {"v": version})
+        tx.append_jsonl(data_dir / "log.jsonl", {"line": line})
+
+
+def _read(data_dir: Path) -> tuple[dict, dict, list[str]]:
+    state = json.loads((data_dir / "state.json").read_text())
+    plan = json.loads((data_dir / "plan.json").read_text())
+    lines = (data_dir / "log.jsonl").read_text().splitlines()
+    return state, plan, [json.loads(line)["line"] for line in lines]
+
+
+def _leftovers(data_dir: Path) -> list[str]:
+    names = [path.name for path in data_dir.rglob("*") if path.is_file()]
+    return sorted(name for name in names if "tx-" in name)
+
+
+def test_crash_after_commit_point_then_retry_then_late_recovery(tmp_path):
+    _commit(tmp_path, 0, "start")
+
+    # Dies after state.json was replaced but before plan.json was.
+    _commit_and_crash(tmp_path, 1, "A", crash_at=3)
+    assert _read(tmp_path) == ({"v": 1}, {"v": 0}, ["start", "A"])
+
+    # The retry first finishes the dead commit, then lands on top of it.
+    _commit(tmp_path, 2, "B")
+    assert _read(tmp_path) == ({"v": 2}, {"v": 2}, ["start", "A", "B"])
+
+    # A late recovery has nothing left to replay over the newer data.
+    assert recover_transactions(tmp_path / "transactions") == 0
+    assert _read(tmp_path) == ({"v": 2}, {"v": 2}, ["start", "A", "B"])
+    assert _leftovers(tmp_path) == []
+
+
+def test_crash_before_commit_point_is_undone(tmp_path):
+    _commit(tmp_path, 0, "start")
+
+    # Dies renaming the intent into place: staged files and the log line
+    # were written, but the transaction never committed.
+    _commit_and_crash(tmp_path, 1, "A", crash_at=1)
+    assert (tmp_path / "log.jsonl").read_text().count("\n") == 2
+
+    assert recover_transactions(tmp_path / "transactions") == 1
+    assert _read(tmp_path) == ({"v": 0}, {"v": 0}, ["start"])
+    assert _leftovers(tmp_path) == []
+
+
+def test_stale_write_is_not_replayed_over_newer_data(tmp_path):
+    _commit(tmp_path, 0, "start")
+    _commit_and_crash(tmp_path, 1, "A", crash_at=3)
+
+    # A writer that bypasses transactions replaces plan.json meanwhile.
+    (tmp_path / "plan.json").write_text(json.dumps({"v": 5}))
+
+    assert recover_transactions(tmp_path / "transactions") == 1
+    assert _read(tmp_path) == ({"v": 1}, {"v": 5}, ["start", "A"])
+    assert _leftovers(tmp_path) == []
+
+
+def test_written_files_are_fsynced_before_the_commit_point(tmp_path, monkeypatch):
+    _commit(tmp_path, 0, "start")
+
+    synced: set[tuple[int, int]] = set()
+    at_commit: dict[str, bool] = {}
+    real_fsync, real_replace = os.fsync, os.replace
+
+    def file_id(path: Path) -> tuple[int, int]:
+        stat = path.stat()
+        return stat.st_dev, stat.st_ino
+
+    def fsync(fd: int) -> None:
+        stat = os.fstat(fd)
+        synced.add((stat.st_dev, stat.st_ino))
+        real_fsync(fd)
+
+    def replace(src, dst) -> None:
+        if not at_commit:
+            written = [Path(src), tmp_path / "log.jsonl"]
+            written += tmp_path.glob("*.tx-*.tmp")
+            at_commit.update({path.name: file_id(path) in synced for path in written})
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    monkeypatch.setattr(os, "replace", replace)
+    _commit(tmp_path, 1, "A")
+
+    # The pending intent, both staged files and the appended log.
+    assert len(at_commit) == 4
+    assert all(at_commit.values()), at_commit
+
+
+def test_commit_and_recovery_leave_no_lock_files(tmp_path):
+    _commit(tmp_path, 0, "start")
+    _commit_and_crash(tmp_path, 1, "A", crash_at=3)
+    _commit(tmp_path, 2, "B")
+
+    locks = [path.name for path in tmp_path.rglob("*.lock")]
+    assert locks == []